@@ -0,0 +1,413 @@
+"""Benchmark validation, serialization and schema generation of dragonfly objects.
+
+Results are written to a JSON file that can be compared with the results of
+another commit to catch performance regressions.
+
+Usage:
+
+.. code-block:: console
+
+    python ./benchmarks/run_benchmarks.py --output ./benchmarks/results/new.json
+    python ./benchmarks/run_benchmarks.py --compare ./benchmarks/results/old.json \\
+        ./benchmarks/results/new.json
+"""
+import os
+import sys
+import json
+import copy
+import time
+import typing
+import platform
+import argparse
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root not in sys.path:
+    sys.path.insert(0, root)
+
+import pydantic  # noqa: E402
+from pydantic import TypeAdapter, ValidationError  # noqa: E402
+from dragonfly_schema.model import Room2D, Story, Building, ContextShade, \
+    Model  # noqa: E402
+from dragonfly_schema.energy.properties import ModelEnergyProperties  # noqa: E402
+from dragonfly_schema.radiance.properties import ModelRadianceProperties  # noqa: E402
+from dragonfly_schema._union import TypeDiscriminator  # noqa: E402
+from dragonfly_schema.binary import dump_cbor, validate_cbor  # noqa: E402
+from dragonfly_schema.validation_cache import VALIDATION_CACHE, \
+    ValidationCache  # noqa: E402
+
+SAMPLE_FOLDER = os.path.join(root, 'samples')
+SAMPLES = {
+    'room2d_simple.json': Room2D,
+    'story_simple.json': Story,
+    'story_air_boundary.json': Story,
+    'building_simple.json': Building,
+    'context_shade_two_tree_canopy.json': ContextShade,
+    'model_complete_simple.dfjson': Model,
+    'model_with_doors_skylights.dfjson': Model,
+    'model_multiple_buildings.dfjson': Model,
+}
+SCALED_SAMPLE = 'model_complete_simple.dfjson'
+SCALES = (10, 100, 1000)
+UNION_SAMPLE = 'model_with_doors_skylights.dfjson'
+CACHE_SAMPLE = 'model_multiple_buildings.dfjson'
+UNION_FIELDS = {
+    'Room2D': (Room2D, ('boundary_conditions', 'window_parameters',
+                        'shading_parameters', 'skylight_parameters')),
+    'ContextShade': (ContextShade, ('geometry',)),
+    'ModelEnergyProperties': (ModelEnergyProperties, (
+        'construction_sets', 'constructions', 'materials', 'hvacs',
+        'program_types', 'schedules')),
+    'ModelRadianceProperties': (ModelRadianceProperties, (
+        'modifier_sets', 'modifiers'))
+}
+
+
+def _suffix_identifiers(obj, suffix):
+    """Add a suffix to all geometry identifiers and Surface references of an object."""
+    if isinstance(obj, dict):
+        if obj.get('type') in ('Building', 'Story', 'Room2D', 'ContextShade'):
+            obj['identifier'] = obj['identifier'] + suffix
+        elif obj.get('type') == 'Surface':
+            obj['boundary_condition_objects'] = \
+                [o + suffix for o in obj['boundary_condition_objects']]
+        for value in obj.values():
+            _suffix_identifiers(value, suffix)
+    elif isinstance(obj, list):
+        for value in obj:
+            _suffix_identifiers(value, suffix)
+
+
+def scale_model(model_dict, factor):
+    """Get a copy of a Model dictionary with its buildings and shades repeated.
+
+    Args:
+        model_dict: A dictionary of a dragonfly Model.
+        factor: An integer for the number of times that the buildings and
+            context_shades are repeated. Copies get unique identifiers.
+    """
+    scaled = {k: v for k, v in model_dict.items()
+              if k not in ('buildings', 'context_shades')}
+    for key in ('buildings', 'context_shades'):
+        if model_dict.get(key):
+            scaled[key] = []
+            for i in range(factor):
+                objs = copy.deepcopy(model_dict[key])
+                _suffix_identifiers(objs, '_{}'.format(i))
+                scaled[key].extend(objs)
+    return scaled
+
+
+def _best_time(func, repeat):
+    """Get the fastest time in seconds out of several runs of a function."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark_json(cls, data, repeat=3):
+    """Benchmark model_validate_json and model_dump_json for JSON of a class.
+
+    Returns:
+        A dictionary of metrics, including times in seconds, throughputs in
+        MB per second and the peak memory of validation in MB.
+    """
+    obj = cls.model_validate_json(data)
+    dumped = obj.model_dump_json()
+    size = len(data) / 1e6
+    validate_time = _best_time(lambda: cls.model_validate_json(data), repeat)
+    dump_time = _best_time(obj.model_dump_json, repeat)
+
+    tracemalloc.start()
+    cls.model_validate_json(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results = {
+        'size_mb': size,
+        'validate_s': validate_time,
+        'validate_mb_per_s': size / validate_time,
+        'dump_s': dump_time,
+        'dump_mb_per_s': len(dumped) / 1e6 / dump_time,
+        'validate_peak_mb': peak / 1e6
+    }
+    try:
+        results.update(benchmark_cbor(cls, obj, repeat))
+    except ImportError:  # cbor2 is an optional dependency
+        pass
+    return results
+
+
+def benchmark_cbor(cls, obj, repeat=3):
+    """Benchmark the CBOR serialization of dragonfly_schema.binary for an object.
+
+    Returns:
+        A dictionary of metrics, including the size of the CBOR in MB along
+        with the times in seconds to dump and validate it.
+    """
+    data = dump_cbor(obj)
+    return {
+        'cbor_size_mb': len(data) / 1e6,
+        'cbor_dump_s': _best_time(lambda: dump_cbor(obj), repeat),
+        'cbor_validate_s': _best_time(lambda: validate_cbor(data, cls), repeat)
+    }
+
+
+def _plain_union(annotation):
+    """Get a copy of a type annotation with all TypeDiscriminators removed."""
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if not args:
+        return annotation
+    if origin is typing.Annotated:
+        extras = tuple(a for a in args[1:] if not isinstance(a, TypeDiscriminator))
+        inner = _plain_union(args[0])
+        return typing.Annotated[(inner,) + extras] if extras else inner
+    args = tuple(_plain_union(a) for a in args)
+    return typing.Union[args] if origin is typing.Union else typing.List[args[0]]
+
+
+def _collect_values(obj, type_name, field, values):
+    """Collect all values of a field of a given object type in a JSON object."""
+    if isinstance(obj, dict):
+        if obj.get('type') == type_name and obj.get(field) is not None:
+            values.append(obj[field])
+        for value in obj.values():
+            _collect_values(value, type_name, field, values)
+    elif isinstance(obj, list):
+        for value in obj:
+            _collect_values(value, type_name, field, values)
+
+
+def benchmark_union_dispatch(repeat=3):
+    """Benchmark the Unions validated by type against the equivalent plain Unions.
+
+    All values of each Union field in the UNION_SAMPLE are validated once with
+    the field annotation and once with the same annotation stripped of its
+    TypeDiscriminator. The number of errors reported for an invalid window
+    parameter is also compared.
+    """
+    with open(os.path.join(SAMPLE_FOLDER, UNION_SAMPLE), 'rb') as f:
+        model_dict = json.load(f)
+    results = {}
+    for type_name, (cls, fields) in UNION_FIELDS.items():
+        for field in fields:
+            values = []
+            _collect_values(model_dict, type_name, field, values)
+            if not values:
+                continue
+            annotation = typing.List[cls.model_fields[field].annotation]
+            data = json.dumps(values).encode('utf-8')
+            tagged = TypeAdapter(annotation)
+            plain = TypeAdapter(_plain_union(annotation))
+            key = '{}.{}'.format(type_name, field)
+            results[key + '_tagged_s'] = \
+                _best_time(lambda: tagged.validate_json(data), repeat)
+            results[key + '_plain_s'] = \
+                _best_time(lambda: plain.validate_json(data), repeat)
+
+    invalid = [{'type': 'SimpleWindowRatio', 'window_ratio': 2}]
+    annotation = Room2D.model_fields['window_parameters'].annotation
+    for name, adapter in (('tagged', TypeAdapter(annotation)),
+                          ('plain', TypeAdapter(_plain_union(annotation)))):
+        try:
+            adapter.validate_python(invalid)
+        except ValidationError as e:
+            results['invalid_window_error_count_' + name] = e.error_count()
+    return results
+
+
+def benchmark_validation_cache(data, repeat=3):
+    """Benchmark the validation of Model JSON with and without a ValidationCache.
+
+    Returns:
+        A dictionary with the times in seconds to validate the JSON without
+        a cache, with an empty cache (all misses) and with a cache that already
+        has all Buildings and ContextShades of the Model (all hits).
+    """
+    def validate_cached(cache):
+        Model.model_validate_json(data, context={VALIDATION_CACHE: cache})
+
+    warm_cache = ValidationCache()
+    validate_cached(warm_cache)
+    return {
+        'validate_s': _best_time(lambda: Model.model_validate_json(data), repeat),
+        'cache_miss_s': _best_time(lambda: validate_cached(ValidationCache()), repeat),
+        'cache_hit_s': _best_time(lambda: validate_cached(warm_cache), repeat)
+    }
+
+
+def benchmark_schema(repeat=3):
+    """Benchmark the generation of the Model JSON schema."""
+    return {'model_json_schema_s': _best_time(Model.model_json_schema, repeat)}
+
+
+IMPORT_STATEMENTS = {
+    'import_model_s': 'import dragonfly_schema.model',
+    'validate_model_cold_s':
+        'from dragonfly_schema.model import Model; Model.model_validate_json(data)',
+    'validate_geometry_cold_s':
+        'from dragonfly_schema.geometry import validate_geometry; validate_geometry(data)'
+}
+
+
+def benchmark_imports(repeat=3):
+    """Benchmark the time to import and first use the schema in a new interpreter.
+
+    The SCALED_SAMPLE is validated in the statements that use data.
+    """
+    setup = 'import time; data = open({!r}, "rb").read(); start = time.perf_counter(); '
+    setup = setup.format(os.path.join(SAMPLE_FOLDER, SCALED_SAMPLE))
+    report = '; print(time.perf_counter() - start)'
+    env = dict(os.environ, PYTHONPATH=root)
+    results = {}
+    for key, statement in IMPORT_STATEMENTS.items():
+        times = []
+        for _ in range(repeat):
+            output = subprocess.run(
+                [sys.executable, '-c', setup + statement + report],
+                env=env, check=True, capture_output=True).stdout
+            times.append(float(output))
+        results[key] = min(times)
+    return results
+
+
+def benchmark_docs():
+    """Benchmark the generation of all OpenAPI docs with docs.py."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, os.path.join(root, 'docs.py'), '--version', '0.0.1'],
+        cwd=root, check=True, stdout=subprocess.DEVNULL)
+    return {'docs_s': time.perf_counter() - start}
+
+
+def run_suite(samples=None, scales=SCALES, repeat=3, docs=True):
+    """Run the benchmark suite.
+
+    Args:
+        samples: An optional list of sample file names to be benchmarked.
+            If None, all SAMPLES will be used.
+        scales: A list of factors by which the SCALED_SAMPLE is scaled.
+        repeat: An integer for the number of runs of each timed function. The
+            fastest run is reported.
+        docs: Boolean to note whether the docs.py build time should be measured.
+
+    Returns:
+        A dictionary with the metadata of the run and the results of
+        each benchmark.
+    """
+    results = {}
+    for name in samples or SAMPLES:
+        with open(os.path.join(SAMPLE_FOLDER, name), 'rb') as f:
+            data = f.read()
+        results[name] = benchmark_json(SAMPLES[name], data, repeat)
+
+    with open(os.path.join(SAMPLE_FOLDER, SCALED_SAMPLE), 'rb') as f:
+        base_model = json.load(f)
+    for factor in scales:
+        data = json.dumps(scale_model(base_model, factor)).encode('utf-8')
+        results['{}_x{}'.format(SCALED_SAMPLE, factor)] = \
+            benchmark_json(Model, data, repeat)
+
+    with open(os.path.join(SAMPLE_FOLDER, CACHE_SAMPLE), 'rb') as f:
+        results['validation_cache'] = benchmark_validation_cache(f.read(), repeat)
+    results['union_dispatch'] = benchmark_union_dispatch(repeat)
+    results['imports'] = benchmark_imports(repeat)
+    results['schema'] = benchmark_schema(repeat)
+    if docs:
+        results['schema'].update(benchmark_docs())
+
+    return {
+        'metadata': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'pydantic': pydantic.VERSION,
+            'platform': platform.platform()
+        },
+        'results': results
+    }
+
+
+def _git_commit():
+    """Get the current git commit of the repository if it can be found."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=root, check=True,
+            capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(old, new, threshold=0.1):
+    """Compare two sets of benchmark results and get the regressions.
+
+    Args:
+        old: A dictionary of benchmark results from run_suite.
+        new: A dictionary of benchmark results from run_suite.
+        threshold: A number for the fractional change in a metric that counts
+            as a regression. (Default: 0.1).
+
+    Returns:
+        A list of (benchmark, metric, old_value, new_value) tuples for all of
+        the metrics that got worse by more than the threshold.
+    """
+    regressions = []
+    for bench, metrics in new['results'].items():
+        old_metrics = old['results'].get(bench, {})
+        for metric, value in metrics.items():
+            old_value = old_metrics.get(metric)
+            if not old_value or metric == 'size_mb':
+                continue
+            change = (value - old_value) / old_value
+            if metric.endswith('_per_s'):  # higher throughput is better
+                change = -change
+            if change > threshold:
+                regressions.append((bench, metric, old_value, value))
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Run dragonfly-schema benchmarks')
+    parser.add_argument('--output', help='Path to a JSON file for the results.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of runs of each timed function.')
+    parser.add_argument('--scales', type=int, nargs='*', default=list(SCALES),
+                        help='Factors by which the scaled sample model is scaled.')
+    parser.add_argument('--skip-docs', action='store_true',
+                        help='Skip measuring the docs.py build time.')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='Compare two results files instead of running.')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Fractional change counted as a regression.')
+    args = parser.parse_args(args)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        regressions = compare_results(old, new, args.threshold)
+        for bench, metric, old_value, value in regressions:
+            print('{} {}: {:.4g} -> {:.4g}'.format(bench, metric, old_value, value))
+        print('{} regressions found.'.format(len(regressions)))
+        return 1 if regressions else 0
+
+    results = run_suite(scales=args.scales, repeat=args.repeat, docs=not args.skip_docs)
+    output = args.output or os.path.join(
+        root, 'benchmarks', 'results', '{}.json'.format(
+            results['metadata']['commit'] or 'results'))
+    if not os.path.isdir(os.path.dirname(output)):
+        os.makedirs(os.path.dirname(output))
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print('Benchmark results written to {}'.format(output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
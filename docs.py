@@ -6,6 +6,7 @@ from pkg_resources import get_distribution
 from pydantic_openapi_helper.core import get_openapi
 from pydantic_openapi_helper.inheritance import class_mapper
 from dragonfly_schema.model import Model
+from dragonfly_schema.extension import referenced_models
 
 parser = argparse.ArgumentParser(description='Generate OpenAPI JSON schemas')
 
@@ -37,8 +38,12 @@ info = {
     }
 }
 
+# the extension property classes are not found in the annotations of the Model
+# and they are given with all of the other models referenced by the Model
+models = [Model] + referenced_models(Model)
+
 modules = [
-    {'module': [Model], 'name': 'Model'}
+    {'module': models, 'name': 'Model'}
 ]
 
 
@@ -109,7 +114,7 @@ external_docs = {
 }
 
 openapi = get_openapi(
-    [Model],
+    models,
     title='Dragonfly Model Schema',
     description='Documentation for Dragonfly model schema',
     version=VERSION, info=info,
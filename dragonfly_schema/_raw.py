@@ -0,0 +1,435 @@
+"""Utilities for scanning raw DFJSON text without decoding it into Python objects.
+
+These functions operate on any object supporting the buffer protocol (bytes,
+bytearray or mmap) and return byte offsets into that buffer such that only the
+parts of a document that are needed have to be decoded and validated.
+"""
+import re
+import json
+
+from pydantic import ValidationError
+
+from ._union import line_errors
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+# a token is either a whole string, an array without nested objects or strings
+# (eg. a list of coordinates), a single bracket or an unterminated string
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|\[[^\[\]{}"]*\]|[\[\]{}"]', re.DOTALL)
+_STRING_END = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb'[,\]} \t\n\r]')
+
+_QUOTE, _BACKSLASH, _COLON, _COMMA = ord('"'), ord('\\'), ord(':'), ord(',')
+_OPEN_OBJ, _CLOSE_OBJ = ord('{'), ord('}')
+_OPEN_ARR, _CLOSE_ARR = ord('['), ord(']')
+
+
+class IncompleteJSON(ValueError):
+    """Raised when a JSON value extends beyond the end of the scanned buffer."""
+
+
+class StructuralIndex(object):
+    """Lazy index of the ends of the objects and arrays of a JSON document.
+
+    The end of a container is found by scanning the bytes after its opening
+    bracket in chunks with a few vectorized NumPy passes, which find the brackets
+    outside of strings (accounting for escaped quotes) and stop at the chunk where
+    the depth returns to zero. The ends of the direct children of the container
+    and of the containers after it in the same parent that end within the scanned
+    chunks are remembered, such that the following items of an array or values of
+    an object are then skipped without scanning them again. The chunks double in
+    size each time that a container is not found in the scanned chunks.
+
+    Only the bytes up to one chunk after the end of the requested containers are
+    read such that the rest of a memory-mapped file is not paged in, and the
+    memory used is bounded by the chunk size and the number of remembered
+    containers rather than growing with the size of the file.
+
+    Args:
+        buf: A bytes-like buffer of JSON text, such as an mmap.
+        np: The NumPy module.
+        min_chunk: The number of bytes in the first chunk that is scanned.
+            (Default: 4096).
+        max_chunk: The maximum number of bytes in a chunk. (Default: 1 MB).
+    """
+    __slots__ = ('_buf', '_np', '_size', '_chunk', '_max_chunk', '_ends')
+
+    def __init__(self, buf, np, min_chunk=4096, max_chunk=1 << 20):
+        self._buf = buf
+        self._np = np
+        self._size = len(buf)
+        self._chunk = min_chunk
+        self._max_chunk = max(min_chunk, max_chunk)
+        self._ends = {}  # the index of each known container mapped to its end
+
+    def _quotes(self, array, escaped):
+        """Get the unescaped quotes of a chunk and whether its last byte escapes.
+
+        Args:
+            array: A uint8 array of the bytes of the chunk.
+            escaped: Boolean for whether the first byte of the chunk is escaped
+                by a backslash at the end of the previous chunk.
+        """
+        np = self._np
+        quotes = np.flatnonzero(array == _QUOTE)
+        backslashes = np.flatnonzero(array == _BACKSLASH)
+        if len(backslashes) == 0 and not escaped:
+            return quotes, False
+        escapes, last = ([0], 0) if escaped else ([], -1)
+        for k in backslashes.tolist():
+            if k > last:  # the backslash is not itself escaped
+                escapes.append(k + 1)
+                last = k + 1
+        quotes = np.setdiff1d(quotes, np.array(escapes, dtype=quotes.dtype))
+        return quotes, last == len(array)
+
+    def _remember(self, opens, closes, pending):
+        """Remember the ends of containers from the lists of their opens and closes.
+
+        Args:
+            opens: A list of the indices of the opening brackets of containers.
+            closes: A list of the indices of the closing brackets of containers
+                at the same depth, which match the pending opens and then opens.
+            pending: A list of the opens of previous chunks that are not closed,
+                which is updated with the opens that are not closed.
+        """
+        pending.extend(opens)
+        self._ends.update(zip(pending, (k + 1 for k in closes)))
+        del pending[:len(closes)]
+
+    def container_end(self, i):
+        """Get the index just after the object or array that opens at index i."""
+        end = self._ends.get(i)
+        if end is not None:
+            return end
+        np = self._np
+        if i >= self._size or self._buf[i] | 0x20 != _OPEN_OBJ:
+            raise ValueError('Expected an object or array at {}.'.format(i))
+        depth, in_string, escaped = 0, 0, False
+        siblings, children = [], []  # opens that are not yet closed at each depth
+        start = i
+        while start < self._size and end is None:
+            stop = min(start + self._chunk, self._size)
+            array = np.frombuffer(self._buf, dtype=np.uint8, count=stop - start,
+                                  offset=start)
+            quotes, escaped = self._quotes(array, escaped)
+            folded = array | 0x20
+            is_open = folded == _OPEN_OBJ  # { or [
+            brackets = np.flatnonzero(is_open | (folded == _CLOSE_OBJ))  # or } or ]
+            brackets = brackets[
+                (np.searchsorted(quotes, brackets) + in_string) % 2 == 0]
+            opens = is_open[brackets]
+            depths = depth + np.cumsum(np.where(opens, 1, -1))
+            parent_close = np.flatnonzero(depths < 0)  # stop at the end of the parent
+            if len(parent_close) != 0:
+                k = parent_close[0]
+                brackets, opens, depths = brackets[:k], opens[:k], depths[:k]
+            positions = start + brackets
+            # remember the container and the ones after it, followed by its children
+            self._remember(positions[(depths == 1) & opens].tolist(),
+                           positions[(depths == 0) & ~opens].tolist(), siblings)
+            end = self._ends.get(i)
+            inside = positions < (self._size if end is None else end)
+            self._remember(positions[(depths == 2) & opens & inside].tolist(),
+                           positions[(depths == 1) & ~opens & inside].tolist(), children)
+            if len(depths) != 0:
+                depth = int(depths[-1])
+            in_string = (in_string + len(quotes)) % 2
+            start = stop
+            self._chunk = min(self._chunk * 2, self._max_chunk)
+            if len(parent_close) != 0:
+                break
+        if end is None:
+            raise IncompleteJSON('Unterminated JSON container starting at {}.'.format(i))
+        return end
+
+
+def skip_whitespace(buf, i):
+    """Get the index of the first non-whitespace byte at or after i."""
+    return _WHITESPACE.match(buf, i).end()
+
+
+def string_end(buf, i):
+    """Get the index just after the closing quote of a string starting at i."""
+    j = i + 1
+    while True:
+        match = _STRING_END.search(buf, j)
+        if match is None:
+            raise IncompleteJSON('Unterminated JSON string starting at {}.'.format(i))
+        k = match.start()
+        if buf[k] == _QUOTE:
+            return k + 1
+        j = k + 2  # skip the escaped character
+
+
+def value_end(buf, i, index=None):
+    """Get the index just after the JSON value that starts at index i.
+
+    Args:
+        buf: A bytes-like buffer of JSON text.
+        i: The index of the first (non-whitespace) byte of the value.
+        index: An optional StructuralIndex of the buffer, which is used to find
+            the end of objects and arrays without tokenizing them. (Default: None).
+
+    Returns:
+        The index of the first byte after the value.
+    """
+    try:
+        char = buf[i]
+    except IndexError:
+        raise IncompleteJSON('Expected a JSON value at {}.'.format(i))
+    if char == _QUOTE:
+        return string_end(buf, i)
+    if char == _OPEN_OBJ or char == _OPEN_ARR:
+        if index is not None:
+            return index.container_end(i)
+        depth = 0
+        for match in _TOKEN.finditer(buf, i):
+            k, end = match.span()
+            char = buf[k]
+            if char == _QUOTE:
+                if end - k == 1:  # a quote that is not closed within the buffer
+                    break
+            elif end - k > 1:  # an array containing only numbers
+                if depth == 0:
+                    return end
+            elif char == _OPEN_OBJ or char == _OPEN_ARR:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return end
+        raise IncompleteJSON('Unterminated JSON container starting at {}.'.format(i))
+    if char in (_CLOSE_OBJ, _CLOSE_ARR, _COMMA, _COLON):
+        raise ValueError('Expected a JSON value at {}.'.format(i))
+    match = _SCALAR_END.search(buf, i)
+    if match is None:
+        raise IncompleteJSON('Unterminated JSON value starting at {}.'.format(i))
+    return match.start()
+
+
+def decode_key(buf, start, end):
+    """Decode the JSON string between the start and end index to a Python str."""
+    raw = bytes(buf[start:end])
+    if _BACKSLASH in raw:
+        return json.loads(raw)
+    return raw[1:-1].decode('utf-8')
+
+
+def _expect(buf, i, char, name):
+    """Raise a ValueError if the byte at index i is not the expected char."""
+    try:
+        found = buf[i]
+    except IndexError:
+        raise IncompleteJSON('Expected "{}" at {}.'.format(name, i))
+    if found != char:
+        raise ValueError('Expected "{}" at {} but got "{}".'.format(
+            name, i, chr(found)))
+
+
+def iter_members(buf, i, index=None):
+    """Iterate over the members of the JSON object that starts at index i.
+
+    Args:
+        buf: A bytes-like buffer of JSON text.
+        i: The index of the opening brace of the object.
+        index: An optional StructuralIndex of the buffer. (Default: None).
+
+    Yields:
+        A tuple of (key, value_start, value_end) for each member of the object.
+    """
+    _expect(buf, i, _OPEN_OBJ, '{')
+    i = skip_whitespace(buf, i + 1)
+    if buf[i:i + 1] == b'}':
+        return
+    while True:
+        _expect(buf, i, _QUOTE, '"')
+        key_end = string_end(buf, i)
+        key = decode_key(buf, i, key_end)
+        i = skip_whitespace(buf, key_end)
+        _expect(buf, i, _COLON, ':')
+        start = skip_whitespace(buf, i + 1)
+        end = value_end(buf, start, index)
+        yield key, start, end
+        i = skip_whitespace(buf, end)
+        if buf[i:i + 1] == b'}':
+            return
+        _expect(buf, i, _COMMA, ',')
+        i = skip_whitespace(buf, i + 1)
+
+
+def iter_items(buf, i, index=None):
+    """Iterate over the items of the JSON array that starts at index i.
+
+    Args:
+        buf: A bytes-like buffer of JSON text.
+        i: The index of the opening bracket of the array.
+        index: An optional StructuralIndex of the buffer. (Default: None).
+
+    Yields:
+        A tuple of (item_start, item_end) for each item in the array.
+    """
+    _expect(buf, i, _OPEN_ARR, '[')
+    i = skip_whitespace(buf, i + 1)
+    if buf[i:i + 1] == b']':
+        return
+    while True:
+        end = value_end(buf, i, index)
+        yield i, end
+        i = skip_whitespace(buf, end)
+        if buf[i:i + 1] == b']':
+            return
+        _expect(buf, i, _COMMA, ',')
+        i = skip_whitespace(buf, i + 1)
+
+
+def member_start(buf, i, key, index=None):
+    """Get the start of the value of a member of the JSON object that starts at i.
+
+    Unlike iter_members, the end of the value of the member is not found such
+    that nothing after the start of the value is scanned.
+
+    Args:
+        buf: A bytes-like buffer of JSON text.
+        i: The index of the opening brace of the object.
+        key: Text for the key of the member.
+        index: An optional StructuralIndex of the buffer. (Default: None).
+
+    Returns:
+        The index of the first byte of the value or None if the object has
+        no member with the key.
+    """
+    _expect(buf, i, _OPEN_OBJ, '{')
+    i = skip_whitespace(buf, i + 1)
+    if buf[i:i + 1] == b'}':
+        return None
+    while True:
+        _expect(buf, i, _QUOTE, '"')
+        key_end = string_end(buf, i)
+        member_key = decode_key(buf, i, key_end)
+        i = skip_whitespace(buf, key_end)
+        _expect(buf, i, _COLON, ':')
+        start = skip_whitespace(buf, i + 1)
+        if member_key == key:
+            return start
+        i = skip_whitespace(buf, value_end(buf, start, index))
+        if buf[i:i + 1] == b'}':
+            return None
+        _expect(buf, i, _COMMA, ',')
+        i = skip_whitespace(buf, i + 1)
+
+
+def item_start(buf, i, position, index=None):
+    """Get the start of an item of the JSON array that starts at index i.
+
+    Args:
+        buf: A bytes-like buffer of JSON text.
+        i: The index of the opening bracket of the array.
+        position: An integer for the index of the item in the array.
+        index: An optional StructuralIndex of the buffer. (Default: None).
+
+    Returns:
+        The index of the first byte of the item or None if the array has no
+        item at the position.
+    """
+    _expect(buf, i, _OPEN_ARR, '[')
+    i = skip_whitespace(buf, i + 1)
+    if buf[i:i + 1] == b']':
+        return None
+    for _ in range(position):
+        i = skip_whitespace(buf, value_end(buf, i, index))
+        if buf[i:i + 1] == b']':
+            return None
+        _expect(buf, i, _COMMA, ',')
+        i = skip_whitespace(buf, i + 1)
+    return i
+
+
+def split_members(buf, i, list_keys=()):
+    """Split a JSON object into its members and the item spans of selected lists.
+
+    This is equivalent to iter_members except that the values of list_keys
+    are scanned only once to get the spans of their items.
+
+    Args:
+        buf: A bytes-like buffer of JSON text.
+        i: The index of the opening brace of the object.
+        list_keys: A collection of member keys for which a list of (start, end)
+            item spans will be returned if their values are arrays.
+
+    Returns:
+        A tuple with two items.
+
+        -   members: A list of (key, value_start, value_end) for each member of
+            the object that is not in the returned lists.
+
+        -   lists: A dictionary with list_keys that were found as arrays and
+            lists of (start, end) item spans for values.
+    """
+    members, lists = [], {}
+    _expect(buf, i, _OPEN_OBJ, '{')
+    i = skip_whitespace(buf, i + 1)
+    if buf[i:i + 1] == b'}':
+        return members, lists
+    while True:
+        _expect(buf, i, _QUOTE, '"')
+        key_end = string_end(buf, i)
+        key = decode_key(buf, i, key_end)
+        i = skip_whitespace(buf, key_end)
+        _expect(buf, i, _COLON, ':')
+        start = skip_whitespace(buf, i + 1)
+        if key in list_keys and buf[start:start + 1] == b'[':
+            spans = lists[key] = list(iter_items(buf, start))
+            end = skip_whitespace(buf, spans[-1][1] if spans else start + 1) + 1
+        else:
+            end = value_end(buf, start)
+            members.append((key, start, end))
+        i = skip_whitespace(buf, end)
+        if buf[i:i + 1] == b'}':
+            return members, lists
+        _expect(buf, i, _COMMA, ',')
+        i = skip_whitespace(buf, i + 1)
+
+
+def join_members(members):
+    """Join (key, raw_value) pairs into the raw bytes of a JSON object."""
+    return b'{' + b','.join(
+        json.dumps(key).encode('utf-8') + b':' + bytes(value) for key, value in members
+    ) + b'}'
+
+
+def prefix_error(error, loc, title='Model'):
+    """Get a copy of a pydantic ValidationError with a prefix added to each loc.
+
+    This is used to report errors of objects validated on their own with the
+    same location that they would have when validated as part of a parent object.
+
+    Args:
+        error: A pydantic ValidationError.
+        loc: A tuple of keys and indices to be added to the start of each error loc.
+        title: The title of the returned ValidationError. (Default: Model).
+    """
+    loc = tuple(loc)
+    errors = error.errors(include_url=False)
+    for err in errors:
+        err['loc'] = loc + err['loc']
+    return ValidationError.from_exception_data(
+        title, line_errors(errors), input_type='json')
+
+
+def validate_json(cls, raw, loc=(), title='Model', context=None):
+    """Validate raw JSON with a pydantic class, reporting errors at a given loc.
+
+    Args:
+        cls: A pydantic model class or TypeAdapter with which raw will be validated.
+        raw: The raw JSON bytes of the object.
+        loc: A tuple of keys and indices for the location of the object
+            within its parent document.
+        title: The title of the ValidationError raised for invalid objects.
+        context: An optional dictionary of validation context. (Default: None).
+    """
+    validate = cls.validate_json if hasattr(cls, 'validate_json') \
+        else cls.model_validate_json
+    try:
+        return validate(raw, context=context)
+    except ValidationError as e:
+        raise prefix_error(e, loc, title) from None
@@ -0,0 +1,79 @@
+"""Annotation for validating Unions of schema objects by their type key."""
+from typing import get_args
+
+from pydantic_core import core_schema, PydanticCustomError
+from pydantic_core.core_schema import ErrorType
+
+_UNTAGGED = '__untagged__'
+_ERROR_TYPES = frozenset(get_args(ErrorType))
+
+
+def _type_tag(value):
+    """Get the type of a dictionary or schema object to be validated."""
+    if isinstance(value, dict):
+        return value.get('type', _UNTAGGED)
+    return getattr(value, 'type', _UNTAGGED)
+
+
+def line_errors(errors):
+    """Get a list of pydantic error dictionaries that can rebuild a ValidationError.
+
+    The custom union_type_invalid errors of a TypeDiscriminator are replaced with
+    a PydanticCustomError since ValidationError.from_exception_data only accepts
+    the names of the built-in error types.
+
+    Args:
+        errors: A list of error dictionaries from ValidationError.errors().
+    """
+    for err in errors:
+        if isinstance(err['type'], str) and err['type'] not in _ERROR_TYPES:
+            err['type'] = PydanticCustomError(err['type'], err['msg'])
+    return errors
+
+
+class TypeDiscriminator(object):
+    """Annotation to validate a Union of schema objects as a tagged union on type.
+
+    Rather than trying each member of the Union one after the other, the value of
+    the type key is used to select the member with the matching type Literal,
+    which is much faster and results in much smaller lists of errors. Inputs
+    without a type key are validated against all members as a plain Union.
+    The JSON schema is left the same as that of the plain Union.
+
+    Usage:
+
+    .. code-block:: python
+
+        window_parameters: List[Annotated[
+            Union[None, SingleWindow, SimpleWindowRatio], TypeDiscriminator()
+        ]]
+    """
+
+    def __get_pydantic_core_schema__(self, source, handler):
+        schema = handler(source)
+        union = schema['schema'] if schema['type'] == 'nullable' else schema
+        members = [m for m in get_args(source) if m is not type(None)]
+        if union['type'] != 'union' or len(members) != len(union['choices']):
+            return schema
+        choices = {
+            member.model_fields['type'].default: choice
+            for member, choice in zip(members, union['choices'])
+        }
+        expected = ', '.join(repr(tag) for tag in choices)
+        choices[_UNTAGGED] = union
+        tagged = core_schema.tagged_union_schema(
+            choices, _type_tag, custom_error_type='union_type_invalid',
+            custom_error_message='Input type does not match any of the expected '
+            'types: {}'.format(expected)
+        )
+        if schema['type'] == 'nullable':
+            return core_schema.nullable_schema(tagged)
+        return tagged
+
+    def __get_pydantic_json_schema__(self, schema, handler):
+        if schema['type'] == 'nullable':
+            return handler(core_schema.nullable_schema(
+                schema['schema']['choices'][_UNTAGGED]))
+        if schema['type'] == 'tagged-union':
+            return handler(schema['choices'][_UNTAGGED])
+        return handler(schema)
@@ -0,0 +1,169 @@
+"""Check that the Surface boundary conditions of the walls of Room2Ds are reciprocal.
+
+The walls of a Room2D are named with the identifier of the Room2D followed by
+"..Face" and the 1-based index of their floor segment (eg. "Office1..Face3"),
+where the segments of the floor_boundary are followed by those of each of the
+floor_holes. The first of the boundary_condition_objects of a Surface boundary
+condition is the adjacent wall and the second is the Room2D of that wall.
+
+All walls of a Story are put in a dictionary by their identifiers in one pass
+and the Surface boundary condition of each wall is then checked against it for
+the following errors.
+
+-   self_adjacency: The wall is adjacent to itself or to its own Room2D.
+
+-   missing_adjacency: The adjacent wall is not in the Story or the adjacent
+    Room2D is not the parent of the adjacent wall.
+
+-   non_reciprocal: The adjacent wall does not have a Surface boundary
+    condition that is adjacent to the wall.
+
+-   air_boundary_not_surface: The wall has a True air_boundaries value but it
+    does not have a Surface boundary condition.
+
+-   air_boundary_with_window: The wall has a True air_boundaries value and
+    window parameters.
+
+When a Model is validated with the CHECK_ADJACENCY validation context, an error
+is raised if any wall has one of these errors.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.adjacency import check_adjacencies
+
+    model = Model.model_validate_json(data)
+    for issue in check_adjacencies(model):
+        print('/'.join(str(key) for key in issue.path), issue.kind)
+"""
+from typing import NamedTuple, Tuple, Union
+
+CHECK_ADJACENCY = 'check_adjacency'
+
+
+class AdjacencyIssue(NamedTuple):
+    """An error in the boundary condition of a wall of a Room2D.
+
+    Args:
+        path: A tuple of keys and indices from the Model to the boundary
+            condition of the wall.
+        kind: Text for the kind of error (eg. non_reciprocal, missing_adjacency).
+        message: Text describing the error.
+    """
+    path: Tuple[Union[str, int], ...]
+    kind: str
+    message: str
+
+
+def wall_identifier(room_identifier, segment_index):
+    """Get the identifier of the wall of a Room2D at the index of a floor segment."""
+    return '{}..Face{}'.format(room_identifier, segment_index + 1)
+
+
+def _segment_count(room):
+    """Get the number of floor segments of a Room2D."""
+    return len(room.floor_boundary) + sum(len(hole) for hole in room.floor_holes or ())
+
+
+def check_story_adjacencies(story, path=()):
+    """Get a list of the errors in the wall boundary conditions of a Story.
+
+    Args:
+        story: A dragonfly Story.
+        path: A tuple of the keys and indices from the Model to the Story,
+            which is used for the path of each AdjacencyIssue. (Default: ()).
+
+    Returns:
+        A list of AdjacencyIssue, which is empty if all walls are valid.
+    """
+    # map the identifier of each wall to its room and boundary condition
+    walls = {}
+    for room in story.room_2ds:
+        bcs = room.boundary_conditions
+        for i in range(_segment_count(room)):
+            walls[wall_identifier(room.identifier, i)] = \
+                (room.identifier, None if bcs is None else bcs[i])
+
+    issues = []
+    for r_i, room in enumerate(story.room_2ds):
+        bcs = room.boundary_conditions or ()
+        air_bounds = room.air_boundaries or ()
+        windows = room.window_parameters or ()
+        for i, bc in enumerate(bcs):
+            bc_path = path + ('room_2ds', r_i, 'boundary_conditions', i)
+            wall_id = wall_identifier(room.identifier, i)
+            is_surface = bc.type == 'Surface'
+            if i < len(air_bounds) and air_bounds[i]:
+                if not is_surface:
+                    issues.append(AdjacencyIssue(
+                        bc_path, 'air_boundary_not_surface',
+                        'Air boundary {} has a {} boundary condition.'.format(
+                            wall_id, bc.type)))
+                if i < len(windows) and windows[i] is not None:
+                    issues.append(AdjacencyIssue(
+                        bc_path, 'air_boundary_with_window',
+                        'Air boundary {} has {} window parameters.'.format(
+                            wall_id, windows[i].type)))
+            if not is_surface:
+                continue
+            adj_face, adj_room = bc.boundary_condition_objects[:2]
+            if adj_face == wall_id or adj_room == room.identifier:
+                issues.append(AdjacencyIssue(
+                    bc_path, 'self_adjacency',
+                    'Wall {} is adjacent to itself or its own Room2D.'.format(wall_id)))
+                continue
+            adjacent = walls.get(adj_face)
+            if adjacent is None or adjacent[0] != adj_room:
+                issues.append(AdjacencyIssue(
+                    bc_path, 'missing_adjacency',
+                    'Wall {} is adjacent to {} of {}, which is not in the Story.'.format(
+                        wall_id, adj_face, adj_room)))
+                continue
+            adj_bc = adjacent[1]
+            if adj_bc is None or adj_bc.type != 'Surface' or \
+                    adj_bc.boundary_condition_objects[0] != wall_id:
+                issues.append(AdjacencyIssue(
+                    bc_path, 'non_reciprocal',
+                    'Wall {} is adjacent to {} but {} is not adjacent to it.'.format(
+                        wall_id, adj_face, adj_face)))
+    return issues
+
+
+def check_adjacencies(model):
+    """Get a list of the errors in the wall boundary conditions of all Stories of a Model.
+
+    Args:
+        model: A dragonfly Model.
+
+    Returns:
+        A list of AdjacencyIssue, which is empty if all walls are valid.
+    """
+    issues = []
+    for b_i, building in enumerate(model.buildings or ()):
+        for s_i, story in enumerate(building.unique_stories or ()):
+            issues.extend(check_story_adjacencies(
+                story, ('buildings', b_i, 'unique_stories', s_i)))
+    return issues
+
+
+def use_check_adjacency(info):
+    """Check whether the context of a pydantic ValidationInfo requests the check."""
+    return bool(info.context) and bool(info.context.get(CHECK_ADJACENCY))
+
+
+def adjacency_messages(issues, max_count=10):
+    """Get a list of text messages describing wall boundary condition errors.
+
+    Args:
+        issues: A list of AdjacencyIssue from check_adjacencies.
+        max_count: An integer for the maximum number of errors that are
+            described. (Default: 10).
+    """
+    messages = ['{} at {}: {}'.format(
+        issue.kind, '/'.join(str(key) for key in issue.path), issue.message)
+        for issue in issues[:max_count]]
+    if len(issues) > max_count:
+        messages.append('And {} other adjacency errors.'.format(len(issues) - max_count))
+    return messages
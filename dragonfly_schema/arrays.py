@@ -0,0 +1,113 @@
+"""Optional NumPy-backed coordinate arrays for Room2D floor geometry.
+
+When a Room2D is validated with the COORDINATE_ARRAYS validation context, the
+floor_boundary and each of the floor_holes are validated in a single pass into
+a contiguous (N, 2) float64 NumPy array instead of a list of [x, y] lists.
+The arrays are serialized back to nested lists such that the JSON format
+is unchanged and Room2Ds with arrays are equal to Room2Ds with the same
+coordinates in lists.
+
+As with the numbers of plain float fields, NaN and infinity are accepted in
+the arrays while values that are not numbers (eg. None) are rejected.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.arrays import COORDINATE_ARRAYS
+
+    model = Model.model_validate_json(data, context={COORDINATE_ARRAYS: True})
+"""
+
+COORDINATE_ARRAYS = 'coordinate_arrays'
+_np = None
+
+
+def _numpy():
+    """Import NumPy, raising a helpful error if it is not installed."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError(
+                'numpy module is not installed and is required for coordinate '
+                'arrays. Try `pip install numpy` command.'
+            )
+        _np = numpy
+    return _np
+
+
+def use_coordinate_arrays(info):
+    """Check whether the context of a pydantic ValidationInfo requests arrays."""
+    return bool(info.context) and bool(info.context.get(COORDINATE_ARRAYS))
+
+
+def is_array(value):
+    """Check whether a value is a NumPy array without importing NumPy."""
+    return type(value).__module__ == 'numpy' and type(value).__name__ == 'ndarray'
+
+
+def to_point_array(points, min_count=3):
+    """Validate a list of 2D points into a contiguous (N, 2) float64 array.
+
+    Args:
+        points: A list of 2D points where each point is a list of 2 numbers.
+        min_count: The minimum number of points in the list. (Default: 3).
+    """
+    np = _numpy()
+    try:
+        array = np.asarray(points, dtype=np.float64)
+    except (ValueError, TypeError):
+        raise ValueError('Each point must be a list of 2 (x, y) numbers.')
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError('Each point must be a list of 2 (x, y) numbers.')
+    if array.shape[0] < min_count:
+        raise ValueError('The list should include at least {} points. Got {}.'.format(
+            min_count, array.shape[0]))
+    if np.isnan(array.sum()) and \
+            any(val is None for point in points for val in point):
+        raise ValueError('Each point must be a list of 2 (x, y) numbers.')
+    return array
+
+
+def to_point_arrays(point_lists, min_count=3):
+    """Validate a list of lists of 2D points into a list of (N, 2) float64 arrays."""
+    if point_lists is None:
+        return None
+    if not isinstance(point_lists, (list, tuple)):
+        raise ValueError('Expected a list of lists of 2D points.')
+    return [to_point_array(points, min_count) for points in point_lists]
+
+
+def has_arrays(value):
+    """Check whether a point array or a list of point arrays has any arrays."""
+    return value is not None and (is_array(value) or (
+        len(value) > 0 and is_array(value[0])))
+
+
+def points_equal(points_1, points_2):
+    """Check whether two lists or arrays of points have the same coordinates."""
+    if points_1 is None or points_2 is None:
+        return points_1 is None and points_2 is None
+    if not is_array(points_1) and not is_array(points_2):
+        return points_1 == points_2
+    np = _numpy()
+    return np.array_equal(np.asarray(points_1, dtype=np.float64),
+                          np.asarray(points_2, dtype=np.float64))
+
+
+def point_lists_equal(point_lists_1, point_lists_2):
+    """Check whether two lists of lists or arrays of points have the same coordinates."""
+    if point_lists_1 is None or point_lists_2 is None:
+        return point_lists_1 is None and point_lists_2 is None
+    return len(point_lists_1) == len(point_lists_2) and all(
+        points_equal(p_1, p_2) for p_1, p_2 in zip(point_lists_1, point_lists_2))
+
+
+def to_lists(value):
+    """Convert a point array (or a list of point arrays) to nested lists."""
+    if is_array(value):
+        return value.tolist()
+    return [to_lists(v) for v in value]
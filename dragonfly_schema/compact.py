@@ -0,0 +1,314 @@
+"""Compact encodings of Models that store repeated data once.
+
+In the vertex pool encoding, the floor_boundary and floor_holes of the Room2Ds
+of each Story are lists of integer indices into a single list of story vertices.
+Vertices of different Room2Ds within the Model tolerance of one another share
+the same index, which makes the Room2Ds that share an edge cheap to find. The
+few merged vertices that are not exactly equal to the vertex of the story keep
+their original coordinates such that the encoding is lossless.
+
+In the parameter table encoding, the boundary_conditions, window_parameters and
+shading_parameters of all Room2Ds are lists of integer indices into a single
+table of the distinct parameters of the Model. Loading the encoding validates
+each distinct parameter once and gives all walls with the same parameter the
+same shared frozen instance.
+
+Usage:
+
+.. code-block:: python
+
+    import json
+    from dragonfly_schema.compact import dump_vertex_pool, load_vertex_pool, \
+        dump_parameter_table, load_parameter_table
+
+    data = json.dumps(dump_vertex_pool(model))
+    model = load_vertex_pool(json.loads(data))
+
+    data = json.dumps(dump_parameter_table(model))
+    model = load_parameter_table(json.loads(data))
+"""
+import math
+from typing import List, Union, Annotated, get_args
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from ._union import TypeDiscriminator
+from .identifiers import iter_objects
+from .interning import intern
+from .model import Room2D, Model
+
+PARAMETER_FIELDS = ('boundary_conditions', 'window_parameters', 'shading_parameters')
+# key of Room2D dicts for [position, x, y] of vertices that differ from the story
+EXACT_VERTICES = 'exact_vertices'
+
+
+class _VertexPool:
+    """A list of 2D vertices where vertices within a tolerance share an index.
+
+    Vertices are binned into a grid of cells that are the size of the tolerance
+    such that only the vertices in the 9 cells around a vertex are compared.
+    """
+
+    def __init__(self, tolerance):
+        self.tolerance = tolerance
+        self.vertices = []
+        self._cells = {}
+
+    def _cell(self, x, y):
+        if self.tolerance == 0:
+            return x, y
+        return math.floor(x / self.tolerance), math.floor(y / self.tolerance)
+
+    def index(self, point):
+        """Get the index of the vertex of the pool that matches a point."""
+        x, y = point
+        cx, cy = self._cell(x, y)
+        if self.tolerance == 0:
+            for i in self._cells.get((cx, cy), ()):
+                return i
+        else:
+            tol = self.tolerance
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for i in self._cells.get((cx + dx, cy + dy), ()):
+                        vx, vy = self.vertices[i]
+                        if abs(vx - x) <= tol and abs(vy - y) <= tol:
+                            return i
+        i = len(self.vertices)
+        self.vertices.append([x, y])
+        self._cells.setdefault((cx, cy), []).append(i)
+        return i
+
+
+def _item_classes(field):
+    """Get the classes of the items of a list field of Room2D."""
+    list_type = [arg for arg in get_args(Room2D.model_fields[field].annotation)
+                 if arg is not type(None)][0]
+    item_type = get_args(get_args(list_type)[0])[0]  # remove the Annotated
+    return [arg for arg in get_args(item_type) if arg is not type(None)]
+
+
+_PARAMETER_ADAPTER = TypeAdapter(List[Annotated[
+    Union[tuple(cls for field in PARAMETER_FIELDS for cls in _item_classes(field))],
+    TypeDiscriminator()
+]])
+
+
+def _room_dicts(model_dict, model):
+    """Yield a (room_2d, room_dict) tuple for each Room2D of a Model and its dict."""
+    for obj_type, obj, path in iter_objects(model):
+        if obj_type == 'Room2D':
+            obj_dict = model_dict
+            for key in path:
+                obj_dict = obj_dict[key]
+            yield obj, obj_dict
+
+
+def dump_story_vertices(story_dict, tolerance=0.01):
+    """Get a copy of a Story dict with the Room2D vertices in a story vertex pool.
+
+    Args:
+        story_dict: A dictionary of a Story with lists of coordinates for the
+            floor_boundary and floor_holes of its Room2Ds.
+        tolerance: The maximum difference between x and y values at which
+            vertices are merged into one vertex of the story. (Default: 0.01).
+
+    Returns:
+        A copy of the Story dict with a vertices key for the list of [x, y]
+        story vertices. The floor_boundary of each Room2D is a list of indices
+        into the vertices and the floor_holes are lists of such lists. Any
+        Room2D with vertices that differ from the story vertex that they were
+        merged into has an exact_vertices list of [position, x, y], where the
+        position counts the vertices of the boundary followed by the holes.
+    """
+    pool = _VertexPool(tolerance)
+    rooms = []
+    for room in story_dict['room_2ds']:
+        room = dict(room)
+        exact, position = [], 0
+        loops = [room['floor_boundary']] + list(room.get('floor_holes') or ())
+        indices = []
+        for loop in loops:
+            loop_indices = []
+            for point in loop:
+                i = pool.index(point)
+                if pool.vertices[i] != list(point):
+                    exact.append([position] + list(point))
+                loop_indices.append(i)
+                position += 1
+            indices.append(loop_indices)
+        room['floor_boundary'] = indices[0]
+        if room.get('floor_holes') is not None:
+            room['floor_holes'] = indices[1:]
+        if exact:
+            room[EXACT_VERTICES] = exact
+        rooms.append(room)
+    return dict(story_dict, vertices=pool.vertices, room_2ds=rooms)
+
+
+def load_story_vertices(story_dict):
+    """Get a copy of a Story dict from dump_story_vertices with coordinate lists.
+
+    Args:
+        story_dict: A dictionary of a Story in the vertex pool encoding.
+
+    Returns:
+        A dictionary of the Story with lists of coordinates for the floor_boundary
+        and floor_holes of the Room2Ds that can be validated as a Story.
+    """
+    story_dict = dict(story_dict)
+    vertices = story_dict.pop('vertices')
+    rooms = []
+    for room in story_dict['room_2ds']:
+        room = dict(room)
+        loops = [room['floor_boundary']] + list(room.get('floor_holes') or ())
+        points = [list(vertices[i]) for loop in loops for i in loop]
+        for position, x, y in room.pop(EXACT_VERTICES, ()):
+            points[position] = [x, y]
+        count = len(room['floor_boundary'])
+        room['floor_boundary'] = points[:count]
+        if room.get('floor_holes') is not None:
+            holes = []
+            for hole in room['floor_holes']:
+                holes.append(points[count:count + len(hole)])
+                count += len(hole)
+            room['floor_holes'] = holes
+        rooms.append(room)
+    story_dict['room_2ds'] = rooms
+    return story_dict
+
+
+def adjacent_room_pairs(story_dict):
+    """Get the pairs of Room2Ds that share an edge in a Story dict with a vertex pool.
+
+    Args:
+        story_dict: A dictionary of a Story from dump_story_vertices.
+
+    Returns:
+        A sorted list of (i, j) tuples with i < j for the indices of Room2Ds
+        that have at least one edge between the same two story vertices.
+    """
+    edges = {}
+    for room_i, room in enumerate(story_dict['room_2ds']):
+        for loop in [room['floor_boundary']] + list(room.get('floor_holes') or ()):
+            for i, start in enumerate(loop):
+                end = loop[i - 1]
+                if start != end:
+                    edges.setdefault((min(start, end), max(start, end)), set()).add(room_i)
+    pairs = set()
+    for rooms in edges.values():
+        if len(rooms) > 1:
+            rooms = sorted(rooms)
+            pairs.update((a, b) for k, a in enumerate(rooms) for b in rooms[k + 1:])
+    return sorted(pairs)
+
+
+def _map_stories(model_dict, function):
+    """Get a copy of a Model dict with a function applied to the dict of each Story."""
+    model_dict = dict(model_dict)
+    if model_dict.get('buildings'):
+        buildings = []
+        for building in model_dict['buildings']:
+            building = dict(building)
+            if building.get('unique_stories'):
+                building['unique_stories'] = \
+                    [function(story) for story in building['unique_stories']]
+            buildings.append(building)
+        model_dict['buildings'] = buildings
+    return model_dict
+
+
+def dump_vertex_pool(model):
+    """Get a dictionary of a Model with the vertices of each Story in a vertex pool.
+
+    Args:
+        model: A dragonfly Model. Vertices are merged within its tolerance.
+
+    Returns:
+        A dictionary of the Model with only the fields that were set, where each
+        Story is encoded with dump_story_vertices.
+    """
+    model_dict = model.model_dump(mode='json', exclude_unset=True)
+    return _map_stories(
+        model_dict, lambda story: dump_story_vertices(story, model.tolerance))
+
+
+def load_vertex_pool(data, context=None):
+    """Validate a Model from a dictionary of the vertex pool encoding.
+
+    Args:
+        data: A dictionary from dump_vertex_pool.
+        context: An optional dictionary of validation context. (Default: None).
+    """
+    return Model.model_validate(_map_stories(data, load_story_vertices), context=context)
+
+
+def dump_parameter_table(model):
+    """Get a dictionary of a Model with Room2D parameters referencing a table.
+
+    Args:
+        model: A dragonfly Model.
+
+    Returns:
+        A dictionary with two keys that can be serialized to JSON.
+
+        -   parameters: A list of dictionaries for each distinct parameter.
+
+        -   model: A dictionary of the Model with only the fields that were
+            set and where each item of the Room2D boundary_conditions,
+            window_parameters and shading_parameters is an integer index
+            into the parameters or None.
+    """
+    model_dict = model.model_dump(mode='json', exclude_unset=True)
+    parameters, indices = [], {}
+    for room, room_dict in _room_dicts(model_dict, model):
+        for field in PARAMETER_FIELDS:
+            objs = getattr(room, field)
+            if objs is None or field not in room_dict:
+                continue
+            items = []
+            for obj in objs:
+                if obj is None:
+                    items.append(None)
+                    continue
+                key = to_json(obj)
+                index = indices.get(key)
+                if index is None:
+                    index = indices[key] = len(parameters)
+                    parameters.append(obj.model_dump(mode='json', exclude_unset=True))
+                items.append(index)
+            room_dict[field] = items
+    return {'parameters': parameters, 'model': model_dict}
+
+
+def load_parameter_table(data, context=None):
+    """Validate a Model from a dictionary of the parameter table encoding.
+
+    Args:
+        data: A dictionary from dump_parameter_table.
+        context: An optional dictionary of validation context. (Default: None).
+
+    Returns:
+        The validated Model, where all parameters with the same values are the
+        same shared frozen instance.
+    """
+    parameters = [intern(obj) for obj in _PARAMETER_ADAPTER.validate_python(
+        data['parameters'], context=context)]
+    # copy the dicts from the Model to each Room2D such that data is not modified
+    model_dict = dict(data['model'])
+    if model_dict.get('buildings'):
+        model_dict['buildings'] = buildings = [dict(b) for b in model_dict['buildings']]
+        for building in buildings:
+            if not building.get('unique_stories'):
+                continue
+            building['unique_stories'] = stories = \
+                [dict(story) for story in building['unique_stories']]
+            for story in stories:
+                story['room_2ds'] = rooms = [dict(room) for room in story['room_2ds']]
+                for room in rooms:
+                    for field in PARAMETER_FIELDS:
+                        if room.get(field) is not None:
+                            room[field] = [None if i is None else parameters[i]
+                                           for i in room[field]]
+    return Model.model_validate(model_dict, context=context)
@@ -4,6 +4,7 @@ from typing import List, Union, Literal, Annotated
 
 from honeybee_schema._base import NoExtraBaseModel
 
+from .._union import TypeDiscriminator
 from ..window_parameter import SingleWindow, SimpleWindowArea, SimpleWindowRatio, \
     RepeatingWindowRatio, RectangularWindows, DetailedWindows
 from ..skylight_parameter import GriddedSkylightArea, GriddedSkylightRatio, \
@@ -36,18 +37,18 @@ class Room2DComparisonProperties(NoExtraBaseModel):
         'holes in the floor plate.'
     )
 
-    comparison_windows: Union[List[Union[
+    comparison_windows: Union[List[Annotated[Union[
         None, SingleWindow, SimpleWindowArea, SimpleWindowRatio, RepeatingWindowRatio,
         RectangularWindows, DetailedWindows
-    ]], None] = Field(
+    ], TypeDiscriminator()]], None] = Field(
         default=None,
         description='A list of WindowParameter objects that dictate the window '
         'geometries of the Room2D to which the host Room2D is being compared.'
     )
 
-    comparison_skylight: Union[
+    comparison_skylight: Annotated[Union[
         None, GriddedSkylightArea, GriddedSkylightRatio, DetailedSkylights
-    ] = Field(
+    ], TypeDiscriminator()] = Field(
         default=None,
         description='A SkylightParameter object for the Room2D to which the host '
         'Room2D is being compared.'
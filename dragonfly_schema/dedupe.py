@@ -0,0 +1,236 @@
+"""Collapse energy resources of a Model that are identical except for their identifiers.
+
+The content of each resource without its identifier and display_name is
+serialized to canonical JSON with sorted keys and hashed. Resources with the
+same hash as an earlier resource of the same list are removed and all references
+to them are rewritten to the identifier of the earlier resource. Lists are
+processed in dependency order (schedule type limits, schedules, materials,
+constructions, construction sets and program types) such that resources that
+only differed by a reference to a duplicate are also collapsed.
+
+HVACs and SHW systems are not collapsed since Rooms that share the same
+system are simulated with a single shared system.
+
+References are rewritten by the type of resource that they refer to, which is
+found from the key of the reference (see REFERENCE_KEYS). A text value is only
+rewritten if it is under a key that references the type of the removed resource
+such that, for example, a schedule identifier that matches the identifier of a
+removed material is left as it is.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.dedupe import dedupe_resources
+
+    model = Model.model_validate_json(data)
+    deduped_model, remapped = dedupe_resources(model)
+"""
+import json
+import hashlib
+
+from pydantic_core import to_jsonable_python
+
+from .prune import _copy
+from .references import get_value
+
+DEDUPE_ORDER = ('schedule_type_limits', 'schedules', 'materials', 'constructions',
+                'construction_sets', 'program_types')
+_NAME_KEYS = frozenset(('identifier', 'display_name'))
+# the keys of the values that reference each type of resource that is collapsed
+REFERENCE_KEYS = {
+    'schedule_type_limits': ('schedule_type_limit',),
+    'schedules': (
+        'schedule', 'occupancy_schedule', 'activity_schedule', 'cooling_schedule',
+        'heating_schedule', 'humidifying_schedule', 'dehumidifying_schedule',
+        'air_mixing_schedule', 'transmittance_schedule', 'cooling_availability',
+        'heating_availability', 'doas_availability_schedule'),
+    'materials': ('materials', 'shade_material', 'frame'),
+    'constructions': (
+        'construction', 'exterior_construction', 'interior_construction',
+        'ground_construction', 'window_construction', 'skylight_construction',
+        'operable_construction', 'exterior_glass_construction',
+        'interior_glass_construction', 'overhead_construction', 'shade_construction',
+        'air_boundary_construction', 'context_construction',
+        'ceiling_plenum_construction', 'floor_plenum_construction'),
+    'construction_sets': ('construction_set',),
+    'program_types': ('program_type',)
+}
+
+
+def content_hash(obj_dict):
+    """Get a hash of the canonical JSON of a resource without its identifier.
+
+    Args:
+        obj_dict: A dictionary of a resource.
+
+    Returns:
+        Bytes for the SHA-256 digest of the content of the resource.
+    """
+    content = {k: v for k, v in obj_dict.items() if k not in _NAME_KEYS}
+    canonical = json.dumps(content, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).digest()
+
+
+def _key_renames(remapped):
+    """Get a dictionary of each reference key mapped to the renames of its resource."""
+    return {key: remapped[resource] for resource, keys in REFERENCE_KEYS.items()
+            if resource in remapped for key in keys}
+
+
+def _rewrite(value, key_renames, renames=None):
+    """Rewrite a value with the renames of the key that it is under."""
+    if isinstance(value, str):
+        return value if renames is None else renames.get(value, value)
+    if isinstance(value, dict):
+        new_value = None
+        for key, val in value.items():
+            if isinstance(val, (float, int)):
+                continue
+            new_val = _rewrite(val, key_renames, key_renames.get(key))
+            if new_val is not val:
+                new_value = new_value or dict(value)
+                new_value[key] = new_val
+        return value if new_value is None else new_value
+    if isinstance(value, list):
+        new_value = [_rewrite(val, key_renames, renames) for val in value]
+        if any(new is not old for new, old in zip(new_value, value)):
+            return new_value
+    return value
+
+
+def rewrite_references(value, remapped):
+    """Get a copy of a JSON-like value with all referenced identifiers remapped.
+
+    Args:
+        value: A JSON-like value of dictionaries, lists and text.
+        remapped: A dictionary with the names of resource lists as keys (eg.
+            schedules, materials) and dictionaries of old identifiers mapped to
+            new identifiers as values. Only the values under the REFERENCE_KEYS
+            of each resource list are rewritten with its identifiers.
+
+    Returns:
+        The rewritten value, which is the input value itself if there was
+        nothing to rewrite.
+    """
+    return _rewrite(value, _key_renames(remapped))
+
+
+def _rewrite_object(obj, key_renames):
+    """Get a copy of a schema object with references remapped or None if unchanged."""
+    if obj is None:
+        return None
+    obj_dict = obj if isinstance(obj, dict) else \
+        obj.model_dump(mode='json', exclude_unset=True)
+    new_dict = _rewrite(obj_dict, key_renames)
+    if new_dict is obj_dict:
+        return None
+    return new_dict if isinstance(obj, dict) else type(obj).model_validate(new_dict)
+
+
+def _rewrite_properties(obj, key_renames):
+    """Get a copy of a geometry object with the references of its properties remapped.
+
+    None is returned if there was nothing to rewrite.
+    """
+    updates = {}
+    for extension in ('energy', 'radiance'):
+        new_props = _rewrite_object(get_value(obj.properties, extension), key_renames)
+        if new_props is not None:
+            updates[extension] = new_props
+    obj_updates = {}
+    if updates:
+        obj_updates['properties'] = _copy(obj.properties, updates)
+    if obj.type == 'Building' and obj.room_3ds:
+        room_3ds = [_rewrite_object(room, key_renames) for room in obj.room_3ds]
+        if any(room is not None for room in room_3ds):
+            obj_updates['room_3ds'] = [
+                new or old for new, old in zip(room_3ds, obj.room_3ds)]
+    return obj.model_copy(update=obj_updates) if obj_updates else None
+
+
+def _rewrite_children(objs, key_renames, child_key=None):
+    """Get a copy of a list of geometry objects with references remapped.
+
+    The child_key is the key of a list of child objects that are also rewritten.
+    None is returned if there was nothing to rewrite.
+    """
+    changed, new_objs = False, []
+    for obj in objs:
+        new_obj = _rewrite_properties(obj, key_renames)
+        if child_key is not None and getattr(obj, child_key):
+            children = _rewrite_children(
+                getattr(obj, child_key), key_renames,
+                'room_2ds' if child_key == 'unique_stories' else None)
+            if children is not None:
+                new_obj = (new_obj or obj).model_copy(update={child_key: children})
+        changed = changed or new_obj is not None
+        new_objs.append(new_obj or obj)
+    return new_objs if changed else None
+
+
+def dedupe_resources(model):
+    """Get a copy of a Model with duplicated energy resources collapsed into one.
+
+    Args:
+        model: A dragonfly Model.
+
+    Returns:
+        A tuple with two items.
+
+        -   deduped_model: A copy of the Model with the duplicated resources
+            removed and all references to them remapped. Objects that have
+            not changed are shared with the input.
+
+        -   remapped: A dictionary with the names of the resource lists as keys
+            and dictionaries of the identifiers of removed resources mapped to
+            the identifiers of the resources that replace them as values.
+    """
+    energy = model.properties.energy
+    if energy is None:
+        return model, {}
+    energy_dict = energy if isinstance(energy, dict) else to_jsonable_python(energy)
+    key_renames, remapped, updates = {}, {}, {}
+    for key in DEDUPE_ORDER:
+        objs = energy_dict.get(key)
+        if not objs:
+            continue
+        kept, seen, changed = [], {}, False
+        for obj in objs:
+            new_obj = _rewrite(obj, key_renames) if key_renames else obj
+            digest = content_hash(new_obj)
+            if digest in seen:
+                remapped.setdefault(key, {})[obj['identifier']] = seen[digest]
+                changed = True
+            else:
+                seen[digest] = obj['identifier']
+                kept.append(new_obj)
+                changed = changed or new_obj is not obj
+        if key in remapped:
+            key_renames = _key_renames(remapped)
+        if changed:
+            updates[key] = kept
+    if not key_renames:
+        return model, {}
+
+    # rebuild the energy properties and any geometry objects that reference them
+    for key in ('hvacs', 'shws'):  # not collapsed but they may reference schedules
+        objs = energy_dict.get(key)
+        if objs:
+            new_objs = _rewrite(objs, key_renames)
+            if new_objs is not objs:
+                updates[key] = new_objs
+    new_energy = dict(energy_dict, **updates)
+    if not isinstance(energy, dict):
+        new_energy = type(energy).model_validate(new_energy)
+    model_updates = {'properties': _copy(model.properties, {'energy': new_energy})}
+    if model.buildings:
+        buildings = _rewrite_children(model.buildings, key_renames, 'unique_stories')
+        if buildings is not None:
+            model_updates['buildings'] = buildings
+    if model.context_shades:
+        shades = _rewrite_children(model.context_shades, key_renames)
+        if shades is not None:
+            model_updates['context_shades'] = shades
+    return model.model_copy(update=model_updates), remapped
@@ -0,0 +1,227 @@
+"""Structural differences between two Models as a compact patch.
+
+Buildings, Stories, Room2Ds and ContextShades are matched between the Models
+by their identifiers rather than their position in the lists. If a list has
+several objects with the same identifier, the second is matched by the key
+"identifier#1", the third by "identifier#2" and so on.
+
+Coordinates and heights are compared within the tolerance of the new Model.
+All other values, including any other floats, are compared exactly such that
+an edit is never hidden by the tolerance.
+
+A patch is a list of operations that can be serialized to JSON. Each operation
+has an op, a path of field names and identifier keys from the Model and, for
+some operations, a value.
+
+-   update: Set the fields of the value dict on the object at the path and
+    reset any fields in the list under the unset key to their defaults.
+
+-   replace: Replace the Room2D or ContextShade at the path with the value dict.
+
+-   add: Append the value dict to the list at the path without the last key.
+
+-   remove: Remove the object at the path.
+
+-   order: Rearrange the list at the path, which is in its original order
+    without the removed objects and with the added objects at the end, into
+    the order of the value list of indices.
+
+Applying a patch only validates the objects of the replace and add operations.
+The Buildings, Stories and Model above them are built from their existing
+objects such that only their own validators run.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.diff import diff_models, apply_patch
+
+    patch = diff_models(old_model, new_model)
+    new_model = apply_patch(old_model, patch)
+"""
+from .model import Room2D, Story, Building, ContextShade, Model
+
+# the child lists of each type of object and the class of their items
+CHILD_FIELDS = {
+    'Model': {'buildings': Building, 'context_shades': ContextShade},
+    'Building': {'unique_stories': Story},
+    'Story': {'room_2ds': Room2D}
+}
+# keys of lengths that are compared within the Model tolerance
+LENGTH_KEYS = frozenset((
+    'floor_height', 'floor_to_ceiling_height', 'floor_to_floor_height',
+    'ceiling_plenum_depth', 'floor_plenum_depth'
+))
+
+
+def values_equal(value_1, value_2, tolerance, is_length=False):
+    """Check whether two JSON-like values are equal within a tolerance.
+
+    Args:
+        value_1: A JSON-like value of dictionaries, lists, text and numbers.
+        value_2: Another JSON-like value.
+        tolerance: The maximum difference between floats that are lengths.
+        is_length: Boolean to note whether floats of the values are lengths.
+            Floats of all lists of numbers within lists (coordinates) and of
+            the keys in LENGTH_KEYS are always lengths. (Default: False).
+    """
+    if isinstance(value_1, dict):
+        return isinstance(value_2, dict) and value_1.keys() == value_2.keys() and \
+            all(values_equal(val, value_2[key], tolerance, key in LENGTH_KEYS)
+                for key, val in value_1.items())
+    if isinstance(value_1, list):
+        if not isinstance(value_2, list) or len(value_1) != len(value_2):
+            return False
+        is_points = all(isinstance(val, list) for val in value_1)
+        return all(values_equal(val_1, val_2, tolerance, is_length or is_points)
+                   for val_1, val_2 in zip(value_1, value_2))
+    if is_length and type(value_1) is float and type(value_2) is float:
+        return abs(value_1 - value_2) <= tolerance
+    return value_1 == value_2 and type(value_1) is type(value_2)
+
+
+def object_keys(objs):
+    """Get a list of the keys that match each object of a list between Models."""
+    keys, counts = [], {}
+    for obj in objs:
+        count = counts.get(obj.identifier, 0)
+        counts[obj.identifier] = count + 1
+        keys.append(obj.identifier if count == 0 else
+                    '{}#{}'.format(obj.identifier, count))
+    return keys
+
+
+def _dump(obj, exclude=None):
+    """Get a JSON-like dictionary of the fields of an object that were set."""
+    return obj.model_dump(mode='json', exclude_unset=True, exclude=exclude)
+
+
+def _diff_fields(old, new, path, tolerance, patch):
+    """Add an update operation for the fields of an object that are not child lists."""
+    children = [field for field in CHILD_FIELDS.get(new.type, ())
+                if getattr(old, field) is not None and getattr(new, field) is not None]
+    old_dict = _dump(old, exclude=set(children))
+    new_dict = _dump(new, exclude=set(children))
+    value = {key: val for key, val in new_dict.items()
+             if key not in old_dict or not values_equal(old_dict[key], val, tolerance)}
+    unset = [key for key in old_dict if key not in new_dict]
+    if value or unset:
+        operation = {'op': 'update', 'path': path, 'value': value}
+        if unset:
+            operation['unset'] = unset
+        patch.append(operation)
+    return children
+
+
+def _diff_object(old, new, path, tolerance, patch):
+    """Add the operations to turn an object into another with the same identifier."""
+    if old is new or old == new:
+        return
+    children = CHILD_FIELDS.get(new.type)
+    if children is None:  # Room2Ds and ContextShades are replaced as a whole
+        new_dict = _dump(new)
+        if not values_equal(_dump(old), new_dict, tolerance):
+            patch.append({'op': 'replace', 'path': path, 'value': new_dict})
+        return
+    for field in _diff_fields(old, new, path, tolerance, patch):
+        _diff_list(getattr(old, field), getattr(new, field), path + [field],
+                   tolerance, patch)
+
+
+def _diff_list(old_objs, new_objs, path, tolerance, patch):
+    """Add the operations to turn a list of objects into another list."""
+    if old_objs is new_objs:
+        return
+    old_keys, new_keys = object_keys(old_objs), object_keys(new_objs)
+    new_map = dict(zip(new_keys, new_objs))
+    result = []  # the keys of the list after removing and adding objects
+    for key, obj in zip(old_keys, old_objs):
+        if key in new_map:
+            _diff_object(obj, new_map[key], path + [key], tolerance, patch)
+            result.append(key)
+        else:
+            patch.append({'op': 'remove', 'path': path + [key]})
+    old_set = set(old_keys)
+    for key, obj in zip(new_keys, new_objs):
+        if key not in old_set:
+            patch.append({'op': 'add', 'path': path + [key], 'value': _dump(obj)})
+            result.append(key)
+    if result != new_keys:
+        positions = {key: i for i, key in enumerate(result)}
+        patch.append({'op': 'order', 'path': path,
+                      'value': [positions[key] for key in new_keys]})
+
+
+def diff_models(old_model, new_model):
+    """Get a patch with the operations that turn one Model into another.
+
+    Args:
+        old_model: The dragonfly Model to which the patch will be applied.
+        new_model: The dragonfly Model that results from applying the patch.
+            Coordinates and heights are compared within its tolerance.
+
+    Returns:
+        A list of dictionaries for the operations of the patch, which is empty
+        if the Models are equal.
+    """
+    patch = []
+    _diff_object(old_model, new_model, [], new_model.tolerance, patch)
+    return patch
+
+
+def _apply(obj, operations, context):
+    """Get a copy of an object with operations applied relative to its path."""
+    fields = {key: getattr(obj, key) for key in obj.model_fields_set}
+    lists = {}  # the operations for each child list
+    for operation in operations:
+        path = operation['path']
+        if not path:
+            fields.update(operation['value'])
+            for key in operation.get('unset', ()):
+                fields.pop(key, None)
+        else:
+            lists.setdefault(path[0], []).append(dict(operation, path=path[1:]))
+    for field, list_ops in lists.items():
+        fields[field] = _apply_list(
+            getattr(obj, field), CHILD_FIELDS[obj.type][field], list_ops, context)
+    return type(obj).model_validate(fields, context=context)
+
+
+def _apply_list(objs, cls, operations, context):
+    """Get a copy of a list of objects with operations applied relative to its path."""
+    keys = object_keys(objs)
+    objs = dict(zip(keys, objs))
+    children, added, order = {}, [], None
+    for operation in operations:
+        path, op = operation['path'], operation['op']
+        if not path:
+            order = operation['value']
+        elif len(path) > 1 or op == 'update':
+            children.setdefault(path[0], []).append(dict(operation, path=path[1:]))
+        elif op == 'replace':
+            objs[path[0]] = cls.model_validate(operation['value'], context=context)
+        elif op == 'remove':
+            del objs[path[0]]
+        elif op == 'add':
+            added.append(cls.model_validate(operation['value'], context=context))
+    for key, child_ops in children.items():
+        objs[key] = _apply(objs[key], child_ops, context)
+    result = list(objs.values()) + added
+    return result if order is None else [result[i] for i in order]
+
+
+def apply_patch(model, patch, context=None):
+    """Get a copy of a Model with the operations of a patch applied.
+
+    Args:
+        model: The dragonfly Model that the patch was made from.
+        patch: A list of operations from diff_models.
+        context: An optional dictionary of validation context. (Default: None).
+
+    Returns:
+        A new Model. Objects that are not touched by the patch are shared with
+        the input Model.
+    """
+    if not patch:
+        return model
+    return _apply(model, patch, context)
@@ -1,6 +1,6 @@
 """Model energy properties."""
 from pydantic import Field
-from typing import List, Union, Literal, Optional
+from typing import List, Union, Literal, Optional, Annotated
 
 from honeybee_schema._base import NoExtraBaseModel
 from honeybee_schema.energy.programtype import ProgramTypeAbridged, ProgramType
@@ -31,6 +31,8 @@ from honeybee_schema.energy.material import EnergyMaterial, EnergyMaterialNoMass
 from honeybee_schema.energy.schedule import ScheduleTypeLimit, ScheduleRulesetAbridged, \
     ScheduleFixedIntervalAbridged, ScheduleRuleset, ScheduleFixedInterval
 
+from .._union import TypeDiscriminator
+
 
 class Room2DEnergyPropertiesAbridged(NoExtraBaseModel):
 
@@ -240,47 +242,47 @@ class ModelEnergyProperties(NoExtraBaseModel):
         json_schema_extra={'readOnly': True}
     )
 
-    construction_sets: Union[
-        List[Union[ConstructionSetAbridged, ConstructionSet]], None
-    ] = Field(
+    construction_sets: Union[List[Annotated[
+        Union[ConstructionSetAbridged, ConstructionSet], TypeDiscriminator()
+    ]], None] = Field(
         default=None,
         description='List of all ConstructionSets in the Model.'
     )
 
-    constructions: Union[List[
+    constructions: Union[List[Annotated[
         Union[
             OpaqueConstructionAbridged, WindowConstructionAbridged,
             ShadeConstruction, AirBoundaryConstructionAbridged,
             OpaqueConstruction, WindowConstruction, AirBoundaryConstruction
-        ]
-    ], None] = Field(
+        ], TypeDiscriminator()
+    ]], None] = Field(
         default=None,
         description='A list of all unique constructions in the model. This includes '
         'constructions across all the Model construction_sets.'
     )
 
-    materials: Union[List[
+    materials: Union[List[Annotated[
         Union[
             EnergyMaterial, EnergyMaterialNoMass, EnergyMaterialVegetation,
             EnergyWindowMaterialGas, EnergyWindowMaterialGasCustom,
             EnergyWindowMaterialGasMixture, EnergyWindowFrame,
             EnergyWindowMaterialSimpleGlazSys, EnergyWindowMaterialGlazing,
             EnergyWindowMaterialBlind, EnergyWindowMaterialShade
-        ]
-    ], None] = Field(
+        ], TypeDiscriminator()
+    ]], None] = Field(
         default=None,
         description='A list of all unique materials in the model. This includes '
         'materials needed to make the Model constructions.'
     )
 
-    hvacs: Union[List[
+    hvacs: Union[List[Annotated[
         Union[
             IdealAirSystemAbridged, VAV, PVAV, PSZ, PTAC, ForcedAirFurnace,
             FCUwithDOASAbridged, WSHPwithDOASAbridged, VRFwithDOASAbridged,
             RadiantwithDOASAbridged, FCU, WSHP, VRF, Baseboard, EvaporativeCooler,
             Residential, WindowAC, GasUnitHeater, Radiant, DetailedHVAC
-        ]
-    ], None] = Field(
+        ], TypeDiscriminator()
+    ]], None] = Field(
         default=None,
         description='List of all HVAC systems in the Model.'
     )
@@ -290,13 +292,17 @@ class ModelEnergyProperties(NoExtraBaseModel):
         description='List of all Service Hot Water (SHW) systems in the Model.'
     )
 
-    program_types: Union[List[Union[ProgramTypeAbridged, ProgramType]], None] = Field(
+    program_types: Union[List[Annotated[
+        Union[ProgramTypeAbridged, ProgramType], TypeDiscriminator()
+    ]], None] = Field(
         default=None,
         description='List of all ProgramTypes in the Model.'
     )
 
-    schedules: Union[List[Union[ScheduleRulesetAbridged, ScheduleFixedIntervalAbridged,
-                          ScheduleRuleset, ScheduleFixedInterval]], None] = Field(
+    schedules: Union[List[Annotated[
+        Union[ScheduleRulesetAbridged, ScheduleFixedIntervalAbridged,
+              ScheduleRuleset, ScheduleFixedInterval], TypeDiscriminator()
+    ]], None] = Field(
         default=None,
         description='A list of all unique schedules in the model. This includes '
         'schedules across all HVAC systems, ProgramTypes and ContextShades.'
@@ -0,0 +1,147 @@
+"""Lazy resolution of the classes of extension properties and honeybee objects.
+
+The extension properties of dragonfly objects (energy, radiance, doe2, comparison)
+pull in large trees of honeybee_schema classes. Fields annotated with Extension
+only import and build these classes the first time that a value other than
+None is validated, which keeps the import of dragonfly_schema.model and the
+validation of geometry-only models fast.
+
+When objects are validated with the GEOMETRY_ONLY validation context, the
+values of these fields are not validated at all and are kept as they are input.
+
+Usage:
+
+.. code-block:: python
+
+    class Room2DPropertiesAbridged(BaseModel):
+
+        energy: Union[
+            Extension['.energy.properties.Room2DEnergyPropertiesAbridged'], None
+        ] = Field(default=None)
+"""
+import importlib
+from typing import Any, Annotated, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import core_schema
+
+GEOMETRY_ONLY = 'geometry_only'
+_ADAPTERS = {}
+
+
+def use_geometry_only(info):
+    """Check whether the context of a pydantic ValidationInfo is geometry-only."""
+    return bool(info.context) and bool(info.context.get(GEOMETRY_ONLY))
+
+
+class Extension(object):
+    """Annotation for a field validated with a class that is imported on first use.
+
+    Args:
+        path: The import path to the class, with the module and the class name
+            separated by a period. Paths starting with a period are relative
+            to the dragonfly_schema package.
+
+    Properties:
+        * path
+        * annotation
+    """
+    __slots__ = ('path', '_validator')
+
+    def __init__(self, path):
+        self.path = path
+        self._validator = None
+
+    def __class_getitem__(cls, path):
+        return Annotated[Any, cls(path)]
+
+    def __reduce__(self):
+        return (self.__class__, (self.path,))
+
+    @property
+    def annotation(self):
+        """Get the class to which the import path refers, importing it if necessary."""
+        module, name = self.path.rsplit('.', 1)
+        return getattr(importlib.import_module(module, 'dragonfly_schema'), name)
+
+    @property
+    def adapter(self):
+        """Get a TypeAdapter for the annotation, which is shared across all fields."""
+        try:
+            return _ADAPTERS[self.path]
+        except KeyError:
+            adapter = _ADAPTERS[self.path] = TypeAdapter(self.annotation)
+            return adapter
+
+    def validate(self, value, info):
+        """Validate a value using the annotation unless the context is geometry-only."""
+        context = info.context
+        if context and context.get(GEOMETRY_ONLY):
+            return value
+        if self._validator is None:
+            self._validator = self.adapter.validator
+        return self._validator.validate_python(value, context=context)
+
+    def __get_pydantic_core_schema__(self, source, handler):
+        # the ref on the inner schema stops pydantic from titling the field in the
+        # JSON schema, like it does not title fields that reference other models
+        inner = core_schema.any_schema(ref='{}:{}'.format(__name__, self.path))
+        return core_schema.with_info_before_validator_function(self.validate, inner)
+
+    def __get_pydantic_json_schema__(self, schema, handler):
+        # generate_inner adds models to the definitions like any other field would
+        return handler.generate_json_schema.generate_inner(self.adapter.core_schema)
+
+    def __repr__(self):
+        return 'Extension[{!r}]'.format(self.path)
+
+
+def _resolve_type(annotation):
+    """Get a copy of a type annotation with all Extensions replaced by their classes."""
+    if get_origin(annotation) is Annotated:
+        args = get_args(annotation)
+        for meta in args[1:]:
+            if isinstance(meta, Extension):
+                return meta.annotation
+        return Annotated[(_resolve_type(args[0]),) + args[1:]]
+    args = get_args(annotation)
+    if not args:
+        return annotation
+    args = tuple(_resolve_type(a) for a in args)
+    return Union[args] if get_origin(annotation) is Union \
+        else get_origin(annotation)[args]
+
+
+def _model_classes(annotation):
+    """Get all pydantic model classes within a type annotation."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return [annotation]
+    return [cls for arg in get_args(annotation) for cls in _model_classes(arg)]
+
+
+def referenced_models(cls):
+    """Get all model classes that a model references, including those of Extensions.
+
+    The classes of the Extension fields are imported but the fields of the models
+    are not changed. This is used by tools that find the models of a schema by
+    walking through field annotations, where Extension fields are seen as Any.
+
+    Args:
+        cls: A pydantic model class.
+
+    Returns:
+        A list of the model classes that are referenced by the fields of the
+        model and the fields of all of the referenced models, in the order that
+        they are found.
+    """
+    found, to_visit = {cls: None}, [cls]
+    while to_visit:
+        for field in to_visit.pop().model_fields.values():
+            extensions = [meta for meta in field.metadata if isinstance(meta, Extension)]
+            annotation = extensions[0].annotation if extensions \
+                else _resolve_type(field.annotation)
+            for field_cls in _model_classes(annotation):
+                if field_cls not in found:
+                    found[field_cls] = None
+                    to_visit.append(field_cls)
+    return list(found)[1:]
@@ -0,0 +1,249 @@
+"""Selective extraction of objects from large DFJSON files.
+
+The file is memory-mapped and its JSON structure is scanned for the byte offsets
+of the requested value, skipping over all other values without decoding them.
+Only the bytes of the requested value are read and validated with the class
+that the schema uses at that location (eg. Building, Story, ModelEnergyProperties).
+
+Values are selected either with a JSON pointer (RFC 6901) from the root of the
+Model or by the identifier of a Building. When NumPy is installed, the ends of
+the values before the requested one are found with vectorized passes over their
+bytes (see StructuralIndex) such that they are skipped without tokenizing them.
+Nothing after the end of the requested value is read and the pages of the file
+after it are therefore never loaded into memory.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.extract import extract, extract_building
+
+    building = extract_building('./large_model.dfjson', 'Office_Tower')
+    program_types = extract('./large_model.dfjson', '/properties/energy/program_types')
+    room = extract('./large_model.dfjson', '/buildings/0/unique_stories/2/room_2ds/5')
+"""
+import mmap
+from contextlib import contextmanager
+from typing import Any, Union, Annotated, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+from ._raw import StructuralIndex, skip_whitespace, value_end, decode_key, \
+    iter_members, iter_items, member_start, item_start, validate_json
+from .arrays import _numpy
+from .extension import Extension, _resolve_type, _model_classes
+from .model import Building, Model
+
+
+def parse_pointer(pointer):
+    """Get a tuple of keys and indices from a JSON pointer.
+
+    Args:
+        pointer: Text for a JSON pointer (eg. "/buildings/0/unique_stories") or
+            a list of keys and indices. Array indices are converted to integers.
+    """
+    if not isinstance(pointer, str):
+        return tuple(pointer)
+    if pointer == '':
+        return ()
+    if not pointer.startswith('/'):
+        raise ValueError('JSON pointer "{}" must start with "/".'.format(pointer))
+    return tuple(
+        int(token) if token.isdigit() else token.replace('~1', '/').replace('~0', '~')
+        for token in pointer[1:].split('/')
+    )
+
+
+def format_pointer(path):
+    """Get the text of a JSON pointer from a tuple of keys and indices."""
+    return ''.join('/' + str(key).replace('~', '~0').replace('/', '~1')
+                   for key in path)
+
+
+def _unwrap(annotation):
+    """Remove Annotated metadata and None from a type annotation."""
+    while True:
+        if get_origin(annotation) is Annotated:
+            annotation = get_args(annotation)[0]
+        elif get_origin(annotation) is Union:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            if len(args) != 1:
+                return Union[tuple(args)]
+            annotation = args[0]
+        else:
+            return annotation
+
+
+def structural_index(buf):
+    """Get a StructuralIndex of a buffer or None if NumPy is not installed."""
+    try:
+        np = _numpy()
+    except ImportError:  # scan the JSON text without an index
+        return None
+    return StructuralIndex(buf, np)
+
+
+def _object_type(buf, start, index):
+    """Get the value of the type key of the JSON object at start if it exists."""
+    if buf[start:start + 1] != b'{':
+        return None
+    for key, v_start, v_end in iter_members(buf, start, index):
+        if key == 'type':
+            return decode_key(buf, v_start, v_end)
+    return None
+
+
+def _child_annotation(annotation, key, buf, start, index):
+    """Get the annotation of a child of a value given the annotation of the value.
+
+    Args:
+        annotation: The type annotation of the value at start.
+        key: The key or index of the child.
+        buf: A bytes-like buffer of JSON text.
+        start: The index of the value in the buffer, which is used to pick the
+            class from a Union of classes using the type key of the value.
+        index: An optional StructuralIndex of the buffer.
+    """
+    annotation = _unwrap(_resolve_type(annotation))
+    if annotation is Any or annotation is dict or get_origin(annotation) is dict:
+        return Any
+    if isinstance(key, int):
+        return get_args(annotation)[0] if get_origin(annotation) is list else None
+    classes = [] if get_origin(annotation) is list else _model_classes(annotation)
+    if not classes:
+        return None
+    if len(classes) > 1:
+        obj_type = _object_type(buf, start, index)
+        classes = [cls for cls in classes if 'type' in cls.model_fields
+                   and cls.model_fields['type'].default == obj_type]
+        if len(classes) != 1:
+            return None
+    field = classes[0].model_fields.get(key)
+    if field is None:
+        return None
+    extensions = [meta for meta in field.metadata if isinstance(meta, Extension)]
+    return extensions[0].annotation if extensions else field.annotation
+
+
+def find_value(buf, pointer, cls=Model, index=None):
+    """Get the span and the type annotation of the value at a JSON pointer.
+
+    Only the values along the path are scanned and nothing is decoded other than
+    object keys and the type keys needed to pick between classes of a Union.
+
+    Args:
+        buf: A bytes-like buffer of JSON text, such as an mmap.
+        pointer: Text for a JSON pointer or a list of keys and indices.
+        cls: The class of the root value of the JSON. (Default: Model).
+        index: An optional StructuralIndex of the buffer. (Default: None).
+
+    Returns:
+        A tuple with three items.
+
+        -   start: The index of the first byte of the value.
+
+        -   end: The index after the last byte of the value.
+
+        -   annotation: The type annotation of the value within the schema.
+    """
+    path = parse_pointer(pointer)
+    start = skip_whitespace(buf, 0)
+    annotation = cls
+    for i, key in enumerate(path):
+        annotation = _child_annotation(annotation, key, buf, start, index)
+        if annotation is None:
+            raise ValueError('"{}" is not a location in the {} schema.'.format(
+                format_pointer(path[:i + 1]), cls.__name__))
+        if isinstance(key, int):
+            start = item_start(buf, start, key, index) \
+                if buf[start:start + 1] == b'[' else None
+        else:
+            start = member_start(buf, start, key, index) \
+                if buf[start:start + 1] == b'{' else None
+        if start is None:
+            raise ValueError('No value found at JSON pointer "{}".'.format(
+                format_pointer(path[:i + 1])))
+    return start, value_end(buf, start, index), annotation
+
+
+def find_building(buf, identifier, index=None):
+    """Get the index and the span of a Building in the JSON of a Model.
+
+    Args:
+        buf: A bytes-like buffer of the JSON text of a Model, such as an mmap.
+        identifier: Text for the identifier of the Building.
+        index: An optional StructuralIndex of the buffer. (Default: None).
+
+    Returns:
+        A tuple of (position, start, end) for the Building, where position is
+        the index of the Building in the Model buildings.
+    """
+    start = skip_whitespace(buf, 0)
+    buildings = member_start(buf, start, 'buildings', index)
+    if buildings is not None and buf[buildings:buildings + 1] == b'[':
+        items = iter_items(buf, buildings, index)
+        for position, (b_start, b_end) in enumerate(items):
+            for key, v_start, v_end in iter_members(buf, b_start, index):
+                if key == 'identifier':
+                    if decode_key(buf, v_start, v_end) == identifier:
+                        return position, b_start, b_end
+                    break
+    raise ValueError('No Building with the identifier "{}" was found.'.format(
+        identifier))
+
+
+@contextmanager
+def _map_file(file_path):
+    """Memory-map a file for reading."""
+    with open(file_path, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buf
+        finally:
+            buf.close()
+
+
+def _validator(annotation):
+    """Get the pydantic class or TypeAdapter to validate a type annotation."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return TypeAdapter(_resolve_type(annotation))
+
+
+def extract(file_path, pointer, cls=None, context=None):
+    """Validate the value at a JSON pointer of a DFJSON file without reading the rest.
+
+    Args:
+        file_path: Path to a DFJSON file of a Model.
+        pointer: Text for a JSON pointer (eg. "/properties/energy/program_types")
+            or a list of keys and indices.
+        cls: An optional pydantic class or TypeAdapter to validate the value. If
+            None, the class that the Model schema uses at the pointer will be
+            used. (Default: None).
+        context: An optional dictionary of validation context. (Default: None).
+
+    Returns:
+        The validated value.
+    """
+    path = parse_pointer(pointer)
+    with _map_file(file_path) as buf:
+        start, end, annotation = find_value(buf, path, index=structural_index(buf))
+        raw = buf[start:end]
+    return validate_json(cls or _validator(annotation), raw, path, context=context)
+
+
+def extract_building(file_path, identifier, context=None):
+    """Validate a Building of a DFJSON file without reading the rest of the file.
+
+    Args:
+        file_path: Path to a DFJSON file of a Model.
+        identifier: Text for the identifier of the Building.
+        context: An optional dictionary of validation context. (Default: None).
+
+    Returns:
+        The validated Building.
+    """
+    with _map_file(file_path) as buf:
+        position, start, end = find_building(buf, identifier, structural_index(buf))
+        raw = buf[start:end]
+    return validate_json(Building, raw, ('buildings', position), context=context)
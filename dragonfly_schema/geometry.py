@@ -0,0 +1,42 @@
+"""Geometry core of the dragonfly schema.
+
+Objects validated through this module have all of their geometry checked but the
+extension properties (energy, radiance, doe2, comparison), the 3D Honeybee Rooms
+of Buildings and the Model units are kept as they are input without validation.
+This means that none of the honeybee_schema energy or radiance classes are
+imported, which is useful for services that only read dragonfly geometry.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.geometry import validate_geometry
+
+    model = validate_geometry(data)  # data is the JSON text of a Model
+    footprints = [room.floor_boundary for building in model.buildings
+                  for story in building.unique_stories for room in story.room_2ds]
+"""
+from .extension import GEOMETRY_ONLY
+from .model import Room2D, Story, Building, ContextShade, Model
+
+
+def validate_geometry(data, cls=Model, context=None):
+    """Validate the geometry of a dragonfly object without its extension properties.
+
+    Args:
+        data: The JSON text (str or bytes) or the dictionary of the object.
+        cls: The dragonfly class of the object. (Default: Model).
+        context: An optional dictionary of other validation context, such as
+            the dragonfly_schema.arrays.COORDINATE_ARRAYS flag. (Default: None).
+
+    Returns:
+        The validated object.
+    """
+    context = dict(context or {}, **{GEOMETRY_ONLY: True})
+    if isinstance(data, (str, bytes, bytearray)):
+        return cls.model_validate_json(data, context=context)
+    return cls.model_validate(data, context=context)
+
+
+__all__ = ('GEOMETRY_ONLY', 'validate_geometry', 'Room2D', 'Story', 'Building',
+           'ContextShade', 'Model')
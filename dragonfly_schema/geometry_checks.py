@@ -0,0 +1,335 @@
+"""Check the floor geometry of all Room2Ds of a Model with vectorized NumPy operations.
+
+The schema only checks that the floor_boundary and floor_holes of each Room2D
+have at least 3 points of 2 values. The check_floor_geometry function finds the
+following errors within the Model tolerance, which are otherwise only found
+when the Model is translated.
+
+-   duplicate_vertex: Consecutive vertices of a boundary or hole are equal.
+
+-   zero_area: A boundary or hole is thinner than the tolerance.
+
+-   self_intersection: Two segments of the boundary and holes of a Room2D
+    cross or touch one another, other than the neighboring segments that
+    share a vertex.
+
+-   hole_outside: A hole is not inside the boundary of its Room2D.
+
+-   clockwise_boundary: The boundary is clockwise when viewed from above.
+    This is only reported when requested since clockwise boundaries are
+    reversed when the Model is translated.
+
+The vertices of all Room2Ds are packed into arrays such that the areas and
+orientations of all boundaries and holes are computed at once. Segments that
+may intersect are found with a sweep along the X axis over the segments of each
+Room2D, which is done for all Room2Ds at once by sorting the segments, and only
+these candidate pairs are tested.
+
+When a Model is validated with the CHECK_GEOMETRY validation context, an error
+is raised if any Room2D has a geometry error.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.geometry_checks import check_floor_geometry
+
+    model = Model.model_validate_json(data)
+    for issue in check_floor_geometry(model):
+        print('/'.join(str(key) for key in issue.path), issue.kind)
+"""
+from typing import NamedTuple, Tuple, Union
+
+from .arrays import _numpy
+from .identifiers import iter_objects
+
+CHECK_GEOMETRY = 'check_geometry'
+
+
+class GeometryIssue(NamedTuple):
+    """An error in the floor geometry of a Room2D.
+
+    Args:
+        path: A tuple of keys and indices from the Model to the floor_boundary
+            or the hole of the floor_holes with the error.
+        kind: Text for the kind of error (eg. self_intersection, zero_area).
+        message: Text describing the error.
+    """
+    path: Tuple[Union[str, int], ...]
+    kind: str
+    message: str
+
+
+class _Loops:
+    """The vertices of all boundaries and holes of a list of Room2Ds packed into arrays.
+
+    Properties:
+        *   points: An (N, 2) array of the vertices of all loops.
+        *   loop_of_point: An array of the loop index of each vertex.
+        *   loop_start: An array of the index of the first vertex of each loop.
+        *   loop_count: An array of the number of vertices of each loop.
+        *   loop_room: An array of the room index of each loop.
+        *   loop_hole: An array of the hole index of each loop, which is -1
+            for boundaries.
+        *   next_point: An array of the index of the next vertex of the loop
+            of each vertex.
+    """
+
+    def __init__(self, np, points, loop_count, loop_room, loop_hole):
+        self.points = points
+        self.loop_count = loop_count
+        self.loop_room = loop_room
+        self.loop_hole = loop_hole
+        self.loop_start = np.concatenate(([0], np.cumsum(loop_count)[:-1])) \
+            if len(loop_count) else np.zeros(0, dtype=np.int64)
+        self.loop_of_point = np.repeat(np.arange(len(loop_count)), loop_count)
+        self.next_point = np.arange(len(points)) + 1
+        last = self.loop_start + loop_count - 1
+        self.next_point[last[loop_count > 0]] = self.loop_start[loop_count > 0]
+
+    def signed_areas(self, np):
+        """Get an array of the signed area of each loop, which is negative if clockwise."""
+        pts, nxt = self.points, self.points[self.next_point]
+        cross = pts[:, 0] * nxt[:, 1] - nxt[:, 0] * pts[:, 1]
+        return _sum_by_loop(np, cross, self.loop_start, self.loop_count) / 2
+
+    def perimeters(self, np):
+        """Get an array of the perimeter of each loop."""
+        lengths = np.hypot(*(self.points[self.next_point] - self.points).T)
+        return _sum_by_loop(np, lengths, self.loop_start, self.loop_count)
+
+
+def _sum_by_loop(np, values, loop_start, loop_count):
+    """Sum the values of the vertices of each loop."""
+    sums = np.zeros(len(loop_count))
+    has_points = loop_count > 0
+    if len(values):
+        sums[has_points] = np.add.reduceat(values, loop_start[has_points])
+    return sums
+
+
+def _pack_rooms(np, rooms):
+    """Pack the boundaries and holes of a list of Room2Ds into a _Loops."""
+    loops, loop_room, loop_hole = [], [], []
+    for i, room in enumerate(rooms):
+        loops.append(room.floor_boundary)
+        loop_room.append(i)
+        loop_hole.append(-1)
+        for j, hole in enumerate(room.floor_holes or ()):
+            loops.append(hole)
+            loop_room.append(i)
+            loop_hole.append(j)
+    loop_count = np.array([len(loop) for loop in loops], dtype=np.int64)
+    points = np.concatenate([np.asarray(loop, dtype=np.float64) for loop in loops]) \
+        if loops else np.zeros((0, 2))
+    return _Loops(np, points, loop_count, np.array(loop_room, dtype=np.int64),
+                  np.array(loop_hole, dtype=np.int64))
+
+
+def _remove_duplicates(np, loops, tolerance):
+    """Get a _Loops without vertices that are equal to the next vertex of their loop.
+
+    Returns:
+        A tuple with the new _Loops and an array of the number of removed
+        vertices of each loop.
+    """
+    diff = np.abs(loops.points[loops.next_point] - loops.points)
+    duplicate = (diff <= tolerance).all(axis=1)
+    removed = np.bincount(loops.loop_of_point[duplicate], minlength=len(loops.loop_count))
+    clean = _Loops(np, loops.points[~duplicate], loops.loop_count - removed,
+                   loops.loop_room, loops.loop_hole)
+    return clean, removed
+
+
+def _candidate_pairs(np, loops, tolerance):
+    """Get arrays of the start vertices of pairs of segments of the same room to test.
+
+    The segments are swept along the X axis by sorting them by room and then by
+    their minimum X. Each segment is paired with the following segments of its
+    room that start before it ends and the pairs are then filtered by their
+    Y ranges and to exclude neighboring segments.
+    """
+    pts, nxt = loops.points, loops.points[loops.next_point]
+    seg_room = loops.loop_room[loops.loop_of_point]
+    x_min, x_max = np.minimum(pts[:, 0], nxt[:, 0]), np.maximum(pts[:, 0], nxt[:, 0])
+    # normalize the X of each room to [0, 0.5) and offset it by the room index
+    room_count = int(seg_room.max()) + 1
+    room_x0 = np.full(room_count, np.inf)
+    np.minimum.at(room_x0, seg_room, x_min)
+    room_x1 = np.full(room_count, -np.inf)
+    np.maximum.at(room_x1, seg_room, x_max)
+    scale = 0.5 / (room_x1 - room_x0 + 2 * tolerance + 1)
+    key_min = seg_room + (x_min - room_x0[seg_room]) * scale[seg_room]
+    key_max = seg_room + (x_max + tolerance - room_x0[seg_room]) * scale[seg_room]
+    order = np.argsort(key_min, kind='stable')
+    sorted_min = key_min[order]
+    ends = np.searchsorted(sorted_min, key_max[order], side='right')
+    counts = np.maximum(ends - np.arange(len(order)) - 1, 0)
+    total = int(counts.sum())
+    first = np.repeat(np.arange(len(order)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    seg_1, seg_2 = order[first], order[first + 1 + offsets]
+    # keep the pairs with overlapping Y ranges that do not share a vertex
+    y_min, y_max = np.minimum(pts[:, 1], nxt[:, 1]), np.maximum(pts[:, 1], nxt[:, 1])
+    keep = (y_min[seg_2] <= y_max[seg_1] + tolerance) & \
+        (y_min[seg_1] <= y_max[seg_2] + tolerance) & \
+        (loops.next_point[seg_1] != seg_2) & (loops.next_point[seg_2] != seg_1)
+    return seg_1[keep], seg_2[keep]
+
+
+def _point_segment_distances(np, points, starts, ends):
+    """Get an array of the distance from each point to each matching segment."""
+    direction = ends - starts
+    length_sq = (direction ** 2).sum(axis=1)
+    t = ((points - starts) * direction).sum(axis=1) / np.where(
+        length_sq > 0, length_sq, 1)
+    closest = starts + np.clip(t, 0, 1)[:, None] * direction
+    return np.hypot(*(points - closest).T)
+
+
+def _intersecting_pairs(np, loops, tolerance):
+    """Get arrays of the start vertices of pairs of segments that cross or touch."""
+    seg_1, seg_2 = _candidate_pairs(np, loops, tolerance)
+    a, b = loops.points[seg_1], loops.points[loops.next_point[seg_1]]
+    c, d = loops.points[seg_2], loops.points[loops.next_point[seg_2]]
+
+    def side(p, q, r):
+        """Get the signed distance of r from the line through p and q."""
+        pq = q - p
+        cross = pq[:, 0] * (r - p)[:, 1] - pq[:, 1] * (r - p)[:, 0]
+        return cross / np.hypot(pq[:, 0], pq[:, 1])
+
+    crossing = (side(a, b, c) * side(a, b, d) < 0) & (side(c, d, a) * side(c, d, b) < 0)
+    touching = np.minimum.reduce([
+        _point_segment_distances(np, c, a, b), _point_segment_distances(np, d, a, b),
+        _point_segment_distances(np, a, c, d), _point_segment_distances(np, b, c, d)
+    ]) <= tolerance
+    hit = crossing | touching
+    return seg_1[hit], seg_2[hit]
+
+
+def _holes_outside(np, loops):
+    """Get an array of the indices of the hole loops with a vertex outside their boundary.
+
+    The first vertex of each hole is tested against the boundary of its room by
+    counting the boundary segments crossed by a ray along the X axis.
+    """
+    holes = np.nonzero((loops.loop_hole >= 0) & (loops.loop_count > 0))[0]
+    if len(holes) == 0:
+        return holes
+    boundary_of_room = np.full(int(loops.loop_room.max()) + 1, -1)
+    boundaries = np.nonzero(loops.loop_hole < 0)[0]
+    boundary_of_room[loops.loop_room[boundaries]] = boundaries
+    boundary = boundary_of_room[loops.loop_room[holes]]
+    has_boundary = loops.loop_count[boundary] > 0  # degenerate boundaries are skipped
+    holes, boundary = holes[has_boundary], boundary[has_boundary]
+    counts = loops.loop_count[boundary]
+    pair_hole = np.repeat(holes, counts)
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    seg = np.repeat(loops.loop_start[boundary], counts) + offsets
+    p = loops.points[loops.loop_start[pair_hole]]
+    a, b = loops.points[seg], loops.points[loops.next_point[seg]]
+    spans = (a[:, 1] > p[:, 1]) != (b[:, 1] > p[:, 1])
+    dy = np.where(spans, b[:, 1] - a[:, 1], 1)
+    x_cross = a[:, 0] + (p[:, 1] - a[:, 1]) * (b[:, 0] - a[:, 0]) / dy
+    crossings = np.bincount(pair_hole[spans & (p[:, 0] < x_cross)],
+                            minlength=len(loops.loop_count))
+    return holes[crossings[holes] % 2 == 0]
+
+
+def check_floor_geometry(model, check_orientation=False):
+    """Get a list of the errors in the floor geometry of all Room2Ds of a Model.
+
+    Args:
+        model: A dragonfly Model. Its tolerance is used for all checks and no
+            checks are performed if it is 0.
+        check_orientation: Boolean to note whether clockwise boundaries should
+            be reported. (Default: False).
+
+    Returns:
+        A list of GeometryIssue, which is empty when all floor geometry is valid.
+    """
+    tolerance = model.tolerance
+    rooms, paths = [], []
+    for obj_type, obj, path in iter_objects(model):
+        if obj_type == 'Room2D':
+            rooms.append(obj)
+            paths.append(path)
+    if tolerance == 0 or not rooms:
+        return []
+    np = _numpy()
+
+    def loop_path(loop):
+        path = paths[loops.loop_room[loop]]
+        hole = int(loops.loop_hole[loop])
+        return path + ('floor_boundary',) if hole < 0 else path + ('floor_holes', hole)
+
+    issues = []
+    loops = _pack_rooms(np, rooms)
+    loops, removed = _remove_duplicates(np, loops, tolerance)
+    for loop in np.nonzero(removed)[0]:
+        issues.append(GeometryIssue(
+            loop_path(loop), 'duplicate_vertex',
+            '{} duplicate vertices.'.format(removed[loop])))
+
+    areas = loops.signed_areas(np)
+    thin = 2 * np.abs(areas) <= tolerance * loops.perimeters(np)
+    for loop in np.nonzero(thin)[0]:
+        issues.append(GeometryIssue(
+            loop_path(loop), 'zero_area', 'Area of {:.6g} is effectively zero.'.format(
+                abs(areas[loop]))))
+    if check_orientation:
+        clockwise = (areas < 0) & (loops.loop_hole < 0) & ~thin
+        for loop in np.nonzero(clockwise)[0]:
+            issues.append(GeometryIssue(
+                loop_path(loop), 'clockwise_boundary', 'Boundary is clockwise.'))
+
+    # only check the intersections of loops that are not degenerate
+    valid_loop = ~thin
+    loops = _Loops(np, loops.points[valid_loop[loops.loop_of_point]],
+                   np.where(valid_loop, loops.loop_count, 0),
+                   loops.loop_room, loops.loop_hole)
+    if len(loops.points) == 0:
+        return issues
+    seg_1, seg_2 = _intersecting_pairs(np, loops, tolerance)
+    reported = set()
+    for s_1, s_2 in zip(seg_1, seg_2):
+        loop_1, loop_2 = loops.loop_of_point[s_1], loops.loop_of_point[s_2]
+        room = loops.loop_room[loop_1]
+        if room in reported:
+            continue
+        reported.add(room)
+        issues.append(GeometryIssue(
+            loop_path(loop_1), 'self_intersection',
+            'Segment {} intersects segment {} of {}.'.format(
+                s_1 - loops.loop_start[loop_1], s_2 - loops.loop_start[loop_2],
+                '/'.join(str(key) for key in loop_path(loop_2)[len(paths[room]):]))))
+
+    crossed = set(int(room) for room in reported)
+    for loop in _holes_outside(np, loops):
+        if loops.loop_room[loop] not in crossed:
+            issues.append(GeometryIssue(
+                loop_path(loop), 'hole_outside', 'Hole is outside the boundary.'))
+    return issues
+
+
+def use_check_geometry(info):
+    """Check whether the context of a pydantic ValidationInfo requests the check."""
+    return bool(info.context) and bool(info.context.get(CHECK_GEOMETRY))
+
+
+def geometry_messages(issues, max_count=10):
+    """Get a list of text messages describing floor geometry errors.
+
+    Args:
+        issues: A list of GeometryIssue from check_floor_geometry.
+        max_count: An integer for the maximum number of errors that are
+            described. (Default: 10).
+    """
+    messages = ['{} at {}: {}'.format(
+        issue.kind, '/'.join(str(key) for key in issue.path), issue.message)
+        for issue in issues[:max_count]]
+    if len(issues) > max_count:
+        messages.append('And {} other geometry errors.'.format(len(issues) - max_count))
+    return messages
@@ -0,0 +1,146 @@
+"""Canonical Merkle hashes of the content of Models and their objects.
+
+The hash of a Room2D or ContextShade is the SHA-256 digest of its canonical
+JSON, which has sorted keys, no whitespace and normalized numbers. The hash
+of a Story, Building or Model is the digest of the canonical JSON of its own
+fields, where each of its child lists is replaced by the hashes of the children.
+A change to one Room2D therefore only changes the hashes of its Story, Building
+and Model and a MerkleHasher only rehashes these ancestors when it is reused.
+
+Floats that are whole numbers are written as integers and -0.0 as 0 such that
+a value has the same hash whether it is in the JSON as 3 or 3.0. NaN and
+infinity are written as the NaN, Infinity and -Infinity constants of JavaScript,
+which cannot be confused with any text or number. Only the fields that were set
+are hashed, which means that the hash of a validated object is the same as the
+hash of the JSON dictionary it was validated from, unless the dictionary has
+keys that are ignored by the schema (eg. uwg properties). Hashes are
+reproducible across processes, machines and Python versions.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.hashing import MerkleHasher
+
+    hasher = MerkleHasher()
+    model_hash = hasher.hash(model)
+    building_hash = hasher.hash(model.buildings[0])
+"""
+import json
+import weakref
+import hashlib
+
+from pydantic_core import to_jsonable_python
+
+from .references import get_value
+
+# the child lists of each type of object and the type of their items
+CHILD_TYPES = {
+    'Model': {'buildings': 'Building', 'context_shades': 'ContextShade'},
+    'Building': {'unique_stories': 'Story'},
+    'Story': {'room_2ds': 'Room2D'},
+    'Room2D': {},
+    'ContextShade': {}
+}
+
+
+def _normalize(value):
+    """Get a copy of a JSON-like value with all whole number floats as integers."""
+    value_type = type(value)  # faster than isinstance for the many values of a Model
+    if value_type is dict:
+        return {key: _normalize(val) for key, val in value.items()}
+    if value_type is list or value_type is tuple:
+        return [_normalize(val) for val in value]
+    if value_type is float and value.is_integer() and abs(value) < 2 ** 53:
+        return int(value)
+    return value
+
+
+def canonical_json(value):
+    """Get the canonical JSON bytes of a JSON-like value.
+
+    Args:
+        value: A JSON-like value of dictionaries, lists, text and numbers.
+
+    Returns:
+        UTF-8 bytes of JSON with sorted keys, no whitespace, whole number
+        floats written as integers and NaN and infinity written as NaN,
+        Infinity and -Infinity.
+    """
+    return json.dumps(_normalize(value), sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+class MerkleHasher:
+    """Compute and remember the Merkle hashes of Models and their objects.
+
+    Hashes are remembered for each object such that hashing a copy of a Model
+    that shares unchanged objects with a Model that was already hashed (eg.
+    from dragonfly_schema.diff.apply_patch) only hashes the changed objects and
+    their ancestors. Objects should therefore not be mutated after they are
+    hashed. Hashes are remembered with weak references such that they are
+    forgotten when their objects are garbage collected. Dictionaries of objects,
+    as loaded from JSON, can also be hashed but their hashes are not remembered
+    across calls since they cannot be weakly referenced.
+
+    Properties:
+        *   hash_count: The number of objects that have been hashed, which
+            excludes those for which a remembered hash was used.
+    """
+
+    def __init__(self):
+        self._hashes = {}  # the id of each object mapped to a weakref and the hash
+        self.hash_count = 0
+
+    def hash(self, obj, obj_type=None):
+        """Get the hexadecimal SHA-256 Merkle hash of an object.
+
+        Args:
+            obj: A Model, Building, Story, Room2D or ContextShade, or a dictionary
+                of one of these.
+            obj_type: Text for the type of the object, which is only required
+                for dictionaries without a type key. (Default: None).
+        """
+        remembered = self._hashes.get(id(obj))
+        if remembered is not None and remembered[0]() is obj:
+            return remembered[1]
+        obj_type = obj_type or get_value(obj, 'type')
+        children = CHILD_TYPES[obj_type]
+        if isinstance(obj, dict):
+            content = {key: val for key, val in obj.items() if key not in children}
+        else:
+            # dumped in python mode since the json mode writes NaN as null
+            content = to_jsonable_python(obj.model_dump(
+                exclude_unset=True, exclude=set(children)), inf_nan_mode='constants')
+        content['type'] = obj_type
+        for field, child_type in children.items():
+            objs = get_value(obj, field)
+            if objs is not None:
+                content[field] = [self.hash(child, child_type) for child in objs]
+        digest = hashlib.sha256(canonical_json(content)).hexdigest()
+        if not isinstance(obj, dict):
+            self._hashes[id(obj)] = (weakref.ref(obj, self._forget(id(obj))), digest)
+        self.hash_count += 1
+        return digest
+
+    def _forget(self, key):
+        """Get a weakref callback that forgets the hash of a collected object."""
+        hashes = self._hashes  # the callback does not reference the hasher
+
+        def callback(_):
+            hashes.pop(key, None)
+        return callback
+
+    def clear(self):
+        """Forget all remembered hashes."""
+        self._hashes.clear()
+
+
+def merkle_hash(obj):
+    """Get the hexadecimal SHA-256 Merkle hash of an object without remembering it.
+
+    Args:
+        obj: A Model, Building, Story, Room2D or ContextShade, or a dictionary
+            of one of these with a type key.
+    """
+    return MerkleHasher().hash(obj)
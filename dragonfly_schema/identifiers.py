@@ -0,0 +1,173 @@
+"""Index of the identifiers of the objects in a Model.
+
+The index is built in a single pass over a validated Model and maps the
+identifier of each Building, Story, Room2D and ContextShade to the object and
+its path within the Model, which replaces nested searches through the
+buildings, unique_stories and room_2ds with a dictionary lookup.
+
+Identifiers only need to be unique within each type of object. When a Model is
+validated with the UNIQUE_IDENTIFIERS validation context, an error is raised
+for any identifier that is used by more than one object of the same type.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.identifiers import IdentifierIndex, UNIQUE_IDENTIFIERS
+
+    model = Model.model_validate_json(data, context={UNIQUE_IDENTIFIERS: True})
+    index = IdentifierIndex(model)
+    room = index.lookup('Room2D', 'Office_1')
+    path = index.path('Room2D', 'Office_1')  # eg. ('buildings', 0, ...)
+"""
+UNIQUE_IDENTIFIERS = 'unique_identifiers'
+OBJECT_TYPES = ('Building', 'Story', 'Room2D', 'ContextShade')
+
+
+def iter_objects(model):
+    """Iterate over the Buildings, Stories, Room2Ds and ContextShades of a Model.
+
+    Args:
+        model: A dragonfly Model.
+
+    Yields:
+        A tuple of (obj_type, obj, path) for each object, where path is a
+        tuple of keys and indices to the object from the Model.
+    """
+    for i, building in enumerate(model.buildings or ()):
+        b_path = ('buildings', i)
+        yield 'Building', building, b_path
+        for j, story in enumerate(building.unique_stories or ()):
+            s_path = b_path + ('unique_stories', j)
+            yield 'Story', story, s_path
+            for k, room in enumerate(story.room_2ds):
+                yield 'Room2D', room, s_path + ('room_2ds', k)
+    for i, shade in enumerate(model.context_shades or ()):
+        yield 'ContextShade', shade, ('context_shades', i)
+
+
+def use_unique_identifiers(info):
+    """Check whether the context of a pydantic ValidationInfo requests unique IDs."""
+    return bool(info.context) and bool(info.context.get(UNIQUE_IDENTIFIERS))
+
+
+class IdentifierIndex(object):
+    """Index of the Buildings, Stories, Room2Ds and ContextShades of a Model.
+
+    Args:
+        model: A dragonfly Model.
+
+    Properties:
+        * duplicates
+    """
+    __slots__ = ('_model', '_objects', '_paths', '_duplicates')
+
+    def __init__(self, model):
+        self._model = model
+        self._objects = {obj_type: {} for obj_type in OBJECT_TYPES}
+        self._paths = {obj_type: {} for obj_type in OBJECT_TYPES}
+        self._duplicates = {}
+        for obj_type, obj, path in iter_objects(model):
+            self._add(obj_type, obj, path)
+
+    def _add(self, obj_type, obj, path):
+        """Add an object to the index, recording it if its identifier is a duplicate."""
+        objects, identifier = self._objects[obj_type], obj.identifier
+        if identifier in objects:
+            paths = self._duplicates.setdefault(obj_type, {}).setdefault(
+                identifier, [self._paths[obj_type][identifier]])
+            paths.append(path)
+            return
+        objects[identifier] = obj
+        self._paths[obj_type][identifier] = path
+
+    @property
+    def duplicates(self):
+        """Get a dictionary of the duplicated identifiers of each type of object.
+
+        Keys are the types of objects with duplicates and values are dictionaries
+        with the duplicated identifiers as keys and lists of the paths to all
+        objects using the identifier as values. Only the first of these objects
+        is in the index.
+        """
+        return self._duplicates
+
+    def objects(self, obj_type):
+        """Get a dictionary of all objects of a type with their identifiers as keys.
+
+        Args:
+            obj_type: Text for the type of object (Building, Story, Room2D or
+                ContextShade).
+        """
+        return self._objects[obj_type]
+
+    def lookup(self, obj_type, identifier):
+        """Get an object using its type and identifier.
+
+        Args:
+            obj_type: Text for the type of object (Building, Story, Room2D or
+                ContextShade).
+            identifier: Text for the identifier of the object.
+        """
+        try:
+            return self._objects[obj_type][identifier]
+        except KeyError:
+            raise KeyError('No {} with the identifier "{}" was found in the '
+                           'Model.'.format(obj_type, identifier))
+
+    def path(self, obj_type, identifier):
+        """Get the path to an object as a tuple of keys and indices from the Model.
+
+        Args:
+            obj_type: Text for the type of object (Building, Story, Room2D or
+                ContextShade).
+            identifier: Text for the identifier of the object.
+        """
+        try:
+            return self._paths[obj_type][identifier]
+        except KeyError:
+            raise KeyError('No {} with the identifier "{}" was found in the '
+                           'Model.'.format(obj_type, identifier))
+
+    def parent(self, obj_type, identifier):
+        """Get the parent of an object within the Model.
+
+        Args:
+            obj_type: Text for the type of object (Building, Story, Room2D or
+                ContextShade).
+            identifier: Text for the identifier of the object.
+
+        Returns:
+            The Story of a Room2D, the Building of a Story or the Model of a
+            Building or ContextShade.
+        """
+        parent = self._model
+        for key in self.path(obj_type, identifier)[:-2]:
+            parent = getattr(parent, key) if isinstance(key, str) else parent[key]
+        return parent
+
+    def duplicate_messages(self, max_paths=3):
+        """Get a list of text messages describing each duplicated identifier.
+
+        Args:
+            max_paths: An integer for the maximum number of paths to objects
+                that are listed in each message. (Default: 3).
+        """
+        messages = []
+        for obj_type, identifiers in self._duplicates.items():
+            for identifier, paths in identifiers.items():
+                locations = ', '.join(
+                    '/'.join(str(key) for key in p) for p in paths[:max_paths])
+                if len(paths) > max_paths:
+                    locations += ' and {} others'.format(len(paths) - max_paths)
+                messages.append('{} identifier "{}" is used {} times at {}.'.format(
+                    obj_type, identifier, len(paths), locations))
+        return messages
+
+    def __len__(self):
+        return sum(len(objects) for objects in self._objects.values())
+
+    def __repr__(self):
+        return 'IdentifierIndex: [{}]'.format(', '.join(
+            '{} {}'.format(len(self._objects[t]), t) for t in OBJECT_TYPES))
@@ -0,0 +1,108 @@
+"""Shared frozen instances of repeated window, shading and boundary condition parameters.
+
+When a Room2D is validated with the INTERN_PARAMETERS validation context, each
+item of its boundary_conditions, window_parameters and shading_parameters is
+replaced with a shared instance that is equal to it. Equal parameters across
+all walls (and all models) are then a single object in memory rather than one
+object per wall segment.
+
+Shared instances are frozen such that changing one cannot change the walls of
+other Room2Ds. They are instances of a frozen subclass of the original class,
+which are equal to instances of the original class with the same values and
+which are interned again when they are unpickled.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.interning import INTERN_PARAMETERS
+
+    model = Model.model_validate_json(data, context={INTERN_PARAMETERS: True})
+"""
+import weakref
+
+from pydantic_core import to_json
+
+INTERN_PARAMETERS = 'intern_parameters'
+_FROZEN_CLASSES = {}
+_ORIGINS = {}
+_POOL = weakref.WeakValueDictionary()
+
+
+def use_interned_parameters(info):
+    """Check whether the context of a pydantic ValidationInfo requests interning."""
+    return bool(info.context) and bool(info.context.get(INTERN_PARAMETERS))
+
+
+def _frozen_eq(self, other):
+    """Compare a frozen instance with instances of its original or frozen class."""
+    origin = _ORIGINS[type(self)]
+    if type(other) is not origin and type(other) is not _FROZEN_CLASSES[origin]:
+        return NotImplemented
+    return self.__dict__ == other.__dict__ and \
+        self.__pydantic_extra__ == other.__pydantic_extra__ and \
+        self.__pydantic_private__ == other.__pydantic_private__
+
+
+def _frozen_reduce(self):
+    """Pickle a frozen instance as its original class such that it is interned on load."""
+    return _unpickle, (_ORIGINS[type(self)], set(self.model_fields_set), dict(self.__dict__))
+
+
+def _unpickle(cls, fields_set, values):
+    """Get the shared frozen instance of an object from its class and values."""
+    return intern(cls.model_construct(fields_set, **values))
+
+
+def frozen_class(cls):
+    """Get a frozen subclass of a pydantic model class.
+
+    Instances of the subclass compare equal to instances of the original class
+    and they are pickled as instances of the original class, which are interned
+    again when they are loaded.
+    """
+    try:
+        return _FROZEN_CLASSES[cls]
+    except KeyError:
+        frozen = type('Frozen{}'.format(cls.__name__), (cls,), {
+            '__module__': __name__,
+            '__eq__': _frozen_eq,
+            '__reduce__': _frozen_reduce,
+            'model_config': {'frozen': True}
+        })
+        _FROZEN_CLASSES[cls] = frozen
+        _ORIGINS[frozen] = cls
+        return frozen
+
+
+def is_frozen(obj):
+    """Check whether an object is a shared frozen instance."""
+    return type(obj) in _ORIGINS
+
+
+def intern(obj):
+    """Get a shared frozen instance that is equal to a parameter object.
+
+    Args:
+        obj: A pydantic object, such as a SingleWindow, Overhang or Outdoors.
+            None is returned as it is.
+
+    Returns:
+        A frozen instance that is shared with all other interned objects with the
+        same type and values.
+    """
+    if obj is None:
+        return None
+    key = to_json(obj)
+    shared = _POOL.get(key)
+    if shared is None:
+        shared = frozen_class(_ORIGINS.get(type(obj), type(obj))).model_construct(
+            obj.model_fields_set, **obj.__dict__)
+        _POOL[key] = shared
+    return shared
+
+
+def intern_list(objs):
+    """Get a list with all of the items of a list of parameters interned."""
+    return [intern(obj) for obj in objs]
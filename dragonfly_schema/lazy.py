@@ -0,0 +1,184 @@
+"""Lazy loading of Models where child geometry is only validated upon access.
+
+The top-level fields of a LazyModel (eg. units, tolerance, properties) are
+validated upon loading while the Model buildings, the Building unique_stories
+and the Story room_2ds are kept as raw JSON until they are first accessed.
+Once accessed, each object is validated and memoized.
+"""
+from collections.abc import Sequence
+
+from ._raw import skip_whitespace, split_members, join_members, validate_json
+from .model import Room2D, Story, Building, Model
+
+
+def _load_room_2d(buf, start, end, loc):
+    """Validate a Room2D from a span of a buffer."""
+    return validate_json(Room2D, buf[start:end], loc)
+
+
+class LazyList(Sequence):
+    """A read-only list of raw JSON objects that are validated upon first access.
+
+    Args:
+        buf: The bytes-like buffer of JSON text in which the objects exist.
+        spans: A list of (start, end) indices for each object in the buffer.
+        loader: A function that takes the buffer, the start and end index and
+            the loc of an object and returns the validated object.
+        loc: A tuple for the location of the list within the whole document.
+    """
+    __slots__ = ('_buf', '_spans', '_loader', '_loc', '_items')
+
+    def __init__(self, buf, spans, loader, loc):
+        self._buf = buf
+        self._spans = spans
+        self._loader = loader
+        self._loc = loc
+        self._items = [None] * len(spans)
+
+    @property
+    def loaded_count(self):
+        """Get an integer for the number of items that have been validated."""
+        return sum(1 for item in self._items if item is not None)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        item = self._items[index]
+        if item is None:
+            start, end = self._spans[index]
+            item = self._items[index] = \
+                self._loader(self._buf, start, end, self._loc + (index,))
+        return item
+
+    def validate_all(self, cls):
+        """Get a list of all fully-validated items.
+
+        Args:
+            cls: The schema class used to validate items that have not yet been
+                accessed. Items that have been accessed are not validated again.
+        """
+        items = []
+        for index, item in enumerate(self._items):
+            if item is None:
+                start, end = self._spans[index]
+                item = validate_json(cls, self._buf[start:end], self._loc + (index,))
+            elif isinstance(item, _LazyObject):
+                item = item.validate_all()
+            items.append(item)
+        return items
+
+    def __len__(self):
+        return len(self._spans)
+
+    def __repr__(self):
+        return 'LazyList: [{} of {} loaded]'.format(self.loaded_count, len(self))
+
+
+class _LazyObject(object):
+    """Base class for objects that validate one of their child lists lazily.
+
+    All attributes other than the child list are taken from a header object,
+    which is the schema object validated without its child list.
+    """
+    __slots__ = ('_header', '_children')
+    _header_class = None
+    _child_key = None
+    _child_class = None
+    _child_loader = None
+
+    def __init__(self, header, children):
+        self._header = header
+        self._children = children
+
+    @classmethod
+    def _load(cls, buf, start, end, loc):
+        """Load the lazy object from a span of a buffer at a given loc."""
+        members, lists = split_members(buf, start, (cls._child_key,))
+        members = [(key, buf[v_start:v_end]) for key, v_start, v_end in members]
+        spans = lists.get(cls._child_key)
+        if spans is not None:  # children are validated upon access
+            members.append((cls._child_key, b'[]'))
+        header = validate_json(cls._header_class, join_members(members), loc)
+        children = None if spans is None else LazyList(
+            buf, spans, cls._child_loader, loc + (cls._child_key,))
+        return cls(header, children)
+
+    @classmethod
+    def from_json(cls, data):
+        """Load the lazy object from JSON text as str, bytes or bytearray."""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return cls._load(data, skip_whitespace(data, 0), len(data), ())
+
+    @classmethod
+    def from_file(cls, file_path):
+        """Load the lazy object from a JSON file."""
+        with open(file_path, 'rb') as f:
+            return cls.from_json(f.read())
+
+    @property
+    def header(self):
+        """Get the validated schema object without its child list."""
+        return self._header
+
+    def validate_all(self):
+        """Validate all child objects and get a fully-validated schema object.
+
+        Objects that have already been accessed are not validated again.
+        """
+        children = None if self._children is None else \
+            self._children.validate_all(self._child_class)
+        return self._header.model_copy(update={self._child_key: children})
+
+    def __getattr__(self, name):
+        if name == self._child_key:
+            return self._children
+        return getattr(self._header, name)
+
+    def __repr__(self):
+        return '{}: {}'.format(self.__class__.__name__, self._header.identifier)
+
+
+class LazyStory(_LazyObject):
+    """A Story with room_2ds that are validated upon first access."""
+    __slots__ = ()
+    _header_class = Story
+    _child_key = 'room_2ds'
+    _child_class = Room2D
+    _child_loader = staticmethod(_load_room_2d)
+
+
+class LazyBuilding(_LazyObject):
+    """A Building with unique_stories that are validated upon first access."""
+    __slots__ = ()
+    _header_class = Building
+    _child_key = 'unique_stories'
+    _child_class = Story
+    _child_loader = LazyStory._load
+
+
+class LazyModel(_LazyObject):
+    """A Model with buildings that are validated upon first access.
+
+    All other Model fields are validated upon loading. Accessing an item of the
+    buildings returns a LazyBuilding, accessing an item of its unique_stories
+    returns a LazyStory and accessing an item of its room_2ds returns a fully
+    validated Room2D. The validate_all method can be used to validate every
+    remaining object and get a standard Model.
+
+    Usage:
+
+    .. code-block:: python
+
+        model = LazyModel.from_file('./large_model.dfjson')
+        print(model.units, model.tolerance)
+        room = model.buildings[0].unique_stories[0].room_2ds[0]
+        full_model = model.validate_all()
+    """
+    __slots__ = ()
+    _header_class = Model
+    _child_key = 'buildings'
+    _child_class = Building
+    _child_loader = LazyBuilding._load
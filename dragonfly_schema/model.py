@@ -1,10 +1,11 @@
 """Model schema and the 3 geometry objects that define it."""
-from pydantic import BaseModel, Field, model_validator
-from typing import List, Union, Literal, Annotated
+from pydantic import BaseModel, Field, model_validator, field_validator, \
+    field_serializer
+from typing import TYPE_CHECKING, List, Union, Literal, Annotated
 from enum import Enum
 
 from honeybee_schema._base import IDdBaseModel
-from honeybee_schema.model import Room, Face3D, Mesh3D, Units
+from honeybee_schema.geometry import Face3D, Mesh3D
 from honeybee_schema.boundarycondition import Ground, Outdoors, Surface, \
     Adiabatic, OtherSideTemperature
 from honeybee_schema.altnumber import Autocalculate
@@ -16,15 +17,58 @@ from .shading_parameter import ExtrudedBorder, Overhang, LouversByDistance, \
 from .skylight_parameter import GriddedSkylightArea, GriddedSkylightRatio, \
     DetailedSkylights
 from .roof import RoofSpecification
-from .energy.properties import Room2DEnergyPropertiesAbridged, \
-    StoryEnergyPropertiesAbridged, BuildingEnergyPropertiesAbridged, \
-    ContextShadeEnergyPropertiesAbridged, ModelEnergyProperties
-from .radiance.properties import Room2DRadiancePropertiesAbridged, \
-    StoryRadiancePropertiesAbridged, BuildingRadiancePropertiesAbridged, \
-    ContextShadeRadiancePropertiesAbridged, ModelRadianceProperties
-from .doe2.properties import Room2DDoe2Properties, ModelDoe2Properties
-from .comparison.properties import Room2DComparisonProperties, ModelComparisonProperties
-
+from ._union import TypeDiscriminator
+from .arrays import use_coordinate_arrays, has_arrays, to_point_array, \
+    to_point_arrays, to_lists, points_equal, point_lists_equal
+from .extension import Extension
+from .identifiers import use_unique_identifiers, IdentifierIndex
+from .interning import use_interned_parameters, intern_list
+from .references import use_check_references, check_references, reference_messages
+from .validation_cache import get_validation_cache
+from .geometry_checks import use_check_geometry, check_floor_geometry, \
+    geometry_messages
+from .adjacency import use_check_adjacency, check_adjacencies, adjacency_messages
+
+# the classes of the extension properties are imported for type checkers but they
+# are otherwise only imported the first time that a value is validated with them
+if TYPE_CHECKING:
+    from honeybee_schema.model import Room, Units
+    from .energy.properties import Room2DEnergyPropertiesAbridged, \
+        StoryEnergyPropertiesAbridged, BuildingEnergyPropertiesAbridged, \
+        ContextShadeEnergyPropertiesAbridged, ModelEnergyProperties
+    from .radiance.properties import Room2DRadiancePropertiesAbridged, \
+        StoryRadiancePropertiesAbridged, BuildingRadiancePropertiesAbridged, \
+        ContextShadeRadiancePropertiesAbridged, ModelRadianceProperties
+    from .doe2.properties import Room2DDoe2Properties, ModelDoe2Properties
+    from .comparison.properties import Room2DComparisonProperties, \
+        ModelComparisonProperties
+else:
+    Room = Extension['honeybee_schema.model.Room']
+    Units = Extension['honeybee_schema.model.Units']
+    Room2DEnergyPropertiesAbridged = \
+        Extension['.energy.properties.Room2DEnergyPropertiesAbridged']
+    StoryEnergyPropertiesAbridged = \
+        Extension['.energy.properties.StoryEnergyPropertiesAbridged']
+    BuildingEnergyPropertiesAbridged = \
+        Extension['.energy.properties.BuildingEnergyPropertiesAbridged']
+    ContextShadeEnergyPropertiesAbridged = \
+        Extension['.energy.properties.ContextShadeEnergyPropertiesAbridged']
+    ModelEnergyProperties = Extension['.energy.properties.ModelEnergyProperties']
+    Room2DRadiancePropertiesAbridged = \
+        Extension['.radiance.properties.Room2DRadiancePropertiesAbridged']
+    StoryRadiancePropertiesAbridged = \
+        Extension['.radiance.properties.StoryRadiancePropertiesAbridged']
+    BuildingRadiancePropertiesAbridged = \
+        Extension['.radiance.properties.BuildingRadiancePropertiesAbridged']
+    ContextShadeRadiancePropertiesAbridged = \
+        Extension['.radiance.properties.ContextShadeRadiancePropertiesAbridged']
+    ModelRadianceProperties = Extension['.radiance.properties.ModelRadianceProperties']
+    Room2DDoe2Properties = Extension['.doe2.properties.Room2DDoe2Properties']
+    ModelDoe2Properties = Extension['.doe2.properties.ModelDoe2Properties']
+    Room2DComparisonProperties = \
+        Extension['.comparison.properties.Room2DComparisonProperties']
+    ModelComparisonProperties = \
+        Extension['.comparison.properties.ModelComparisonProperties']
 
 class Room2DPropertiesAbridged(BaseModel):
 
@@ -141,9 +185,10 @@ class Room2D(IDdBaseModel):
         'property has no character restrictions.'
     )
 
-    boundary_conditions: Union[List[
-        Union[Ground, Outdoors, Surface, Adiabatic, OtherSideTemperature]
-    ], None] = Field(
+    boundary_conditions: Union[List[Annotated[
+        Union[Ground, Outdoors, Surface, Adiabatic, OtherSideTemperature],
+        TypeDiscriminator()
+    ]], None] = Field(
         default=None,
         description='A list of boundary conditions that match the number of segments '
         'in the input floor_geometry + floor_holes. These will be used to assign '
@@ -154,19 +199,19 @@ class Room2D(IDdBaseModel):
         'height of the room is at or below 0 (the assumed ground plane).'
     )
 
-    window_parameters: Union[List[Union[
+    window_parameters: Union[List[Annotated[Union[
         None, SingleWindow, SimpleWindowArea, SimpleWindowRatio, RepeatingWindowRatio,
         RectangularWindows, DetailedWindows
-    ]], None] = Field(
+    ], TypeDiscriminator()]], None] = Field(
         default=None,
         description='A list of WindowParameter objects that dictate how the window '
         'geometries will be generated for each of the walls. If None, no windows '
         'will exist over the entire Room2D.'
     )
 
-    shading_parameters: Union[List[Union[
+    shading_parameters: Union[List[Annotated[Union[
         None, ExtrudedBorder, Overhang, LouversByDistance, LouversByCount
-    ]], None] = Field(
+    ], TypeDiscriminator()]], None] = Field(
         default=None,
         description='A list of ShadingParameter objects that dictate how the shade '
         'geometries will be generated for each of the walls. If None, no shades '
@@ -182,9 +227,9 @@ class Room2D(IDdBaseModel):
         'without any windows.'
     )
 
-    skylight_parameters: Union[
+    skylight_parameters: Annotated[Union[
         None, GriddedSkylightArea, GriddedSkylightRatio, DetailedSkylights
-    ] = Field(
+    ], TypeDiscriminator()] = Field(
         default=None,
         description='A SkylightParameter object describing how to generate skylights. '
         'If None, no skylights will exist on the Room2D.'
@@ -196,6 +241,47 @@ class Room2D(IDdBaseModel):
         '(Radiance, EnergyPlus).'
     )
 
+    @field_validator('floor_boundary', 'floor_holes', mode='wrap')
+    @classmethod
+    def coordinate_arrays(cls, value, handler, info):
+        "Validate points into NumPy arrays if requested in the validation context."
+        if not use_coordinate_arrays(info):
+            return handler(value)
+        if info.field_name == 'floor_boundary':
+            return to_point_array(value)
+        return to_point_arrays(value)
+
+    @field_serializer('floor_boundary', 'floor_holes', mode='wrap')
+    def coordinate_lists(self, value, handler):
+        "Serialize any NumPy point arrays to lists of points."
+        if has_arrays(value):
+            return to_lists(value)
+        return handler(value)
+
+    def __eq__(self, other):
+        "Compare Room2Ds, including any NumPy point arrays of their floor geometry."
+        if not isinstance(other, Room2D) or not (
+                has_arrays(self.floor_boundary) or has_arrays(self.floor_holes) or
+                has_arrays(other.floor_boundary) or has_arrays(other.floor_holes)):
+            return super().__eq__(other)
+        geometry = ('floor_boundary', 'floor_holes')
+        values = {k: v for k, v in self.__dict__.items() if k not in geometry}
+        other_values = {k: v for k, v in other.__dict__.items() if k not in geometry}
+        return type(self) is type(other) and values == other_values and \
+            self.__pydantic_extra__ == other.__pydantic_extra__ and \
+            points_equal(self.floor_boundary, other.floor_boundary) and \
+            point_lists_equal(self.floor_holes, other.floor_holes)
+
+    @field_validator('boundary_conditions', 'window_parameters', 'shading_parameters',
+                     mode='wrap')
+    @classmethod
+    def interned_parameters(cls, value, handler, info):
+        "Replace parameters with shared frozen instances if requested in the context."
+        value = handler(value)
+        if value is not None and use_interned_parameters(info):
+            return intern_list(value)
+        return value
+
     @model_validator(mode='after')
     def check_segment_count(self):
         "Ensure len of boundary_conditions, window par, shading par match segment count."
@@ -366,6 +452,17 @@ class Building(IDdBaseModel):
         '(Radiance, EnergyPlus).'
     )
 
+    @field_validator('unique_stories', mode='wrap')
+    @classmethod
+    def cached_stories(cls, value, handler, info):
+        "Reuse validated Stories from a validation cache in the context."
+        cache = get_validation_cache(info)
+        if cache is not None and isinstance(value, list):
+            cached = cache.validate_list(Story, value, info.context)
+            if cached is not None:
+                return handler(cached)
+        return handler(value)
+
 
 class ContextShadePropertiesAbridged(BaseModel):
 
@@ -384,7 +481,7 @@ class ContextShade(IDdBaseModel):
 
     type: Literal['ContextShade'] = 'ContextShade'
 
-    geometry: List[Union[Face3D, Mesh3D]] = Field(
+    geometry: List[Annotated[Union[Face3D, Mesh3D], TypeDiscriminator()]] = Field(
         ...,
         description='An array of planar Face3Ds and or Mesh3Ds that together '
         'represent the context shade.'
@@ -446,7 +543,8 @@ class Model(IDdBaseModel):
     )
 
     units: Units = Field(
-        default=Units.meters,
+        default='Meters',
+        validate_default=True,
         description='Text indicating the units in which the model geometry exists. '
         'This is used to scale the geometry to the correct units for simulation '
         'engines like EnergyPlus, which requires all geometry be in meters.'
@@ -491,3 +589,51 @@ class Model(IDdBaseModel):
         description='Extension properties for particular simulation engines '
         '(Radiance, EnergyPlus).'
     )
+
+    @field_validator('buildings', 'context_shades', mode='wrap')
+    @classmethod
+    def cached_objects(cls, value, handler, info):
+        "Reuse validated Buildings and ContextShades from a validation cache in context."
+        cache = get_validation_cache(info)
+        if cache is not None and isinstance(value, list):
+            obj_cls = Building if info.field_name == 'buildings' else ContextShade
+            cached = cache.validate_list(obj_cls, value, info.context)
+            if cached is not None:
+                return handler(cached)
+        return handler(value)
+
+    @model_validator(mode='after')
+    def check_unique_identifiers(self, info):
+        "Ensure identifiers are unique within each object type if requested in context."
+        if use_unique_identifiers(info):
+            messages = IdentifierIndex(self).duplicate_messages()
+            assert not messages, 'Model contains duplicate identifiers.\n' + \
+                '\n'.join(messages)
+        return self
+
+    @model_validator(mode='after')
+    def check_resource_references(self, info):
+        "Ensure referenced energy and radiance resources exist if requested in context."
+        if use_check_references(info):
+            messages = reference_messages(check_references(self))
+            assert not messages, 'Model contains dangling references.\n' + \
+                '\n'.join(messages)
+        return self
+
+    @model_validator(mode='after')
+    def check_room_floor_geometry(self, info):
+        "Ensure the floor geometry of all Room2Ds is valid if requested in context."
+        if use_check_geometry(info):
+            messages = geometry_messages(check_floor_geometry(self))
+            assert not messages, 'Model contains invalid Room2D floor geometry.\n' + \
+                '\n'.join(messages)
+        return self
+
+    @model_validator(mode='after')
+    def check_surface_adjacencies(self, info):
+        "Ensure Surface boundary conditions of walls are reciprocal if requested in context."
+        if use_check_adjacency(info):
+            messages = adjacency_messages(check_adjacencies(self))
+            assert not messages, 'Model contains invalid wall adjacencies.\n' + \
+                '\n'.join(messages)
+        return self
@@ -0,0 +1,288 @@
+"""Find the Room2Ds of each Story that overlap one another and the area of the overlaps.
+
+The bounding boxes of the Room2Ds of a Story are inserted into a uniform grid
+with cells the size of a typical Room2D such that each Room2D is only compared
+with the Room2Ds in the same cells, which keeps the check near-linear for
+Stories with thousands of Room2Ds. The area of the overlap of each pair of
+Room2Ds with overlapping bounding boxes is computed from the parts of the
+boundary of each Room2D that are inside the other (Green's theorem) and pairs
+that only share walls or overlap by less than the tolerance are not reported.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.overlaps import check_room_overlaps
+
+    model = Model.model_validate_json(data)
+    for overlap in check_room_overlaps(model):
+        print(overlap.room_1, overlap.room_2, overlap.area)
+"""
+import math
+from typing import NamedTuple, Tuple, Union
+
+
+class RoomOverlap(NamedTuple):
+    """Two Room2Ds of a Story that overlap one another.
+
+    Args:
+        path: A tuple of keys and indices from the Model to the Story.
+        room_1: Text for the identifier of the first Room2D.
+        room_2: Text for the identifier of the second Room2D.
+        index_1: Integer for the index of the first Room2D in the Story.
+        index_2: Integer for the index of the second Room2D in the Story.
+        area: Number for the area of the overlap.
+    """
+    path: Tuple[Union[str, int], ...]
+    room_1: str
+    room_2: str
+    index_1: int
+    index_2: int
+    area: float
+
+
+def _signed_area(points):
+    """Get the signed area of a polygon, which is negative if it is clockwise."""
+    return sum(x_1 * y_2 - x_2 * y_1 for (x_1, y_1), (x_2, y_2)
+               in zip(points, points[1:] + points[:1])) / 2
+
+
+def polygon_edges(loops):
+    """Get a list of the (start, end) edges of a region from its boundary and holes.
+
+    Args:
+        loops: A list of lists of points, where the first list is the boundary
+            and the others are holes. Only the X and Y of each point are used.
+
+    Returns:
+        A list of edges where the boundary is counterclockwise and the holes are
+        clockwise such that the inside of the region is on the left of each edge.
+    """
+    edges = []
+    for i, loop in enumerate(loops):
+        points = [(float(pt[0]), float(pt[1])) for pt in loop]
+        if (_signed_area(points) < 0) == (i == 0):
+            points.reverse()
+        edges.extend(zip(points, points[1:] + points[:1]))
+    return edges
+
+
+def _room_edges(room):
+    """Get a list of the edges of the boundary and holes of a Room2D."""
+    return polygon_edges([room.floor_boundary] + list(room.floor_holes or ()))
+
+
+def _bounding_box(edges):
+    """Get the (min_x, min_y, max_x, max_y) of a list of edges."""
+    xs = [start[0] for start, _ in edges]
+    ys = [start[1] for start, _ in edges]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _is_inside(point, edges):
+    """Check whether a point is inside a region by counting the crossings of a ray."""
+    x, y = point
+    inside = False
+    for (x_1, y_1), (x_2, y_2) in edges:
+        if (y_1 > y) != (y_2 > y) and x < x_1 + (y - y_1) * (x_2 - x_1) / (y_2 - y_1):
+            inside = not inside
+    return inside
+
+
+def _edge_at(point, edges, tolerance):
+    """Get the edge that a point is on within the tolerance or None."""
+    x, y = point
+    for edge in edges:
+        (x_1, y_1), (x_2, y_2) = edge
+        dx, dy = x_2 - x_1, y_2 - y_1
+        length_sq = dx * dx + dy * dy
+        t = 0 if length_sq == 0 else \
+            max(0, min(1, ((x - x_1) * dx + (y - y_1) * dy) / length_sq))
+        if math.hypot(x - x_1 - t * dx, y - y_1 - t * dy) <= tolerance:
+            return edge
+    return None
+
+
+def _split_parameters(start, end, other_edges, tolerance):
+    """Get the sorted parameters along an edge where it meets the edges of a region."""
+    (x_1, y_1), (x_2, y_2) = start, end
+    dx, dy = x_2 - x_1, y_2 - y_1
+    length_sq = dx * dx + dy * dy
+    params = [0.0, 1.0]
+    if length_sq == 0:
+        return params
+    length = math.sqrt(length_sq)
+    for (x_3, y_3), (x_4, y_4) in other_edges:
+        # vertices of the other region on the edge, such as along shared walls
+        t = ((x_3 - x_1) * dx + (y_3 - y_1) * dy) / length_sq
+        if 0 < t < 1 and abs((x_3 - x_1) * dy - (y_3 - y_1) * dx) <= tolerance * length:
+            params.append(t)
+        # crossings of the edges
+        ex, ey = x_4 - x_3, y_4 - y_3
+        denominator = dx * ey - dy * ex
+        if denominator != 0:
+            t = ((x_3 - x_1) * ey - (y_3 - y_1) * ex) / denominator
+            u = ((x_3 - x_1) * dy - (y_3 - y_1) * dx) / denominator
+            if 0 < t < 1 and 0 <= u <= 1:
+                params.append(t)
+    params.sort()
+    return params
+
+
+def _boundary_inside(edges, other_edges, tolerance, keep_shared):
+    """Get twice the area and the length of the boundary parts inside another region.
+
+    Parts that are on the boundary of the other region are only counted if
+    keep_shared is True and the edges of both regions have the same direction,
+    such that each part of the boundary of the overlap is counted once.
+    """
+    area, length = 0, 0
+    min_x, min_y, max_x, max_y = _bounding_box(other_edges)
+    min_x, min_y, max_x, max_y = \
+        min_x - tolerance, min_y - tolerance, max_x + tolerance, max_y + tolerance
+    for start, end in edges:
+        (x_1, y_1), (x_2, y_2) = start, end
+        if (x_1 < min_x and x_2 < min_x) or (x_1 > max_x and x_2 > max_x) or \
+                (y_1 < min_y and y_2 < min_y) or (y_1 > max_y and y_2 > max_y):
+            continue  # the edge is outside of the other region
+        dx, dy = x_2 - x_1, y_2 - y_1
+        params = _split_parameters(start, end, other_edges, tolerance)
+        for t_0, t_1 in zip(params, params[1:]):
+            if t_1 - t_0 <= 1e-12:
+                continue
+            p_0 = (x_1 + t_0 * dx, y_1 + t_0 * dy)
+            p_1 = (x_1 + t_1 * dx, y_1 + t_1 * dy)
+            mid = ((p_0[0] + p_1[0]) / 2, (p_0[1] + p_1[1]) / 2)
+            edge = _edge_at(mid, other_edges, tolerance)
+            if edge is not None:
+                (x_3, y_3), (x_4, y_4) = edge
+                include = keep_shared and dx * (x_4 - x_3) + dy * (y_4 - y_3) > 0
+            else:
+                include = _is_inside(mid, other_edges)
+            if include:
+                area += p_0[0] * p_1[1] - p_1[0] * p_0[1]
+                length += math.hypot(p_1[0] - p_0[0], p_1[1] - p_0[1])
+    return area, length
+
+
+def overlap_area(edges_1, edges_2, tolerance=0.01):
+    """Get the area of the overlap of two regions, which is 0 if thinner than the tolerance.
+
+    Args:
+        edges_1: A list of (start, end) edges of the first region with the inside
+            of the region on the left of each edge.
+        edges_2: A list of edges of the second region.
+        tolerance: The distance at which points are considered to be on an edge
+            and the width below which an overlap is ignored. (Default: 0.01).
+    """
+    area_1, length_1 = _boundary_inside(edges_1, edges_2, tolerance, True)
+    area_2, length_2 = _boundary_inside(edges_2, edges_1, tolerance, False)
+    area = (area_1 + area_2) / 2
+    if 2 * area <= tolerance * (length_1 + length_2):
+        return 0
+    return area
+
+
+class RoomGrid:
+    """A uniform grid of the bounding boxes of the Room2Ds of a Story.
+
+    Args:
+        rooms: A list of Room2Ds.
+        tolerance: The distance by which bounding boxes must overlap for their
+            Room2Ds to be paired. (Default: 0.01).
+
+    Properties:
+        *   rooms
+        *   tolerance
+        *   edges: A list with the edges of each Room2D, where the inside of
+            the Room2D is on the left of each edge.
+        *   boxes: A list with the (min_x, min_y, max_x, max_y) of each Room2D.
+        *   cell_size: The size of the cells of the grid.
+    """
+
+    def __init__(self, rooms, tolerance=0.01):
+        self.rooms = rooms
+        self.tolerance = tolerance
+        self.edges = [_room_edges(room) for room in rooms]
+        self.boxes = [_bounding_box(edges) for edges in self.edges]
+        # use cells the size of the median room such that each room is in few cells
+        sizes = sorted(max(box[2] - box[0], box[3] - box[1]) for box in self.boxes)
+        self.cell_size = max(sizes[len(sizes) // 2], tolerance, 1e-9) if sizes else 1
+        self._cells = {}
+        for i, box in enumerate(self.boxes):
+            for cell in self._box_cells(box):
+                self._cells.setdefault(cell, []).append(i)
+
+    def _box_cells(self, box):
+        size = self.cell_size
+        x_0, y_0 = math.floor(box[0] / size), math.floor(box[1] / size)
+        x_1, y_1 = math.floor(box[2] / size), math.floor(box[3] / size)
+        return [(x, y) for x in range(x_0, x_1 + 1) for y in range(y_0, y_1 + 1)]
+
+    def _boxes_overlap(self, box_1, box_2):
+        tol = self.tolerance
+        return box_1[0] < box_2[2] - tol and box_2[0] < box_1[2] - tol and \
+            box_1[1] < box_2[3] - tol and box_2[1] < box_1[3] - tol
+
+    def query(self, box):
+        """Get a sorted list of the indices of the Room2Ds that overlap a bounding box."""
+        found = set()
+        for cell in self._box_cells(box):
+            for i in self._cells.get(cell, ()):
+                if i not in found and self._boxes_overlap(box, self.boxes[i]):
+                    found.add(i)
+        return sorted(found)
+
+    def candidate_pairs(self):
+        """Get a sorted list of (i, j) pairs of Room2Ds with overlapping bounding boxes."""
+        pairs = set()
+        for members in self._cells.values():
+            for k, i in enumerate(members):
+                for j in members[k + 1:]:
+                    if self._boxes_overlap(self.boxes[i], self.boxes[j]):
+                        pairs.add((i, j) if i < j else (j, i))
+        return sorted(pairs)
+
+    def overlapping_pairs(self):
+        """Get a list of (i, j, area) for the Room2Ds that overlap one another."""
+        overlaps = []
+        for i, j in self.candidate_pairs():
+            area = overlap_area(self.edges[i], self.edges[j], self.tolerance)
+            if area > 0:
+                overlaps.append((i, j, area))
+        return overlaps
+
+
+def story_overlaps(story, tolerance=0.01, path=()):
+    """Get a list of the Room2Ds of a Story that overlap one another.
+
+    Args:
+        story: A dragonfly Story.
+        tolerance: The minimum width of an overlap that is reported. (Default: 0.01).
+        path: A tuple of the keys and indices from the Model to the Story,
+            which is used for the path of each RoomOverlap. (Default: ()).
+
+    Returns:
+        A list of RoomOverlap for each pair of overlapping Room2Ds.
+    """
+    rooms = story.room_2ds
+    return [RoomOverlap(path, rooms[i].identifier, rooms[j].identifier, i, j, area)
+            for i, j, area in RoomGrid(rooms, tolerance).overlapping_pairs()]
+
+
+def check_room_overlaps(model):
+    """Get a list of the Room2Ds that overlap one another in all Stories of a Model.
+
+    Args:
+        model: A dragonfly Model. Overlaps thinner than its tolerance are ignored.
+
+    Returns:
+        A list of RoomOverlap, which is empty if no Room2Ds overlap.
+    """
+    overlaps = []
+    for b_i, building in enumerate(model.buildings or ()):
+        for s_i, story in enumerate(building.unique_stories or ()):
+            path = ('buildings', b_i, 'unique_stories', s_i)
+            overlaps.extend(story_overlaps(story, model.tolerance, path))
+    return overlaps
@@ -0,0 +1,114 @@
+"""Validation of Models with Buildings and ContextShades split across processes."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from pydantic import ValidationError
+
+from ._raw import skip_whitespace, split_members, join_members, validate_json
+from ._union import line_errors
+from .model import Building, ContextShade, Model
+
+PARALLEL_FIELDS = {'buildings': Building, 'context_shades': ContextShade}
+_FIELD_ORDER = {field: i for i, field in enumerate(Model.model_fields)}
+
+
+def _validate_batch(key, start_index, raws):
+    """Validate a batch of raw Buildings or ContextShades in a worker process.
+
+    Returns:
+        A tuple with two items.
+
+        -   objects: A list of validated objects, which will be None for any
+            objects that failed validation.
+
+        -   errors: A list of pydantic error dictionaries with locs from the
+            top of the Model.
+    """
+    cls = PARALLEL_FIELDS[key]
+    objects, errors = [], []
+    for i, raw in enumerate(raws):
+        try:
+            objects.append(cls.model_validate_json(raw))
+        except ValidationError as e:
+            objects.append(None)
+            for err in e.errors(include_url=False):
+                err['loc'] = (key, start_index + i) + err['loc']
+                errors.append(err)
+    return objects, errors
+
+
+def _batches(raws, batch_count):
+    """Split raw objects into contiguous batches of roughly equal byte size.
+
+    Yields:
+        A tuple of (start_index, raws) for each batch.
+    """
+    target = sum(len(raw) for raw in raws) / batch_count
+    start, size = 0, 0
+    for i, raw in enumerate(raws):
+        size += len(raw)
+        if size >= target:
+            yield start, raws[start:i + 1]
+            start, size = i + 1, 0
+    if start < len(raws):
+        yield start, raws[start:]
+
+
+def validate_model_parallel(data, max_workers=None, executor=None):
+    """Validate a Model JSON with its Buildings and ContextShades split across processes.
+
+    The Buildings and ContextShades are validated independently of one another
+    in a pool of worker processes and the results are put back together into a
+    standard Model. Any errors are reported with the same loc as they would have
+    when validating with Model.model_validate_json.
+
+    Args:
+        data: The JSON text of a Model as str, bytes or bytearray.
+        max_workers: An integer for the maximum number of worker processes.
+            If None, it will be the number of processors on the machine.
+        executor: An optional concurrent.futures Executor to be used instead
+            of creating a new ProcessPoolExecutor. This is useful to avoid the
+            cost of starting processes when many Models are validated.
+
+    Returns:
+        A validated Model.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    members, lists = split_members(data, skip_whitespace(data, 0), PARALLEL_FIELDS)
+    members = [(key, data[start:end]) for key, start, end in members]
+    members.extend((key, b'[]') for key in lists)
+
+    # validate everything except the buildings and context shades
+    errors = []
+    try:
+        header = validate_json(Model, join_members(members))
+    except ValidationError as e:
+        header, errors = None, e.errors(include_url=False)
+
+    # validate the buildings and context shades in batches across the workers
+    max_workers = max_workers or os.cpu_count() or 1
+    jobs = []
+    for key, spans in lists.items():
+        raws = [data[start:end] for start, end in spans]
+        for start_index, batch in _batches(raws, max_workers * 4):
+            jobs.append((key, start_index, batch))
+    if max_workers == 1 or len(jobs) <= 1:
+        results = [_validate_batch(*job) for job in jobs]
+    elif executor is not None:
+        results = list(executor.map(_validate_batch, *zip(*jobs)))
+    else:
+        with ProcessPoolExecutor(max_workers) as pool:
+            results = list(pool.map(_validate_batch, *zip(*jobs)))
+
+    # put the validated objects back together into the Model
+    objects = {key: [] for key in lists}
+    for (key, _, _), (objs, errs) in zip(jobs, results):
+        objects[key].extend(objs)
+        errors.extend(errs)
+    if errors:
+        errors.sort(key=lambda err: _FIELD_ORDER.get(err['loc'][0], len(_FIELD_ORDER))
+                    if err['loc'] else -1)
+        raise ValidationError.from_exception_data(
+            'Model', line_errors(errors), input_type='json')
+    return header.model_copy(update=objects)
@@ -0,0 +1,150 @@
+"""Remove the energy and radiance resources of a Model that are never referenced.
+
+The reference graph is followed from the properties of the Buildings, Stories,
+Room2Ds and ContextShades (along with any 3D Honeybee Rooms of the Buildings)
+through construction sets, constructions, materials, program types, HVACs,
+schedules, schedule type limits, modifier sets and modifiers. Any text value
+within an object that matches the identifier of a resource is treated as a
+reference to that resource, which means that resources may occasionally be
+kept unnecessarily but a referenced resource is never removed.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.prune import prune_resources
+
+    model = Model.model_validate_json(data)
+    pruned_model, report = prune_resources(model)
+    print(report.object_count, report.byte_count)
+"""
+from typing import Dict, List, NamedTuple
+
+from pydantic_core import to_json, to_jsonable_python
+
+from .identifiers import iter_objects
+from .references import get_value
+
+RESOURCE_LISTS = {
+    'energy': ('construction_sets', 'constructions', 'materials', 'hvacs', 'shws',
+               'program_types', 'schedules', 'schedule_type_limits'),
+    'radiance': ('modifier_sets', 'modifiers')
+}
+# keys of objects with text values that are never references to other resources
+_NON_REFERENCE_KEYS = frozenset(('identifier', 'display_name', 'type', 'user_data'))
+
+
+class PruneReport(NamedTuple):
+    """A report of the resources removed from a Model.
+
+    Args:
+        removed: A dictionary with the names of the resource lists as keys
+            (eg. constructions, schedules) and lists of the identifiers of the
+            removed resources as values.
+        object_count: An integer for the total number of removed resources.
+        byte_count: An integer for the number of bytes of compact JSON of
+            the removed resources.
+    """
+    removed: Dict[str, List[str]]
+    object_count: int
+    byte_count: int
+
+
+def _iter_strings(value, strings):
+    """Add all text values within a JSON-like value to a list, except for names."""
+    if isinstance(value, str):
+        strings.append(value)
+    elif isinstance(value, dict):
+        for key, val in value.items():
+            if key not in _NON_REFERENCE_KEYS and not isinstance(val, (float, int)):
+                _iter_strings(val, strings)
+    elif isinstance(value, list):
+        for val in value:
+            if not isinstance(val, (float, int)):
+                _iter_strings(val, strings)
+    return strings
+
+
+def referenced_strings(model):
+    """Get a list of all text values in the properties of the objects of a Model.
+
+    This includes the properties of Buildings, Stories, Room2Ds and ContextShades
+    along with the whole of any 3D Honeybee Rooms of the Buildings.
+    """
+    strings = []
+    for obj_type, obj, _ in iter_objects(model):
+        _iter_strings(to_jsonable_python(obj.properties), strings)
+        if obj_type == 'Building' and obj.room_3ds:
+            _iter_strings(to_jsonable_python(obj.room_3ds), strings)
+    return strings
+
+
+def prune_resources(model):
+    """Get a copy of a Model without the energy and radiance resources it never uses.
+
+    Args:
+        model: A dragonfly Model.
+
+    Returns:
+        A tuple with two items.
+
+        -   pruned_model: A copy of the Model with unused resources removed from
+            its properties. Objects that are kept are shared with the input.
+
+        -   report: A PruneReport of the removed resources.
+    """
+    properties = model.properties
+    # map the identifier of each resource to the resource objects with it
+    resources = {}
+    for extension, keys in RESOURCE_LISTS.items():
+        ext_props = get_value(properties, extension)
+        for key in keys:
+            for obj in get_value(ext_props, key) or ():
+                resources.setdefault(get_value(obj, 'identifier'), []).append(obj)
+
+    # follow the references from the model objects through the resources
+    reached = set()
+    queue = referenced_strings(model)
+    while queue:
+        identifier = queue.pop()
+        if identifier in reached or identifier not in resources:
+            continue
+        reached.add(identifier)
+        for obj in resources[identifier]:
+            _iter_strings(to_jsonable_python(obj), queue)
+
+    # build new properties with only the reached resources
+    removed, object_count, byte_count = {}, 0, 0
+    new_properties = {}
+    for extension, keys in RESOURCE_LISTS.items():
+        ext_props = get_value(properties, extension)
+        if ext_props is None:
+            continue
+        updates = {}
+        for key in keys:
+            objs = get_value(ext_props, key)
+            if not objs:
+                continue
+            kept = [obj for obj in objs if get_value(obj, 'identifier') in reached]
+            if len(kept) == len(objs):
+                continue
+            unused = [obj for obj in objs if get_value(obj, 'identifier') not in reached]
+            removed[key] = [get_value(obj, 'identifier') for obj in unused]
+            object_count += len(unused)
+            # count the JSON of each object along with the comma separating it
+            byte_count += sum(len(to_json(obj)) for obj in unused) + \
+                (len(unused) if kept else len(unused) - 1)
+            updates[key] = kept
+        if updates:
+            new_properties[extension] = _copy(ext_props, updates)
+    pruned = model if not new_properties else \
+        model.model_copy(update={'properties': _copy(properties, new_properties)})
+    return pruned, PruneReport(removed, object_count, byte_count)
+
+
+def _copy(obj, updates):
+    """Get a shallow copy of a schema object or dict with some values replaced."""
+    if isinstance(obj, dict):
+        return dict(obj, **updates)
+    return obj.model_copy(update=updates)
@@ -1,12 +1,13 @@
 """Model radiance properties."""
 from pydantic import Field
-from typing import List, Union, Literal
+from typing import List, Union, Literal, Annotated
 
 from honeybee_schema._base import NoExtraBaseModel
 from honeybee_schema.radiance.modifier import _REFERENCE_UNION_MODIFIERS
 from honeybee_schema.radiance.modifierset import ModifierSet, ModifierSetAbridged
 from honeybee_schema.radiance.global_modifierset import GlobalModifierSet
 
+from .._union import TypeDiscriminator
 from .gridpar import RoomGridParameter, RoomRadialGridParameter, \
     ExteriorFaceGridParameter, ExteriorApertureGridParameter
 
@@ -23,10 +24,11 @@ class Room2DRadiancePropertiesAbridged(NoExtraBaseModel):
         'assigned here will override those assigned to the parent objects.'
     )
 
-    grid_parameters: Union[List[
+    grid_parameters: Union[List[Annotated[
         Union[RoomGridParameter, RoomRadialGridParameter,
-              ExteriorFaceGridParameter, ExteriorApertureGridParameter]
-    ], None] = Field(
+              ExteriorFaceGridParameter, ExteriorApertureGridParameter],
+        TypeDiscriminator()
+    ]], None] = Field(
         default=None,
         description='An optional list of GridParameter objects to describe '
         'how sensor grids should be generated for the Room2D.'
@@ -79,12 +81,16 @@ class ModelRadianceProperties(NoExtraBaseModel):
         json_schema_extra={'readOnly': True}
     )
 
-    modifier_sets: Union[List[Union[ModifierSetAbridged, ModifierSet]], None] = Field(
+    modifier_sets: Union[List[Annotated[
+        Union[ModifierSetAbridged, ModifierSet], TypeDiscriminator()
+    ]], None] = Field(
         default=None,
         description='List of all ModifierSets in the Model.'
     )
 
-    modifiers: Union[List[_REFERENCE_UNION_MODIFIERS], None] = Field(
+    modifiers: Union[List[Annotated[
+        _REFERENCE_UNION_MODIFIERS, TypeDiscriminator()
+    ]], None] = Field(
         default=None,
         description='A list of all unique modifiers in the model. This includes '
         'modifiers across all the Model modifier_sets.'
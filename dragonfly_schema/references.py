@@ -0,0 +1,185 @@
+"""Check that the energy and radiance resources referenced by name exist in a Model.
+
+The properties of Buildings, Stories, Room2Ds and ContextShades refer to
+construction sets, program types, HVACs, schedules, modifiers and other
+resources by their identifiers. The identifiers of all resources declared in
+the ModelEnergyProperties and ModelRadianceProperties are collected into sets
+once and every reference is then checked against them in a single pass.
+
+When a Model is validated with the CHECK_REFERENCES validation context, an
+error is raised if any reference is dangling.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.references import check_references
+
+    model = Model.model_validate_json(data)
+    for ref in check_references(model):
+        print('/'.join(str(key) for key in ref.path), ref.identifier)
+"""
+from typing import NamedTuple, Tuple, Union
+
+from .identifiers import iter_objects
+
+CHECK_REFERENCES = 'check_references'
+
+# the (extension, field, resource) of references for each type of object
+REFERENCE_FIELDS = {
+    'Building': (
+        ('energy', 'construction_set', 'construction_sets'),
+        ('energy', 'ceiling_plenum_construction', 'constructions'),
+        ('energy', 'floor_plenum_construction', 'constructions'),
+        ('radiance', 'modifier_set', 'modifier_sets')
+    ),
+    'Story': (
+        ('energy', 'construction_set', 'construction_sets'),
+        ('radiance', 'modifier_set', 'modifier_sets')
+    ),
+    'Room2D': (
+        ('energy', 'construction_set', 'construction_sets'),
+        ('energy', 'program_type', 'program_types'),
+        ('energy', 'hvac', 'hvacs'),
+        ('energy', 'shw', 'shws'),
+        ('radiance', 'modifier_set', 'modifier_sets')
+    ),
+    'ContextShade': (
+        ('energy', 'construction', 'constructions'),
+        ('energy', 'transmittance_schedule', 'schedules'),
+        ('radiance', 'modifier', 'modifiers')
+    )
+}
+# the keys from the Room2D energy properties to each schedule reference, where None
+# stands for each item of a list
+ROOM_SCHEDULE_PATHS = (
+    ('process_loads', None, 'schedule'),
+    ('window_vent_control', 'schedule'),
+    ('fans', None, 'control', 'schedule')
+)
+# the extension of each type of resource that can be referenced
+RESOURCE_EXTENSIONS = {
+    'construction_sets': 'energy',
+    'constructions': 'energy',
+    'program_types': 'energy',
+    'hvacs': 'energy',
+    'shws': 'energy',
+    'schedules': 'energy',
+    'modifier_sets': 'radiance',
+    'modifiers': 'radiance'
+}
+# global resources that can be referenced without being declared in the lists
+_GLOBAL_RESOURCES = {
+    'constructions': ('energy', 'global_construction_set', 'constructions'),
+    'modifiers': ('radiance', 'global_modifier_set', 'modifiers')
+}
+
+
+class DanglingReference(NamedTuple):
+    """A reference to a resource that does not exist in the Model.
+
+    Args:
+        path: A tuple of keys and indices from the Model to the reference.
+        resource: Text for the list of ModelEnergyProperties or
+            ModelRadianceProperties in which the resource should exist
+            (eg. construction_sets, program_types, modifiers).
+        identifier: Text for the identifier that was not found.
+    """
+    path: Tuple[Union[str, int], ...]
+    resource: str
+    identifier: str
+
+
+def get_value(obj, key):
+    """Get an attribute of a schema object, which is a dict for geometry-only models."""
+    if obj is None:
+        return None
+    return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+
+def _iter_path(value, keys, path=()):
+    """Yield the (path, value) of each value at a path of keys, where None is each item."""
+    if value is None:
+        return
+    if not keys:
+        yield path, value
+    elif keys[0] is None:
+        for i, item in enumerate(value):
+            yield from _iter_path(item, keys[1:], path + (i,))
+    else:
+        yield from _iter_path(get_value(value, keys[0]), keys[1:], path + (keys[0],))
+
+
+def declared_identifiers(model):
+    """Get sets of the identifiers of the resources declared in a Model.
+
+    Args:
+        model: A dragonfly Model.
+
+    Returns:
+        A dictionary with the keys of RESOURCE_EXTENSIONS and sets of
+        identifiers as values.
+    """
+    properties = model.properties
+    declared = {}
+    for resource, extension in RESOURCE_EXTENSIONS.items():
+        objs = get_value(get_value(properties, extension), resource) or ()
+        declared[resource] = {get_value(obj, 'identifier') for obj in objs}
+    for resource, (extension, global_set, key) in _GLOBAL_RESOURCES.items():
+        objs = get_value(get_value(get_value(properties, extension), global_set), key)
+        declared[resource].update(get_value(obj, 'identifier') for obj in objs or ())
+    return declared
+
+
+def check_references(model):
+    """Get a list of all references to resources that do not exist in a Model.
+
+    Args:
+        model: A dragonfly Model.
+
+    Returns:
+        A list of DanglingReference for each reference to a resource identifier
+        that is not declared in the Model properties. The list is empty when
+        all references are valid.
+    """
+    declared = declared_identifiers(model)
+    dangling = []
+    for obj_type, obj, path in iter_objects(model):
+        properties = obj.properties
+        for extension, field, resource in REFERENCE_FIELDS[obj_type]:
+            identifier = get_value(get_value(properties, extension), field)
+            if identifier is not None and identifier not in declared[resource]:
+                dangling.append(DanglingReference(
+                    path + ('properties', extension, field), resource, identifier))
+        if obj_type == 'Room2D':  # process loads, ventilation and fans use schedules
+            energy = get_value(properties, 'energy')
+            for keys in ROOM_SCHEDULE_PATHS:
+                for sch_path, identifier in _iter_path(energy, keys):
+                    if identifier not in declared['schedules']:
+                        dangling.append(DanglingReference(
+                            path + ('properties', 'energy') + sch_path,
+                            'schedules', identifier))
+    return dangling
+
+
+def use_check_references(info):
+    """Check whether the context of a pydantic ValidationInfo requests the check."""
+    return bool(info.context) and bool(info.context.get(CHECK_REFERENCES))
+
+
+def reference_messages(dangling, max_count=10):
+    """Get a list of text messages describing dangling references.
+
+    Args:
+        dangling: A list of DanglingReference from check_references.
+        max_count: An integer for the maximum number of references that are
+            described. (Default: 10).
+    """
+    messages = ['{} "{}" referenced at {} is not in the Model {}.'.format(
+        ref.path[-1], ref.identifier, '/'.join(str(key) for key in ref.path),
+        ref.resource) for ref in dangling[:max_count]]
+    if len(dangling) > max_count:
+        messages.append('And {} other dangling references.'.format(
+            len(dangling) - max_count))
+    return messages
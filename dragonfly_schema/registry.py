@@ -0,0 +1,132 @@
+"""Registry of TypeAdapters to validate any dragonfly object by its type.
+
+The type of a JSON document is found by scanning its top-level keys without
+decoding the rest of the document and the document is then validated with the
+prebuilt TypeAdapter of that type. Arrays of mixed objects are validated in a
+single call with a TypeAdapter of a Union that is discriminated by type, while
+lists of the JSON texts of objects are validated one text at a time.
+Objects without a known type are reported with a single error.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.registry import validate_any, validate_many
+
+    room = validate_any(b'{"type": "Room2D", ...}')
+    objects = validate_many(b'[{"type": "Story", ...}, {"type": "SingleWindow", ...}]')
+"""
+from typing import List, Union, Annotated
+
+from pydantic import TypeAdapter, ValidationError, Field
+
+from ._raw import skip_whitespace, iter_members, prefix_error, validate_json
+from ._union import line_errors
+from .window_parameter import SingleWindow, SimpleWindowArea, SimpleWindowRatio, \
+    RepeatingWindowRatio, RepeatingWindowWidthHeight, RectangularWindows, \
+    DetailedWindows
+from .shading_parameter import ExtrudedBorder, Overhang, LouversByDistance, \
+    LouversByCount
+from .skylight_parameter import GriddedSkylightArea, GriddedSkylightRatio, \
+    DetailedSkylights
+from .clerestory_parameter import DetailedClerestory
+from .roof import RoofSpecification
+from .model import Room2D, Story, Building, ContextShade, Model
+
+CLASSES = (
+    Room2D, Story, Building, ContextShade, Model,
+    SingleWindow, SimpleWindowArea, SimpleWindowRatio, RepeatingWindowRatio,
+    RepeatingWindowWidthHeight, RectangularWindows, DetailedWindows,
+    ExtrudedBorder, Overhang, LouversByDistance, LouversByCount,
+    GriddedSkylightArea, GriddedSkylightRatio, DetailedSkylights,
+    DetailedClerestory, RoofSpecification
+)
+ADAPTERS = {cls.model_fields['type'].default: TypeAdapter(cls) for cls in CLASSES}
+_ANY = Annotated[Union[CLASSES], Field(discriminator='type')]
+_ANY_ADAPTER = TypeAdapter(_ANY)
+_MANY_ADAPTER = TypeAdapter(List[_ANY])
+_TITLE = 'DragonflyObject'
+
+
+def peek_type(data):
+    """Get the value of the top-level type key of a JSON object without decoding it.
+
+    Args:
+        data: A bytes-like buffer of the JSON text of an object.
+
+    Returns:
+        A string for the type or None if the document is not a JSON object
+        with a type key that is a string.
+    """
+    try:
+        for key, start, end in iter_members(data, skip_whitespace(data, 0)):
+            if key == 'type':
+                value = bytes(data[start:end])
+                if value[:1] == b'"' and b'\\' not in value:
+                    return value[1:-1].decode('utf-8')
+                return None
+    except ValueError:  # not a JSON object; let pydantic report the error
+        pass
+    return None
+
+
+def _validate(validate, data, context):
+    """Run a TypeAdapter validate method, raising errors with a readable title."""
+    try:
+        return validate(data, context=context)
+    except ValidationError as e:
+        raise prefix_error(e, (), _TITLE) from None
+
+
+def validate_any(data, context=None):
+    """Validate any dragonfly object using the TypeAdapter of its type.
+
+    Args:
+        data: The JSON text (str or bytes) or the dictionary of the object.
+        context: An optional dictionary of validation context. (Default: None).
+
+    Returns:
+        The validated object.
+    """
+    if isinstance(data, dict):
+        adapter = ADAPTERS.get(data.get('type'))
+        if adapter is not None:
+            return adapter.validate_python(data, context=context)
+        # the type is missing or unknown; get the same error as a list item
+        return _validate(_ANY_ADAPTER.validate_python, data, context)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    adapter = ADAPTERS.get(peek_type(data))
+    if adapter is not None:
+        return adapter.validate_json(data, context=context)
+    return _validate(_ANY_ADAPTER.validate_json, data, context)
+
+
+def validate_many(data, context=None):
+    """Validate a list of mixed dragonfly objects in a single call.
+
+    Args:
+        data: The JSON text (str or bytes) of an array of objects, a list of the
+            JSON texts of objects or a list of dictionaries of objects. Each JSON
+            text of a list is validated on its own and it must therefore be the
+            text of a single object.
+        context: An optional dictionary of validation context. (Default: None).
+
+    Returns:
+        A list of the validated objects.
+    """
+    if isinstance(data, list):
+        if not data or not all(isinstance(d, (str, bytes, bytearray)) for d in data):
+            return _validate(_MANY_ADAPTER.validate_python, data, context)
+        objects, errors = [], []
+        for i, obj_json in enumerate(data):
+            try:
+                objects.append(
+                    validate_json(_ANY_ADAPTER, obj_json, (i,), _TITLE, context))
+            except ValidationError as e:
+                errors.extend(e.errors(include_url=False))
+        if errors:
+            raise ValidationError.from_exception_data(
+                _TITLE, line_errors(errors), input_type='json')
+        return objects
+    return _validate(_MANY_ADAPTER.validate_json, data, context)
@@ -3,8 +3,9 @@ from pydantic import Field
 from typing import Union, List, Literal, Annotated
 
 from honeybee_schema._base import NoExtraBaseModel
-from honeybee_schema.model import Face3D, Mesh3D
+from honeybee_schema.geometry import Face3D, Mesh3D
 
+from ._union import TypeDiscriminator
 from .clerestory_parameter import DetailedClerestory
 
 
@@ -13,7 +14,9 @@ class RoofSpecification(NoExtraBaseModel):
 
     type: Literal['RoofSpecification'] = 'RoofSpecification'
 
-    geometry: Annotated[List[Union[Face3D, Mesh3D]], Field(min_length=1)] = Field(
+    geometry: Annotated[
+        List[Annotated[Union[Face3D, Mesh3D], TypeDiscriminator()]], Field(min_length=1)
+    ] = Field(
         ...,
         description='An array of Face3D (or Mesh3D) objects representing the '
         'geometry of the Roof. Cases where Room2Ds are only partially covered '
@@ -0,0 +1,208 @@
+"""Assign the roof geometry of Buildings to the Stories that they cover.
+
+Each Face3D of the Building roof (and each face of a Mesh3D) is assigned to the
+top-most Story with a Room2D that it overlaps in plan, skipping Stories with a
+floor_height above the roof geometry, as described for the Building roof.
+
+The Stories are sorted by floor_height such that the Stories below the highest
+point of a roof geometry are found with a binary search. Each Story is then
+first checked against the bounding box of all of its Room2Ds and only the
+Room2Ds whose bounding boxes overlap the roof geometry, as found with the
+RoomGrid of the Story, have their overlap with the roof geometry computed.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.roofs import assign_model_roofs
+
+    model = Model.model_validate_json(data)
+    model = assign_model_roofs(model)  # each Story now has its own roof
+"""
+import bisect
+
+from honeybee_schema.geometry import Face3D
+
+from .overlaps import RoomGrid, polygon_edges, overlap_area, _bounding_box, \
+    _is_inside, _edge_at
+from .roof import RoofSpecification
+
+
+def _roof_regions(geometry):
+    """Get a list of the (edges, max_z) of each face of a Face3D or Mesh3D in plan."""
+    if isinstance(geometry, Face3D):
+        loops = [geometry.boundary] + list(geometry.holes or ())
+        max_z = max(pt[2] for pt in geometry.boundary)
+        return [(polygon_edges(loops), max_z)]
+    vertices = geometry.vertices
+    return [(polygon_edges([[vertices[i] for i in face]]),
+             max(vertices[i][2] for i in face)) for face in geometry.faces]
+
+
+def _boxes_overlap(box_1, box_2, tolerance):
+    return box_1[0] < box_2[2] - tolerance and box_2[0] < box_1[2] - tolerance and \
+        box_1[1] < box_2[3] - tolerance and box_2[1] < box_1[3] - tolerance
+
+
+class _StoryIndex:
+    """The Stories of a Building sorted from top to bottom with their footprint boxes.
+
+    The RoomGrid of each Story is only built when a roof geometry overlaps
+    the bounding box of its footprint.
+    """
+
+    def __init__(self, stories, tolerance):
+        self.tolerance = tolerance
+        heights = [self.floor_height(story) for story in stories]
+        self.order = sorted(range(len(stories)), key=lambda i: -heights[i])
+        self.stories = stories
+        self.neg_heights = [-heights[i] for i in self.order]
+        self.footprints = {}
+        self._grids = {}
+
+    @staticmethod
+    def floor_height(story):
+        """Get the floor height of a Story, which is its lowest Room2D if autocalculated."""
+        if isinstance(story.floor_height, (int, float)):
+            return story.floor_height
+        return min((room.floor_height for room in story.room_2ds), default=0)
+
+    def footprint(self, i):
+        """Get the bounding box of all Room2Ds of a Story or None if it has none."""
+        if i not in self.footprints:
+            points = [pt for room in self.stories[i].room_2ds
+                      for pt in room.floor_boundary]
+            self.footprints[i] = None if not points else (
+                min(pt[0] for pt in points), min(pt[1] for pt in points),
+                max(pt[0] for pt in points), max(pt[1] for pt in points))
+        return self.footprints[i]
+
+    def grid(self, i):
+        """Get the RoomGrid of a Story."""
+        grid = self._grids.get(i)
+        if grid is None:
+            grid = self._grids[i] = RoomGrid(self.stories[i].room_2ds, self.tolerance)
+        return grid
+
+    def stories_below(self, z):
+        """Get the indices of the Stories with a floor_height below z, from the top."""
+        start = bisect.bisect_left(self.neg_heights, -(z + self.tolerance))
+        return self.order[start:]
+
+    def find_story(self, edges, max_z):
+        """Get the index of the top-most Story overlapped by a region or None."""
+        box = _bounding_box(edges)
+        for i in self.stories_below(max_z):
+            footprint = self.footprint(i)
+            if footprint is None or \
+                    not _boxes_overlap(box, footprint, self.tolerance):
+                continue
+            grid = self.grid(i)
+            for room_i in grid.query(box):
+                if overlap_area(grid.edges[room_i], edges, self.tolerance) > 0:
+                    return i
+        return None
+
+    def find_story_at_point(self, point, z):
+        """Get the index of the top-most Story with a Room2D at a point or None."""
+        tol = self.tolerance
+        box = (point[0] - tol, point[1] - tol, point[0] + tol, point[1] + tol)
+        for i in self.stories_below(z):
+            grid = self.grid(i)
+            for room_i in grid.query(box):
+                edges = grid.edges[room_i]
+                if _is_inside(point, edges) or _edge_at(point, edges, tol) is not None:
+                    return i
+        return None
+
+
+def _add_roof(roof, geometry, clerestories):
+    """Get a RoofSpecification with geometry and clerestory parameters added to it."""
+    if roof is not None:
+        geometry = list(roof.geometry) + geometry
+        clerestories = list(roof.clerestory_parameters or ()) + clerestories
+    return RoofSpecification(
+        geometry=geometry, clerestory_parameters=clerestories or None)
+
+
+def assign_roofs(building, tolerance=0.01):
+    """Get a copy of a Building with the geometry of its roof assigned to its Stories.
+
+    Args:
+        building: A dragonfly Building.
+        tolerance: The distance within which geometry is considered to overlap.
+            (Default: 0.01).
+
+    Returns:
+        A copy of the Building where each Story has a RoofSpecification with the
+        roof geometry that is assigned to it, which is added to the geometry of
+        any existing Story roof. Each clerestory parameter of the Building roof
+        is assigned to the top-most Story below its elevation with a Room2D at
+        the middle of its base_line. Roof geometry and clerestory parameters that
+        do not overlap any Story are kept in the roof of the Building. The input
+        Building is returned if it has no roof or no unique_stories.
+    """
+    roof, stories = building.roof, building.unique_stories
+    if roof is None or not stories:
+        return building
+    index = _StoryIndex(stories, tolerance)
+    geometries = [[] for _ in stories]
+    unassigned = []
+    for geometry in roof.geometry:
+        if isinstance(geometry, Face3D):
+            story_i = index.find_story(*_roof_regions(geometry)[0])
+        else:  # assign a Mesh3D to the Story of the first face that overlaps one
+            story_i = None
+            for edges, max_z in _roof_regions(geometry):
+                story_i = index.find_story(edges, max_z)
+                if story_i is not None:
+                    break
+        if story_i is None:
+            unassigned.append(geometry)
+        else:
+            geometries[story_i].append(geometry)
+
+    clerestories = [[] for _ in stories]
+    unassigned_clerestories = []
+    for clerestory in roof.clerestory_parameters or ():
+        (x_1, y_1), (x_2, y_2) = clerestory.base_line
+        story_i = index.find_story_at_point(
+            ((x_1 + x_2) / 2, (y_1 + y_2) / 2), clerestory.elevation)
+        if story_i is None or not (geometries[story_i] or stories[story_i].roof):
+            unassigned_clerestories.append(clerestory)
+        else:
+            clerestories[story_i].append(clerestory)
+
+    new_stories = [
+        story.model_copy(update={'roof': _add_roof(story.roof, geos, clers)})
+        if geos or clers else story
+        for story, geos, clers in zip(stories, geometries, clerestories)
+    ]
+    new_roof = RoofSpecification(
+        geometry=unassigned, clerestory_parameters=unassigned_clerestories or None) \
+        if unassigned else None
+    if new_roof is None and unassigned_clerestories:
+        # keep the clerestories with the top Story that has a roof
+        top = next(i for i in index.order if new_stories[i].roof is not None)
+        new_stories[top] = new_stories[top].model_copy(update={'roof': _add_roof(
+            new_stories[top].roof, [], unassigned_clerestories)})
+    return building.model_copy(update={'unique_stories': new_stories, 'roof': new_roof})
+
+
+def assign_model_roofs(model):
+    """Get a copy of a Model with the roof geometry of all Buildings assigned to Stories.
+
+    Args:
+        model: A dragonfly Model. Its tolerance is used to find the overlaps.
+
+    Returns:
+        A copy of the Model where each Building is processed with assign_roofs.
+        Buildings without roofs are shared with the input Model.
+    """
+    if not model.buildings:
+        return model
+    buildings = [assign_roofs(building, model.tolerance) for building in model.buildings]
+    if all(new is old for new, old in zip(buildings, model.buildings)):
+        return model
+    return model.model_copy(update={'buildings': buildings})
@@ -0,0 +1,178 @@
+"""Streaming validation of large DFJSON files one Building at a time."""
+from ._raw import IncompleteJSON, skip_whitespace, value_end, string_end, \
+    decode_key, join_members, validate_json
+from .model import Building, ContextShade, Model
+
+STREAMED_FIELDS = {'buildings': Building, 'context_shades': ContextShade}
+
+
+class _StreamReader(object):
+    """Buffered reader that scans JSON from a binary file in growing chunks.
+
+    Bytes that have already been consumed are periodically dropped from the
+    buffer such that memory only depends on the size of the largest JSON value
+    that is read at once.
+    """
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buf = bytearray()
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        """Read more bytes into the buffer, returning False at the end of the file."""
+        if self.eof:
+            return False
+        # grow reads geometrically so that large values are not rescanned many times
+        data = self.file.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not data:
+            self.eof = True
+            return False
+        self.buf += data
+        return True
+
+    def compact(self):
+        """Drop the bytes that have already been consumed from the buffer."""
+        if self.pos > self.chunk_size:
+            del self.buf[:self.pos]
+            self.pos = 0
+
+    def scan(self, func):
+        """Get the end index of the JSON token at pos using a scanning function."""
+        while True:
+            try:
+                return func(self.buf, self.pos)
+            except IncompleteJSON:
+                if not self.more():
+                    raise ValueError('Unexpected end of DFJSON file.')
+
+    def peek(self):
+        """Skip whitespace and get the next byte without consuming it."""
+        self.pos = skip_whitespace(self.buf, self.pos)
+        while self.pos == len(self.buf):
+            if not self.more():
+                raise ValueError('Unexpected end of DFJSON file.')
+            self.pos = skip_whitespace(self.buf, self.pos)
+        return chr(self.buf[self.pos])
+
+    def expect(self, char):
+        """Consume the next non-whitespace byte, ensuring that it is the char."""
+        found = self.peek()
+        if found != char:
+            raise ValueError('Expected "{}" in DFJSON file but got "{}".'.format(
+                char, found))
+        self.pos += 1
+
+    def read_value(self):
+        """Consume the next JSON value and get its raw bytes."""
+        self.peek()
+        end = self.scan(value_end)
+        raw = bytes(self.buf[self.pos:end])
+        self.pos = end
+        self.compact()
+        return raw
+
+
+class ModelStream(object):
+    """Validate a DFJSON file incrementally, yielding one Building or ContextShade at a time.
+
+    Only one Building or ContextShade is held in memory at once such that peak
+    memory depends on the largest single object rather than the size of the file.
+    All other top-level Model fields are validated once the end of the file is
+    reached and the result is available from the header property.
+
+    Args:
+        file: Either the path to a DFJSON file or a file object opened in
+            binary mode.
+        chunk_size: The number of bytes read from the file at a time. (Default: 1 MB).
+
+    Properties:
+        *   header
+        *   building_count
+        *   context_shade_count
+
+    Usage:
+
+    .. code-block:: python
+
+        stream = ModelStream('./large_model.dfjson')
+        for obj in stream:
+            print(obj.identifier)
+        print(stream.header.units)
+    """
+
+    def __init__(self, file, chunk_size=1 << 20):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.header = None
+        self.building_count = 0
+        self.context_shade_count = 0
+
+    def __iter__(self):
+        if hasattr(self.file, 'read'):
+            yield from self._iter_file(self.file)
+        else:
+            with open(self.file, 'rb') as f:
+                yield from self._iter_file(f)
+
+    def _iter_file(self, file):
+        """Yield the validated objects of a file and set the header at the end."""
+        reader = _StreamReader(file, self.chunk_size)
+        header_members = []
+        reader.expect('{')
+        if reader.peek() == '}':
+            reader.pos += 1
+        else:
+            while True:
+                reader.peek()
+                key_end = reader.scan(string_end)
+                key = decode_key(reader.buf, reader.pos, key_end)
+                reader.pos = key_end
+                reader.expect(':')
+                if key in STREAMED_FIELDS and reader.peek() == '[':
+                    yield from self._iter_array(reader, key)
+                else:
+                    header_members.append((key, reader.read_value()))
+                if reader.peek() == '}':
+                    reader.pos += 1
+                    break
+                reader.expect(',')
+        self.header = validate_json(Model, join_members(header_members))
+
+    def _iter_array(self, reader, key):
+        """Yield the validated objects of a top-level array in the file."""
+        cls = STREAMED_FIELDS[key]
+        reader.expect('[')
+        if reader.peek() == ']':
+            reader.pos += 1
+            return
+        count = 0
+        while True:
+            obj = validate_json(cls, reader.read_value(), (key, count))
+            count += 1
+            if key == 'buildings':
+                self.building_count = count
+            else:
+                self.context_shade_count = count
+            yield obj
+            if reader.peek() == ']':
+                reader.pos += 1
+                return
+            reader.expect(',')
+
+    def validate(self):
+        """Validate the whole file without keeping any Buildings or ContextShades.
+
+        Returns:
+            The header Model with all top-level fields except the buildings
+            and context_shades.
+        """
+        for _ in self:
+            pass
+        return self.header
+
+    def __repr__(self):
+        return 'ModelStream: {}'.format(
+            self.file if isinstance(self.file, str) else type(self.file).__name__)
@@ -0,0 +1,205 @@
+"""Columnar tables of the Room2Ds and walls of a Model for analytics.
+
+A Model is flattened into two tables that are built column by column. The room
+table has one row per Room2D and the wall table has one row per segment of the
+Room2D floor_boundary and floor_holes. The tables can be written to Apache
+Parquet files, which can be read by pandas, polars, DuckDB, Spark and other
+analytics tools without dragonfly_schema installed.
+
+All rows include the identifier of the Model such that the tables of many
+models can be concatenated.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.table import write_parquet
+
+    model = Model.model_validate_json(data)
+    room_file, wall_file = write_parquet(model, './tables')
+"""
+import os
+
+ROOM_COLUMNS = (
+    ('model', 'string'),
+    ('building', 'string'),
+    ('story', 'string'),
+    ('identifier', 'string'),
+    ('display_name', 'string'),
+    ('floor_height', 'float64'),
+    ('floor_to_ceiling_height', 'float64'),
+    ('zone', 'string'),
+    ('multiplier', 'int64'),
+    ('is_ground_contact', 'bool'),
+    ('is_top_exposed', 'bool'),
+    ('program_type', 'string'),
+    ('construction_set', 'string'),
+    ('hvac', 'string'),
+    ('segment_count', 'int64')
+)
+WALL_COLUMNS = (
+    ('model', 'string'),
+    ('building', 'string'),
+    ('story', 'string'),
+    ('room', 'string'),
+    ('segment', 'int64'),
+    ('start_x', 'float64'),
+    ('start_y', 'float64'),
+    ('end_x', 'float64'),
+    ('end_y', 'float64'),
+    ('boundary_condition', 'string'),
+    ('window_parameter', 'string'),
+    ('shading_parameter', 'string'),
+    ('air_boundary', 'bool')
+)
+_pa = None
+
+
+def _pyarrow():
+    """Import pyarrow, raising a helpful error if it is not installed."""
+    global _pa
+    if _pa is None:
+        try:
+            import pyarrow
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                'pyarrow module is not installed and is required for writing '
+                'columnar tables. Try `pip install pyarrow` command.'
+            )
+        _pa = pyarrow
+    return _pa
+
+
+def _energy_value(room, key):
+    """Get an energy property of a Room2D, which is a dict for geometry-only models."""
+    energy = room.properties.energy
+    if energy is None:
+        return None
+    return energy.get(key) if isinstance(energy, dict) else getattr(energy, key)
+
+
+def _type_name(obj):
+    """Get the type of a dragonfly object, which is a dict for geometry-only models."""
+    if obj is None:
+        return None
+    return obj.get('type') if isinstance(obj, dict) else obj.type
+
+
+def _iter_rooms(model):
+    """Yield a (building, story, room_2d) tuple for each Room2D of a Model."""
+    for building in model.buildings or ():
+        for story in building.unique_stories or ():
+            for room in story.room_2ds:
+                yield building, story, room
+
+
+def _segments(room):
+    """Get the (start, end) points of all segments of a Room2D in order."""
+    segments = []
+    for loop in [room.floor_boundary] + list(room.floor_holes or ()):
+        count = len(loop)
+        segments.extend((loop[i], loop[(i + 1) % count]) for i in range(count))
+    return segments
+
+
+def room_table(model):
+    """Get a table with one row per Room2D of a Model.
+
+    The multiplier of each row is the multiplier of the Story of the Room2D.
+
+    Args:
+        model: A dragonfly Model.
+
+    Returns:
+        A dictionary with the ROOM_COLUMNS names as keys and lists of the
+        values of the columns.
+    """
+    table = {name: [] for name, _ in ROOM_COLUMNS}
+    columns = [table[name] for name, _ in ROOM_COLUMNS]
+    model_id = model.identifier
+    for building, story, room in _iter_rooms(model):
+        holes = room.floor_holes or ()
+        row = (
+            model_id, building.identifier, story.identifier, room.identifier,
+            room.display_name, room.floor_height, room.floor_to_ceiling_height,
+            room.zone, story.multiplier, room.is_ground_contact,
+            room.is_top_exposed, _energy_value(room, 'program_type'),
+            _energy_value(room, 'construction_set'), _energy_value(room, 'hvac'),
+            len(room.floor_boundary) + sum(len(hole) for hole in holes)
+        )
+        for column, value in zip(columns, row):
+            column.append(value)
+    return table
+
+
+def wall_table(model):
+    """Get a table with one row per wall segment of the Room2Ds of a Model.
+
+    Segments follow the order of the floor_boundary and then each of the
+    floor_holes. The boundary_condition, window_parameter and shading_parameter
+    columns hold the type of the object assigned to the segment, which is None
+    when it has not been assigned and the default of the Room2D is used.
+
+    Args:
+        model: A dragonfly Model.
+
+    Returns:
+        A dictionary with the WALL_COLUMNS names as keys and lists of the
+        values of the columns.
+    """
+    table = {name: [] for name, _ in WALL_COLUMNS}
+    columns = [table[name] for name, _ in WALL_COLUMNS]
+    model_id = model.identifier
+    for building, story, room in _iter_rooms(model):
+        segments = _segments(room)
+        count = len(segments)
+        bcs = room.boundary_conditions or (None,) * count
+        windows = room.window_parameters or (None,) * count
+        shades = room.shading_parameters or (None,) * count
+        air = room.air_boundaries or (False,) * count
+        for i, (start, end) in enumerate(segments):
+            row = (
+                model_id, building.identifier, story.identifier, room.identifier,
+                i, float(start[0]), float(start[1]), float(end[0]), float(end[1]),
+                _type_name(bcs[i]), _type_name(windows[i]), _type_name(shades[i]),
+                air[i]
+            )
+            for column, value in zip(columns, row):
+                column.append(value)
+    return table
+
+
+def to_arrow(table, columns):
+    """Convert a table of columns to a pyarrow Table with fixed column types.
+
+    Args:
+        table: A dictionary of columns from room_table or wall_table.
+        columns: The ROOM_COLUMNS or WALL_COLUMNS that describe the table.
+    """
+    pa = _pyarrow()
+    return pa.table({name: pa.array(table[name], type=pa.type_for_alias(type_name))
+                     for name, type_name in columns})
+
+
+def write_parquet(model, folder, name=None):
+    """Write the room and wall tables of a Model to Parquet files.
+
+    Args:
+        model: A dragonfly Model.
+        folder: Path to a folder where the files will be written.
+        name: An optional base name for the files. If None, the identifier of
+            the Model will be used. (Default: None).
+
+    Returns:
+        A tuple with the paths to the room file and the wall file.
+    """
+    pa = _pyarrow()
+    name = name or model.identifier
+    os.makedirs(folder, exist_ok=True)
+    room_file = os.path.join(folder, '{}_rooms.parquet'.format(name))
+    wall_file = os.path.join(folder, '{}_walls.parquet'.format(name))
+    pa.parquet.write_table(to_arrow(room_table(model), ROOM_COLUMNS), room_file)
+    pa.parquet.write_table(to_arrow(wall_table(model), WALL_COLUMNS), wall_file)
+    return room_file, wall_file
@@ -0,0 +1,239 @@
+"""Reuse validated Buildings, Stories and ContextShades across validations of Models.
+
+When a Model is validated with a ValidationCache under the VALIDATION_CACHE key
+of the validation context, the JSON dictionary of each Building, Story and
+ContextShade is hashed and the object validated from an identical dictionary
+is reused instead of validating it again. Objects are kept in memory with least
+recently used eviction and, optionally, pickled in a folder on disk such that
+they can be reused by other processes.
+
+The hash is the SHA-256 digest of the JSON of the dictionary, as written by
+pydantic-core, along with the versions of dragonfly-schema, honeybee-schema,
+pydantic-core and the dragonfly_schema source files, and any other values of the
+validation context. As with the Merkle hashes of dragonfly_schema.hashing, the
+hash of a Building is the digest of its own fields and the hashes of its Stories,
+which are remembered and used to look up the Stories when the Building is not in
+the cache such that the JSON of each Story is only written and hashed once.
+The JSON is not canonical and dictionaries that only differ by the order of
+their keys or by numbers written as 3 or 3.0 are therefore validated again.
+Objects reused from the cache are shared between all Models that reuse them
+and they should therefore not be mutated.
+
+Usage:
+
+.. code-block:: python
+
+    from dragonfly_schema.model import Model
+    from dragonfly_schema.validation_cache import VALIDATION_CACHE, ValidationCache
+
+    cache = ValidationCache(max_size=10000, folder='./validation_cache')
+    model = Model.model_validate_json(data, context={VALIDATION_CACHE: cache})
+    print(cache.hits, cache.misses)
+"""
+import os
+import pickle
+import hashlib
+import platform
+from collections import OrderedDict
+from importlib import metadata
+
+from pydantic import ValidationError
+from pydantic_core import to_json
+
+VALIDATION_CACHE = 'validation_cache'
+_DISTRIBUTIONS = ('dragonfly-schema', 'honeybee-schema', 'pydantic-core')
+# the field and class name of the children of each class that are also cached
+CACHED_CHILDREN = {'Building': ('unique_stories', 'Story')}
+
+
+def cache_key():
+    """Get a tuple that identifies the package versions that validated cached objects."""
+    versions = []
+    for dist in _DISTRIBUTIONS:
+        try:
+            versions.append(metadata.version(dist))
+        except metadata.PackageNotFoundError:
+            versions.append(None)
+    package_folder = os.path.dirname(os.path.abspath(__file__))
+    sources = []
+    for folder, _, files in sorted(os.walk(package_folder)):
+        for f_name in sorted(files):
+            if f_name.endswith('.py'):
+                stat = os.stat(os.path.join(folder, f_name))
+                sources.append((f_name, stat.st_mtime_ns, stat.st_size))
+    return (tuple(versions), platform.python_version(), tuple(sources))
+
+
+def get_validation_cache(info):
+    """Get the ValidationCache from the context of a pydantic ValidationInfo or None."""
+    if not info.context:
+        return None
+    return info.context.get(VALIDATION_CACHE)
+
+
+class ValidationCache:
+    """A cache of validated objects keyed by the hash of their JSON dictionaries.
+
+    Args:
+        max_size: An integer for the maximum number of objects kept in memory.
+            The least recently used objects are removed when there are more.
+            (Default: 1000).
+        folder: Optional path to a folder in which validated objects are pickled
+            such that they can be reused by other processes. Only use folders
+            that are not writable by others since the pickles are loaded without
+            checks. If None, objects are only cached in memory. (Default: None).
+
+    Properties:
+        *   max_size
+        *   folder
+        *   hits: The number of objects reused from memory.
+        *   disk_hits: The number of objects reused from the folder.
+        *   misses: The number of objects that were validated.
+        *   hit_rate: The fraction of objects that were reused.
+    """
+
+    def __init__(self, max_size=1000, folder=None):
+        self.max_size = max_size
+        self.folder = folder
+        self.hits = self.disk_hits = self.misses = 0
+        self._objects = OrderedDict()
+        self._version = repr(cache_key()).encode('utf-8')
+        self._child_keys = {}  # the id of each child dictionary mapped to it and its key
+
+    @property
+    def hit_rate(self):
+        """The fraction of objects that were reused from memory or the folder."""
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+    def stats(self):
+        """Get a dictionary of the hit and miss statistics of the cache."""
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                'size': len(self._objects), 'hit_rate': self.hit_rate}
+
+    def clear(self):
+        """Remove all objects from memory and reset the statistics."""
+        self._objects.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def key(self, cls, data, context=None):
+        """Get the hexadecimal hash that identifies a JSON dictionary of an object.
+
+        Args:
+            cls: The class that the dictionary is validated as.
+            data: A JSON dictionary of the object.
+            context: An optional dictionary of validation context. (Default: None).
+        """
+        return self._digest(cls.__name__, data, context)
+
+    def _digest(self, class_name, data, context):
+        """Get the key of a dictionary and remember the keys of its cached children."""
+        digest = hashlib.sha256(self._version)
+        digest.update(class_name.encode('utf-8'))
+        values = sorted((key, repr(val)) for key, val in (context or {}).items()
+                        if key != VALIDATION_CACHE)
+        if values:
+            digest.update(repr(values).encode('utf-8'))
+        field, child_name = CACHED_CHILDREN.get(class_name, (None, None))
+        children = data.get(field) if field is not None else None
+        if not isinstance(children, list):
+            digest.update(to_json(data))
+            return digest.hexdigest()
+        digest.update(to_json({k: v for k, v in data.items() if k != field}))
+        for child in children:
+            if isinstance(child, dict):
+                child_key = self._digest(child_name, child, context)
+                self._child_keys[id(child)] = (child, child_key)
+            else:
+                child_key = hashlib.sha256(to_json(child)).hexdigest()
+            digest.update(child_key.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _key(self, cls, data, context):
+        """Get the remembered key of a child dictionary or compute the key."""
+        remembered = self._child_keys.pop(id(data), None)
+        if remembered is not None and remembered[0] is data:
+            return remembered[1]
+        return self.key(cls, data, context)
+
+    def _forget_children(self, cls, data):
+        """Forget the remembered keys of the children of a dictionary."""
+        field, _ = CACHED_CHILDREN.get(cls.__name__, (None, None))
+        if field is not None and isinstance(data.get(field), list):
+            for child in data[field]:
+                self._child_keys.pop(id(child), None)
+
+    def _file_path(self, key):
+        return os.path.join(self.folder, key[:2], '{}.pickle'.format(key))
+
+    def _read(self, key):
+        """Read an object from the folder or return None if it is not there."""
+        try:
+            with open(self._file_path(key), 'rb') as f:
+                return pickle.load(f)
+        except Exception:  # missing, truncated or written by an incompatible version
+            return None
+
+    def _write(self, key, obj):
+        """Write an object to the folder, ignoring errors of folders and pickling."""
+        file_path = self._file_path(key)
+        temp_path = '{}.{}.tmp'.format(file_path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, file_path)
+        except Exception:  # folder is not writable or the object cannot be pickled
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+
+    def _add(self, key, obj):
+        self._objects[key] = obj
+        if len(self._objects) > self.max_size:
+            self._objects.popitem(last=False)
+
+    def validate(self, cls, data, context=None):
+        """Get a validated object from the cache or validate it and add it to the cache.
+
+        Args:
+            cls: The pydantic class to validate the object as.
+            data: A JSON dictionary of the object.
+            context: An optional dictionary of validation context, which is
+                used to validate objects that are not in the cache. (Default: None).
+        """
+        key = self._key(cls, data, context)
+        obj = self._objects.get(key)
+        if obj is not None:
+            self._objects.move_to_end(key)
+            self.hits += 1
+            self._forget_children(cls, data)
+            return obj
+        if self.folder is not None:
+            obj = self._read(key)
+            if obj is not None:
+                self.disk_hits += 1
+                self._add(key, obj)
+                self._forget_children(cls, data)
+                return obj
+        try:
+            obj = cls.model_validate(data, context=context)
+        finally:
+            self._forget_children(cls, data)
+        self.misses += 1
+        self._add(key, obj)
+        if self.folder is not None:
+            self._write(key, obj)
+        return obj
+
+    def validate_list(self, cls, values, context=None):
+        """Get a list with each JSON dictionary of a list replaced by a validated object.
+
+        Values that are not dictionaries are kept as they are. None is returned
+        if any object is not valid such that the list can be validated without
+        the cache to report the errors with their location.
+        """
+        try:
+            return [self.validate(cls, val, context) if isinstance(val, dict) else val
+                    for val in values]
+        except ValidationError:
+            return None
@@ -16,7 +16,7 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/ladybug-tools/dragonfly-schema",
-    packages=setuptools.find_packages(exclude=["tests", "scripts", "samples"]),
+    packages=setuptools.find_packages(exclude=["tests", "scripts", "samples", "benchmarks"]),
     install_requires=requirements,
     include_package_data=True,
     classifiers=[
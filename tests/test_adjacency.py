@@ -0,0 +1,91 @@
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Model, Building, Story
+from dragonfly_schema.adjacency import CHECK_ADJACENCY, check_adjacencies, \
+    check_story_adjacencies
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+model_files = [f for f in sorted(os.listdir(target_folder)) if f.endswith('.dfjson')]
+
+
+def _model_data():
+    """Get the dictionary of a Model with Ground_Office1..Face1 adjacent to Office2."""
+    with open(os.path.join(target_folder, 'model_complete_simple.dfjson')) as f:
+        return json.load(f)
+
+
+def _rooms(data):
+    return data['buildings'][0]['unique_stories'][0]['room_2ds']
+
+
+def _kinds(data):
+    return [issue.kind for issue in check_adjacencies(Model.model_validate(data))]
+
+
+@pytest.mark.parametrize('file_name', model_files)
+def test_sample_models(file_name):
+    with open(os.path.join(target_folder, file_name)) as f:
+        model = Model.model_validate_json(f.read(), context={CHECK_ADJACENCY: True})
+    assert check_adjacencies(model) == []
+
+
+def test_sample_stories():
+    with open(os.path.join(target_folder, 'story_air_boundary.json')) as f:
+        story = Story.model_validate_json(f.read())
+    assert any(any(room.air_boundaries or ()) for room in story.room_2ds)
+    assert check_story_adjacencies(story) == []
+    with open(os.path.join(target_folder, 'building_simple.json')) as f:
+        building = Building.model_validate_json(f.read())
+    for story in building.unique_stories:
+        assert check_story_adjacencies(story) == []
+
+
+def test_non_reciprocal():
+    data = _model_data()
+    _rooms(data)[1]['boundary_conditions'][2] = {'type': 'Outdoors'}
+    issues = check_adjacencies(Model.model_validate(data))
+    assert len(issues) == 1
+    assert issues[0].kind == 'non_reciprocal'
+    assert issues[0].path == \
+        ('buildings', 0, 'unique_stories', 0, 'room_2ds', 0, 'boundary_conditions', 0)
+
+    data = _model_data()
+    _rooms(data)[1]['boundary_conditions'][2]['boundary_condition_objects'][0] = \
+        'Ground_Office1..Face2'
+    assert sorted(_kinds(data)) == ['non_reciprocal', 'non_reciprocal']
+
+
+def test_missing_and_self_adjacency():
+    data = _model_data()
+    _rooms(data)[0]['boundary_conditions'][0]['boundary_condition_objects'] = \
+        ['Ground_Office3..Face3', 'Ground_Office3']
+    assert sorted(_kinds(data)) == ['missing_adjacency', 'non_reciprocal']
+
+    data = _model_data()  # the adjacent wall is not in the adjacent Room2D
+    _rooms(data)[0]['boundary_conditions'][0]['boundary_condition_objects'][1] = \
+        'Ground_Office3'
+    assert _kinds(data) == ['missing_adjacency']
+
+    data = _model_data()
+    _rooms(data)[0]['boundary_conditions'][0]['boundary_condition_objects'] = \
+        ['Ground_Office1..Face1', 'Ground_Office1']
+    assert sorted(_kinds(data)) == ['non_reciprocal', 'self_adjacency']
+
+
+def test_air_boundaries():
+    data = _model_data()
+    rooms = _rooms(data)
+    rooms[0]['air_boundaries'] = [True, True, False, False]
+    rooms[0]['window_parameters'][0] = {'type': 'SimpleWindowRatio', 'window_ratio': 0.4}
+    assert sorted(_kinds(data)) == ['air_boundary_not_surface',
+                                    'air_boundary_with_window', 'air_boundary_with_window']
+    with pytest.raises(ValidationError) as error:
+        Model.model_validate(data, context={CHECK_ADJACENCY: True})
+    assert 'air_boundary_with_window' in str(error.value)
+    Model.model_validate(data)  # the check is only run if requested
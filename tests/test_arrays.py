@@ -0,0 +1,79 @@
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Room2D, Model
+from dragonfly_schema.arrays import COORDINATE_ARRAYS
+
+np = pytest.importorskip('numpy')
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def test_room2d_coordinate_arrays():
+    file_path = os.path.join(target_folder, 'room2d_simple.json')
+    with open(file_path, 'r') as f:
+        room_json = f.read()
+    room = Room2D.model_validate_json(room_json, context={COORDINATE_ARRAYS: True})
+    assert isinstance(room.floor_boundary, np.ndarray)
+    assert room.floor_boundary.dtype == np.float64
+    assert room.floor_boundary.shape == (4, 2)
+    assert room.model_dump_json() == Room2D.model_validate_json(room_json).model_dump_json()
+
+
+def test_model_coordinate_arrays_round_trip():
+    file_path = os.path.join(target_folder, 'model_with_doors_skylights.dfjson')
+    with open(file_path, 'r') as f:
+        model_json = f.read()
+    model = Model.model_validate_json(model_json, context={COORDINATE_ARRAYS: True})
+    assert Model.model_validate_json(model.model_dump_json()) == \
+        Model.model_validate_json(model_json)
+
+
+def test_coordinate_arrays_equal():
+    file_path = os.path.join(target_folder, 'model_with_doors_skylights.dfjson')
+    with open(file_path, 'r') as f:
+        model_json = f.read()
+    model = Model.model_validate_json(model_json)
+    arrays = Model.model_validate_json(model_json, context={COORDINATE_ARRAYS: True})
+    arrays_again = Model.model_validate_json(model_json, context={COORDINATE_ARRAYS: True})
+    assert arrays == arrays_again and arrays == model and model == arrays
+
+    room = arrays.buildings[0].unique_stories[0].room_2ds[0]
+    moved = room.model_copy(update={'floor_boundary': room.floor_boundary + 1})
+    assert moved != room and room != moved
+    renamed = room.model_copy(update={'identifier': 'Other_Room'})
+    assert renamed != room
+
+
+def test_coordinate_arrays_invalid():
+    room_dict = {
+        'type': 'Room2D', 'identifier': 'Room',
+        'floor_boundary': [[0, 0], [1, 0], [1, 1]],
+        'floor_holes': [[[0.2, 0.2], [0.4, 0.2], [0.4, 0.4]]],
+        'floor_height': 0, 'floor_to_ceiling_height': 3, 'properties': {}
+    }
+    room = Room2D.model_validate(room_dict, context={COORDINATE_ARRAYS: True})
+    assert room.floor_holes[0].shape == (3, 2)
+
+    for bad_boundary in ([[0, 0], [1, 0]], [[0, 0], [1, 0], [1, 1, 1]],
+                         [[0, 0], [1, 0], ['a', 1]]):
+        room_dict['floor_boundary'] = bad_boundary
+        with pytest.raises(ValidationError):
+            Room2D.model_validate(room_dict, context={COORDINATE_ARRAYS: True})
+        with pytest.raises(ValidationError):
+            Room2D.model_validate(room_dict)
+
+    # NaN is accepted as it is for plain lists of points but None is not
+    room_dict['floor_boundary'] = [[0, 0], [1, 0], [float('nan'), 1]]
+    room = Room2D.model_validate(room_dict, context={COORDINATE_ARRAYS: True})
+    assert np.isnan(room.floor_boundary[2, 0])
+    Room2D.model_validate(room_dict)
+    room_dict['floor_boundary'] = [[0, 0], [1, 0], [None, 1]]
+    with pytest.raises(ValidationError):
+        Room2D.model_validate(room_dict, context={COORDINATE_ARRAYS: True})
+    with pytest.raises(ValidationError):
+        Room2D.model_validate(room_dict)
@@ -0,0 +1,28 @@
+import os
+
+from benchmarks.run_benchmarks import scale_model, run_suite, compare_results, \
+    benchmark_validation_cache, SAMPLE_FOLDER, CACHE_SAMPLE
+
+from dragonfly_schema.model import Model
+
+
+def test_run_suite():
+    results = run_suite(samples=['room2d_simple.json'], scales=(2,), repeat=1,
+                        docs=False)
+    assert 'room2d_simple.json' in results['results']
+    assert results['results']['model_complete_simple.dfjson_x2']['validate_s'] > 0
+    assert compare_results(results, results) == []
+
+
+def test_scale_model_unique_identifiers():
+    model_dict = Model(identifier='test', properties={}).model_dump()
+    model_dict['buildings'] = [
+        {'type': 'Building', 'identifier': 'bldg', 'properties': {}}]
+    scaled = Model.model_validate(scale_model(model_dict, 3))
+    assert [b.identifier for b in scaled.buildings] == ['bldg_0', 'bldg_1', 'bldg_2']
+
+
+def test_validation_cache_hit_is_faster():
+    with open(os.path.join(SAMPLE_FOLDER, CACHE_SAMPLE), 'rb') as f:
+        results = benchmark_validation_cache(f.read(), repeat=5)
+    assert results['cache_hit_s'] < results['validate_s']
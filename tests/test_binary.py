@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from dragonfly_schema.model import Model, Room2D, Room2DPropertiesAbridged
+from dragonfly_schema.window_parameter import SimpleWindowRatio
+from dragonfly_schema.arrays import COORDINATE_ARRAYS
+from dragonfly_schema.registry import validate_any
+from dragonfly_schema.binary import dump_cbor, validate_cbor
+
+cbor2 = pytest.importorskip('cbor2')
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+sample_files = sorted(os.listdir(target_folder))
+
+
+@pytest.mark.parametrize('file_name', sample_files)
+def test_cbor_round_trip(file_name):
+    with open(os.path.join(target_folder, file_name), 'rb') as f:
+        obj_json = f.read()
+    obj = validate_any(obj_json)
+    data = dump_cbor(obj)
+    assert validate_cbor(data) == obj
+    assert validate_cbor(data, cls=type(obj)) == obj
+
+
+def test_cbor_interned_types():
+    with open(os.path.join(target_folder, 'model_complete_simple.dfjson'), 'rb') as f:
+        model_json = f.read()
+    model = Model.model_validate_json(model_json)
+    data = dump_cbor(model)
+    assert len(data) < len(model.model_dump_json()) / 2
+    assert data.count(b'Room2DEnergyPropertiesAbridged') == 1
+    assert data.count(b'floor_boundary') == 1
+    array_model = Model.model_validate_json(
+        model_json, context={COORDINATE_ARRAYS: True})
+    assert validate_cbor(dump_cbor(array_model)) == model
+
+
+def test_cbor_python_object():
+    room = Room2D(
+        identifier='Room', floor_boundary=[[0, 0], [1, 0], [1, 1]], floor_height=0,
+        floor_to_ceiling_height=3, properties=Room2DPropertiesAbridged(),
+        window_parameters=[SimpleWindowRatio(window_ratio=0.4), None, None])
+    data = dump_cbor(room)
+    assert cbor2.loads(data)['window_parameters'][0]['type'] == 'SimpleWindowRatio'
+    assert validate_cbor(data) == room
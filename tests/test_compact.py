@@ -0,0 +1,76 @@
+import os
+import json
+
+import pytest
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.interning import is_frozen
+from dragonfly_schema.compact import dump_parameter_table, load_parameter_table, \
+    dump_vertex_pool, load_vertex_pool, dump_story_vertices, load_story_vertices, \
+    adjacent_room_pairs
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+model_files = [f for f in sorted(os.listdir(target_folder)) if f.endswith('.dfjson')]
+
+
+@pytest.mark.parametrize('file_name', model_files)
+def test_parameter_table_round_trip(file_name):
+    with open(os.path.join(target_folder, file_name), 'rb') as f:
+        model = Model.model_validate_json(f.read())
+    data = json.loads(json.dumps(dump_parameter_table(model)))
+    data_copy = json.loads(json.dumps(data))
+    loaded = load_parameter_table(data)
+    assert loaded == model
+    assert data == data_copy  # the input is not modified
+    room = loaded.buildings[0].unique_stories[0].room_2ds[0]
+    assert all(is_frozen(bc) for bc in room.boundary_conditions or ())
+
+
+def test_parameter_table_shared():
+    with open(os.path.join(target_folder, 'model_multiple_buildings.dfjson')) as f:
+        model = Model.model_validate_json(f.read())
+    data = dump_parameter_table(model)
+    rooms = [room for bldg in data['model']['buildings']
+             for story in bldg['unique_stories'] for room in story['room_2ds']]
+    indices = [i for room in rooms for i in room.get('boundary_conditions', ())
+               if i is not None]
+    assert len(set(indices)) < len(indices)
+    assert all(isinstance(p, dict) and 'type' in p for p in data['parameters'])
+
+
+@pytest.mark.parametrize('file_name', model_files)
+def test_vertex_pool_round_trip(file_name):
+    with open(os.path.join(target_folder, file_name), 'rb') as f:
+        model = Model.model_validate_json(f.read())
+    data = json.loads(json.dumps(dump_vertex_pool(model)))
+    data_copy = json.loads(json.dumps(data))
+    assert load_vertex_pool(data) == model
+    assert data == data_copy  # the input is not modified
+
+
+def test_story_vertices():
+    def room(identifier, boundary, holes=None):
+        room_dict = {'identifier': identifier, 'floor_boundary': boundary}
+        if holes is not None:
+            room_dict['floor_holes'] = holes
+        return room_dict
+    story = {'identifier': 'Story', 'room_2ds': [
+        room('A', [[0, 0], [10, 0], [10, 10], [0, 10]],
+             [[[2, 2], [4, 2], [4, 4]]]),
+        room('B', [[10.005, 0], [20, 0], [20, 10], [10, 10]]),
+        room('C', [[30, 0], [40, 0], [40, 10]])
+    ]}
+    data = dump_story_vertices(story, tolerance=0.01)
+    assert len(data['vertices']) == 12
+    assert data['room_2ds'][1]['floor_boundary'] == [1, 7, 8, 2]
+    assert data['room_2ds'][1]['exact_vertices'] == [[0, 10.005, 0]]
+    assert data['room_2ds'][0]['floor_holes'] == [[4, 5, 6]]
+    assert adjacent_room_pairs(data) == [(0, 1)]
+    assert load_story_vertices(data) == story
+
+    data = dump_story_vertices(story, tolerance=0)
+    assert len(data['vertices']) == 13
+    assert adjacent_room_pairs(data) == []
+    assert load_story_vertices(data) == story
@@ -0,0 +1,88 @@
+import os
+import copy
+import json
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.geometry import validate_geometry
+from dragonfly_schema.references import check_references
+from dragonfly_schema.dedupe import dedupe_resources, content_hash, rewrite_references
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _model_dict(file_name='model_complete_simple.dfjson'):
+    with open(os.path.join(target_folder, file_name)) as f:
+        return json.load(f)
+
+
+def _add_duplicates(model_dict):
+    """Add copies of resources that differ only by their identifiers."""
+    energy = model_dict['properties']['energy']
+    material = copy.deepcopy(energy['materials'][0])
+    material['identifier'] = 'Material Copy'
+    energy['materials'].append(material)
+    # a construction that is only a duplicate once its material is remapped
+    construction = copy.deepcopy(energy['constructions'][0])
+    construction['identifier'] = 'Construction Copy'
+    construction['materials'] = [
+        'Material Copy' if mat == material['identifier'] else mat
+        for mat in construction['materials']]
+    energy['constructions'].append(construction)
+    program = copy.deepcopy(energy['program_types'][1])
+    program['identifier'] = 'Program Copy'
+    energy['program_types'].append(program)
+    room = model_dict['buildings'][0]['unique_stories'][0]['room_2ds'][0]
+    room['properties']['energy']['program_type'] = 'Program Copy'
+    return model_dict
+
+
+def test_content_hash():
+    material = _model_dict()['properties']['energy']['materials'][0]
+    material_copy = dict(reversed(list(material.items())), identifier='Copy')
+    assert content_hash(material_copy) == content_hash(material)
+
+
+def test_dedupe_resources():
+    model = Model.model_validate(_model_dict())
+    deduped, remapped = dedupe_resources(model)
+    assert deduped is model and remapped == {}
+
+    model_dict = _add_duplicates(_model_dict())
+    energy = model_dict['properties']['energy']
+    model = Model.model_validate(model_dict)
+    deduped, remapped = dedupe_resources(model)
+    assert remapped == {
+        'materials': {'Material Copy': energy['materials'][0]['identifier']},
+        'constructions': {'Construction Copy': energy['constructions'][0]['identifier']},
+        'program_types': {'Program Copy': energy['program_types'][1]['identifier']}
+    }
+    assert check_references(deduped) == []
+    original = Model.model_validate(_model_dict())
+    assert deduped.model_dump() == original.model_dump()
+    # objects that did not change are shared with the input model
+    assert deduped.buildings[0].unique_stories[1] is model.buildings[0].unique_stories[1]
+
+
+def test_dedupe_resources_geometry_only():
+    model = validate_geometry(_add_duplicates(_model_dict()))
+    deduped, remapped = dedupe_resources(model)
+    assert len(remapped) == 3
+    assert deduped.model_dump() == validate_geometry(_model_dict()).model_dump()
+
+
+def test_rewrite_references_by_type():
+    remapped = {'materials': {'Shared Name': 'Material'}}
+    construction = {'type': 'OpaqueConstructionAbridged', 'identifier': 'Shared Name',
+                    'materials': ['Shared Name', 'Other']}
+    assert rewrite_references(construction, remapped)['materials'] == \
+        ['Material', 'Other']
+    # identifiers of other types of resources are left as they are
+    room = {'program_type': 'Shared Name', 'window_vent_control': {
+        'type': 'VentilationControlAbridged', 'schedule': 'Shared Name'}}
+    assert rewrite_references(room, remapped) is room
+    remapped['schedules'] = {'Shared Name': 'Schedule'}
+    new_room = rewrite_references(room, remapped)
+    assert new_room['window_vent_control']['schedule'] == 'Schedule'
+    assert new_room['program_type'] == 'Shared Name'
@@ -0,0 +1,68 @@
+import os
+import json
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.diff import diff_models, apply_patch, values_equal
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _model_dict():
+    with open(os.path.join(target_folder, 'model_multiple_buildings.dfjson')) as f:
+        return json.load(f)
+
+
+def test_values_equal():
+    assert values_equal([[0.0, 0.0], [1.0, 1.0]], [[0.001, 0.0], [1.0, 0.999]], 0.01)
+    assert not values_equal([[0.0, 0.0]], [[0.1, 0.0]], 0.01)
+    assert values_equal({'floor_height': 3.0}, {'floor_height': 3.005}, 0.01)
+    assert not values_equal({'window_ratio': 0.4}, {'window_ratio': 0.405}, 0.01)
+    assert not values_equal({'a': 1}, {'a': 1, 'b': 2}, 0.01)
+    assert not values_equal([1, 2], [True, 2], 0.01)
+
+
+def test_diff_equal():
+    model = Model.model_validate(_model_dict())
+    assert diff_models(model, Model.model_validate(_model_dict())) == []
+    assert apply_patch(model, []) is model
+
+
+def test_diff_within_tolerance():
+    model = Model.model_validate(_model_dict())
+    data = _model_dict()
+    data['buildings'][0]['unique_stories'][0]['room_2ds'][0]['floor_boundary'][0][0] += \
+        0.001
+    assert diff_models(model, Model.model_validate(data)) == []
+
+
+def test_diff_apply():
+    old = Model.model_validate(_model_dict())
+    data = _model_dict()
+    building = data['buildings'][0]
+    room = building['unique_stories'][0]['room_2ds'][1]
+    room['floor_to_ceiling_height'] += 0.5
+    building['unique_stories'][1]['display_name'] = 'Renamed Story'
+    building['unique_stories'].reverse()
+    new_building = json.loads(json.dumps(data['buildings'][1]))
+    new_building['identifier'] = 'New_Building'
+    data['buildings'].append(new_building)
+    del data['buildings'][1]
+    new = Model.model_validate(data)
+
+    patch = diff_models(old, new)
+    assert sorted(op['op'] for op in patch) == \
+        ['add', 'order', 'remove', 'replace', 'update']
+    replace = [op for op in patch if op['op'] == 'replace'][0]
+    assert replace['path'][-1] == room['identifier']
+    assert len(json.dumps(patch)) < len(new.model_dump_json()) / 2
+
+    patched = apply_patch(old, json.loads(json.dumps(patch)))
+    assert patched == new
+    # untouched objects are shared with the original Model
+    old_stories = {story.identifier: story for story in old.buildings[0].unique_stories}
+    new_stories = patched.buildings[0].unique_stories
+    assert sum(story is old_stories[story.identifier] for story in new_stories) == \
+        len(new_stories) - 2
+    assert apply_patch(new, diff_models(new, old)) == old
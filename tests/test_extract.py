@@ -0,0 +1,100 @@
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Model, Room2D
+from dragonfly_schema.energy.properties import ModelEnergyProperties
+from dragonfly_schema._raw import StructuralIndex, value_end
+from dragonfly_schema.extract import extract, extract_building, find_value, \
+    structural_index, parse_pointer, format_pointer
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+model_file = os.path.join(target_folder, 'model_complete_simple.dfjson')
+
+
+def test_extract():
+    model = Model.model_validate_json(open(model_file, 'rb').read())
+    room = extract(model_file, '/buildings/0/unique_stories/0/room_2ds/1')
+    assert isinstance(room, Room2D)
+    assert room == model.buildings[0].unique_stories[0].room_2ds[1]
+    energy = extract(model_file, '/properties/energy')
+    assert isinstance(energy, ModelEnergyProperties)
+    program_types = extract(model_file, '/properties/energy/program_types')
+    assert program_types == model.properties.energy.program_types
+    bc = extract(model_file, ['buildings', 0, 'unique_stories', 0, 'room_2ds', 0,
+                              'boundary_conditions', 0])
+    assert bc == model.buildings[0].unique_stories[0].room_2ds[0].boundary_conditions[0]
+
+
+def test_extract_building():
+    model = Model.model_validate_json(open(model_file, 'rb').read())
+    building = extract_building(model_file, model.buildings[-1].identifier)
+    assert building == model.buildings[-1]
+    with pytest.raises(ValueError):
+        extract_building(model_file, 'NotABuilding')
+
+
+def test_extract_errors(tmp_path):
+    with pytest.raises(ValueError, match='not a location'):
+        extract(model_file, '/buildings/0/not_a_field')
+    with pytest.raises(ValueError, match='No value found'):
+        extract(model_file, '/buildings/99')
+    model_dict = json.load(open(model_file))
+    model_dict['buildings'][0]['unique_stories'][0]['room_2ds'][1]['floor_height'] = 'a'
+    file_path = str(tmp_path / 'invalid.dfjson')
+    with open(file_path, 'w') as f:
+        json.dump(model_dict, f)
+    with pytest.raises(ValidationError) as error:
+        extract(file_path, '/buildings/0/unique_stories/0/room_2ds/1')
+    assert error.value.errors()[0]['loc'] == \
+        ('buildings', 0, 'unique_stories', 0, 'room_2ds', 1, 'floor_height')
+
+
+def test_pointer():
+    path = parse_pointer('/properties/a~1b~0c/0')
+    assert path == ('properties', 'a/b~c', 0)
+    assert format_pointer(path) == '/properties/a~1b~0c/0'
+
+
+def test_structural_index():
+    pytest.importorskip('numpy')
+    data = b'{"a": "[{\\"}", "b": [[1, 2], {"c": "\\\\"}], "d": {"e": []}}'
+    index = structural_index(data)
+    for i, char in enumerate(data):
+        if char in b'[{' and i not in (7, 8):  # brackets inside of a string
+            assert index.container_end(i) == value_end(data, i)
+    buf = open(model_file, 'rb').read()
+    pointer = '/buildings/0/unique_stories/0/room_2ds/1'
+    assert find_value(buf, pointer, index=structural_index(buf))[:2] == \
+        find_value(buf, pointer)[:2]
+
+
+def test_structural_index_chunks():
+    np = pytest.importorskip('numpy')
+    data = b'{"a": "[{\\"}", "b": [[1, 2], {"c": "\\\\"}], "d": {"e": []}}'
+    starts = [i for i, char in enumerate(data) if char in b'[{' and i not in (7, 8)]
+    for chunk in (1, 2, 3, 5):  # chunks that split the escapes and strings
+        shared = StructuralIndex(data, np, chunk, chunk)
+        for i in starts:
+            expected = value_end(data, i)
+            assert StructuralIndex(data, np, chunk, chunk).container_end(i) == expected
+            assert shared.container_end(i) == expected
+    buf = open(model_file, 'rb').read()
+    for pointer in ('/buildings/0/unique_stories/0/room_2ds/1', '/properties/energy'):
+        index = StructuralIndex(buf, np, 64, 256)
+        assert find_value(buf, pointer, index=index)[:2] == find_value(buf, pointer)[:2]
+
+
+def test_extract_truncated_file(tmp_path):
+    # nothing after the end of the extracted value is read
+    data = open(model_file, 'rb').read()
+    start, end, _ = find_value(data, '/buildings/0/unique_stories/0')
+    file_path = str(tmp_path / 'truncated.dfjson')
+    with open(file_path, 'wb') as f:
+        f.write(data[:end + 10])
+    story = extract(file_path, '/buildings/0/unique_stories/0')
+    assert story == Model.model_validate_json(data).buildings[0].unique_stories[0]
@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+from pydantic import ValidationError
+from honeybee_schema.model import Units
+
+from dragonfly_schema.model import Model, ModelProperties
+from dragonfly_schema.energy.properties import ModelEnergyProperties
+from dragonfly_schema.extension import referenced_models
+from dragonfly_schema.geometry import validate_geometry
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+_IMPORT_SCRIPT = """
+import sys
+from dragonfly_schema.geometry import validate_geometry
+with open(sys.argv[1], 'rb') as f:
+    validate_geometry(f.read())
+print(','.join(m for m in sys.modules if m.startswith((
+    'dragonfly_schema.energy', 'dragonfly_schema.radiance', 'honeybee_schema.model',
+    'honeybee_schema.energy', 'honeybee_schema.radiance'))))
+"""
+
+
+def test_validate_geometry_imports():
+    file_path = os.path.join(target_folder, 'model_complete_simple.dfjson')
+    env = dict(os.environ, PYTHONPATH=root)
+    result = subprocess.run([sys.executable, '-c', _IMPORT_SCRIPT, file_path],
+                            env=env, capture_output=True, check=True)
+    assert result.stdout.decode('utf-8').strip() == ''
+
+
+def test_validate_geometry():
+    file_path = os.path.join(target_folder, 'model_complete_simple.dfjson')
+    with open(file_path, 'r') as f:
+        model_json = f.read()
+    model = validate_geometry(model_json)
+    assert isinstance(model.properties.energy, dict)
+    assert model.units == 'Meters'
+    full_model = Model.model_validate_json(model_json)
+    assert [b.unique_stories[0].room_2ds[0].floor_boundary for b in model.buildings] == \
+        [b.unique_stories[0].room_2ds[0].floor_boundary for b in full_model.buildings]
+
+    model_dict = json.loads(model_json)
+    model_dict['properties']['energy']['constructions'] = 'not a list'
+    assert validate_geometry(model_dict).properties.energy['constructions'] == 'not a list'
+    model_dict['buildings'][0]['unique_stories'][0]['room_2ds'][0]['floor_height'] = 'a'
+    with pytest.raises(ValidationError):
+        validate_geometry(model_dict)
+
+
+def test_extension_validation():
+    file_path = os.path.join(target_folder, 'model_complete_simple.dfjson')
+    with open(file_path, 'r') as f:
+        model_dict = json.load(f)
+    model = Model.model_validate(model_dict)
+    assert isinstance(model.properties.energy, ModelEnergyProperties)
+    assert model.units is Units.meters
+    assert Model(identifier='test', properties=ModelProperties()).units is Units.meters
+
+    model_dict['properties']['energy']['constructions'] = 'not a list'
+    with pytest.raises(ValidationError) as error:
+        Model.model_validate(model_dict)
+    assert error.value.errors()[0]['loc'] == ('properties', 'energy', 'constructions')
+
+
+def test_referenced_models():
+    models = referenced_models(Model)
+    assert ModelProperties in models and ModelEnergyProperties in models
+    assert len(models) == len(set(models))
+    # the fields of the models are not changed
+    assert Model.model_fields['units'].annotation is not Units
+    assert ModelEnergyProperties not in \
+        getattr(ModelProperties.model_fields['energy'].annotation, '__args__', ())
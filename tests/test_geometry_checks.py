@@ -0,0 +1,81 @@
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.geometry_checks import CHECK_GEOMETRY, check_floor_geometry
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+model_files = [f for f in sorted(os.listdir(target_folder)) if f.endswith('.dfjson')]
+
+
+def _model(floors):
+    """Get a Model dict with one Room2D for each (boundary, holes) in a list."""
+    with open(os.path.join(target_folder, 'model_complete_simple.dfjson')) as f:
+        data = json.load(f)
+    story = data['buildings'][0]['unique_stories'][0]
+    room = story['room_2ds'][0]
+    for key in ('boundary_conditions', 'window_parameters', 'shading_parameters',
+                'air_boundaries'):
+        room.pop(key, None)
+    rooms = []
+    for i, (boundary, holes) in enumerate(floors):
+        new_room = dict(room, identifier='Room_{}'.format(i), floor_boundary=boundary)
+        if holes is not None:
+            new_room['floor_holes'] = holes
+        rooms.append(new_room)
+    story['room_2ds'] = rooms
+    data['buildings'] = [data['buildings'][0]]
+    data['buildings'][0]['unique_stories'] = [story]
+    return data
+
+
+SQUARE = [[0, 0], [10, 0], [10, 10], [0, 10]]
+
+
+@pytest.mark.parametrize('file_name', model_files)
+def test_samples_valid(file_name):
+    with open(os.path.join(target_folder, file_name), 'rb') as f:
+        model = Model.model_validate_json(f.read())
+    assert check_floor_geometry(model, check_orientation=True) == []
+
+
+def test_check_floor_geometry():
+    data = _model([
+        (SQUARE, [[[2, 2], [4, 2], [4, 4], [2, 4]]]),  # valid
+        ([[0, 0], [10, 0], [10, 0.001], [10, 10], [0, 10]], None),  # duplicate
+        ([[0, 0], [10, 0], [20, 0.005]], None),  # zero area
+        ([[0, 0], [10, 10], [10, 0], [0, 4]], None),  # bow tie
+        ([[0, 0], [10, 0], [10, 10], [5, 0.005], [0, 10]], None),  # touching
+        (SQUARE, [[[8, 8], [12, 8], [12, 12], [8, 12]]]),  # hole crossing
+        (SQUARE, [[[20, 2], [24, 2], [24, 4], [20, 4]]]),  # hole outside
+        (list(reversed(SQUARE)), None)  # clockwise
+    ])
+    model = Model.model_validate(data)
+    issues = check_floor_geometry(model)
+    kinds = {(issue.path[5], issue.kind) for issue in issues}
+    assert kinds == {
+        (1, 'duplicate_vertex'), (2, 'zero_area'), (3, 'self_intersection'),
+        (4, 'self_intersection'), (5, 'self_intersection'), (6, 'hole_outside')
+    }
+    hole_issue = [issue for issue in issues if issue.kind == 'hole_outside'][0]
+    assert hole_issue.path[-2:] == ('floor_holes', 0)
+    issues = check_floor_geometry(model, check_orientation=True)
+    assert (7, 'clockwise_boundary') in {(i.path[5], i.kind) for i in issues}
+
+    model.tolerance = 0
+    assert check_floor_geometry(model) == []
+
+
+def test_check_geometry_context():
+    data = _model([(SQUARE, None), ([[0, 0], [10, 10], [10, 0], [0, 4]], None)])
+    Model.model_validate(data)
+    with pytest.raises(ValidationError) as error:
+        Model.model_validate(data, context={CHECK_GEOMETRY: True})
+    assert 'self_intersection' in str(error.value)
+    data['buildings'][0]['unique_stories'][0]['room_2ds'].pop()
+    Model.model_validate(data, context={CHECK_GEOMETRY: True})
@@ -0,0 +1,80 @@
+import gc
+import os
+import json
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.diff import diff_models, apply_patch
+from dragonfly_schema.hashing import MerkleHasher, merkle_hash, canonical_json
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _model_dict(file_name='model_complete_simple.dfjson'):
+    with open(os.path.join(target_folder, file_name)) as f:
+        return json.load(f)
+
+
+def test_canonical_json():
+    assert canonical_json({'b': 1.0, 'a': [-0.0, 0.5, 'x']}) == b'{"a":[0,0.5,"x"],"b":1}'
+    assert canonical_json({'a': 1, 'b': True}) != canonical_json({'a': 1, 'b': 1})
+    assert canonical_json([float('nan'), float('inf'), -float('inf')]) == \
+        b'[NaN,Infinity,-Infinity]'
+    assert canonical_json([float('nan')]) != canonical_json(['NaN'])
+
+
+def test_merkle_hash_non_finite():
+    data = _model_dict()
+    room = data['buildings'][0]['unique_stories'][0]['room_2ds'][0]
+    room['floor_to_ceiling_height'] = float('inf')
+    room['floor_boundary'][0][0] = float('nan')
+    model = Model.model_validate(data)
+    assert merkle_hash(model) == merkle_hash(data)
+    assert merkle_hash(model.buildings[0]) != merkle_hash(_model_dict()['buildings'][0])
+
+
+def test_merkle_hash():
+    data = _model_dict()
+    model = Model.model_validate(data)
+    model_hash = merkle_hash(model)
+    assert len(model_hash) == 64
+    assert merkle_hash(data) == model_hash
+    assert merkle_hash(Model.model_validate_json(json.dumps(data, indent=4))) == \
+        model_hash
+    # the hash does not depend on the order of the keys
+    reordered = json.loads(json.dumps(data, sort_keys=True))
+    assert merkle_hash(reordered) == model_hash
+    assert merkle_hash(model.buildings[0]) == merkle_hash(data['buildings'][0])
+
+    room = data['buildings'][0]['unique_stories'][0]['room_2ds'][0]
+    room['floor_to_ceiling_height'] += 0.001
+    assert merkle_hash(data) != model_hash
+
+
+def test_merkle_hasher_reuse():
+    data = _model_dict('model_multiple_buildings.dfjson')
+    old = Model.model_validate(data)
+    hasher = MerkleHasher()
+    old_hash = hasher.hash(old)
+    count = hasher.hash_count
+    assert hasher.hash(old) == old_hash and hasher.hash_count == count
+
+    story = data['buildings'][1]['unique_stories'][0]
+    story['room_2ds'][0]['floor_to_ceiling_height'] += 1
+    new = apply_patch(old, diff_models(old, Model.model_validate(data)))
+    new_hash = hasher.hash(new)
+    assert new_hash != old_hash and new_hash == merkle_hash(new)
+    # only the room, story, building and model are hashed again
+    assert hasher.hash_count == count + 4
+    assert hasher.hash(new.buildings[0]) == hasher.hash(old.buildings[0])
+
+
+def test_merkle_hasher_weak_references():
+    hasher = MerkleHasher()
+    model = Model.model_validate(_model_dict())
+    hasher.hash(model)
+    assert len(hasher._hashes) > 0
+    del model
+    gc.collect()
+    assert len(hasher._hashes) == 0
@@ -0,0 +1,47 @@
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.identifiers import IdentifierIndex, UNIQUE_IDENTIFIERS
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _model_dict(file_name='model_complete_simple.dfjson'):
+    with open(os.path.join(target_folder, file_name)) as f:
+        return json.load(f)
+
+
+def test_identifier_index():
+    model = Model.model_validate(_model_dict())
+    index = IdentifierIndex(model)
+    story = model.buildings[0].unique_stories[1]
+    room = story.room_2ds[0]
+    assert index.lookup('Room2D', room.identifier) is room
+    assert index.path('Room2D', room.identifier) == \
+        ('buildings', 0, 'unique_stories', 1, 'room_2ds', 0)
+    assert index.parent('Room2D', room.identifier) is story
+    assert index.parent('Building', model.buildings[0].identifier) is model
+    assert len(index.objects('Story')) == len(model.buildings[0].unique_stories)
+    assert index.duplicates == {}
+    with pytest.raises(KeyError):
+        index.lookup('Room2D', 'NotARoom')
+
+
+def test_duplicate_identifiers():
+    model_dict = _model_dict()
+    rooms = model_dict['buildings'][0]['unique_stories'][0]['room_2ds']
+    rooms[1]['identifier'] = rooms[0]['identifier']
+    model = Model.model_validate(model_dict)  # duplicates are allowed by default
+    duplicates = IdentifierIndex(model).duplicates
+    assert duplicates == {'Room2D': {rooms[0]['identifier']: [
+        ('buildings', 0, 'unique_stories', 0, 'room_2ds', 0),
+        ('buildings', 0, 'unique_stories', 0, 'room_2ds', 1)]}}
+    with pytest.raises(ValidationError, match='duplicate identifiers'):
+        Model.model_validate(model_dict, context={UNIQUE_IDENTIFIERS: True})
+    Model.model_validate(_model_dict(), context={UNIQUE_IDENTIFIERS: True})
@@ -0,0 +1,61 @@
+import os
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.window_parameter import SimpleWindowRatio
+from dragonfly_schema.interning import INTERN_PARAMETERS, intern, is_frozen
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _read(file_name):
+    with open(os.path.join(target_folder, file_name), 'rb') as f:
+        return f.read()
+
+
+def test_intern():
+    window = SimpleWindowRatio(window_ratio=0.4)
+    shared = intern(window)
+    assert is_frozen(shared) and not is_frozen(window)
+    assert shared == window and window == shared
+    assert isinstance(shared, SimpleWindowRatio)
+    assert intern(SimpleWindowRatio(window_ratio=0.4)) is shared
+    assert intern(SimpleWindowRatio(window_ratio=0.5)) is not shared
+    assert intern(shared) is shared
+    assert hash(shared) == hash(intern(window))
+    assert shared != SimpleWindowRatio(window_ratio=0.5)
+    with pytest.raises(ValidationError):
+        shared.window_ratio = 0.5
+
+
+def test_pickle():
+    window = SimpleWindowRatio(window_ratio=0.4)
+    shared = intern(window)
+    assert pickle.loads(pickle.dumps(shared)) is shared
+    assert pickle.loads(pickle.dumps([window, shared]))[0] == window
+
+    model_json = _read('model_multiple_buildings.dfjson')
+    interned = Model.model_validate_json(model_json, context={INTERN_PARAMETERS: True})
+    loaded = pickle.loads(pickle.dumps(interned))
+    assert loaded == interned
+    room = loaded.buildings[0].unique_stories[0].room_2ds[0]
+    assert all(is_frozen(bc) for bc in room.boundary_conditions)
+
+
+def test_interned_model():
+    model_json = _read('model_multiple_buildings.dfjson')
+    model = Model.model_validate_json(model_json)
+    interned = Model.model_validate_json(model_json, context={INTERN_PARAMETERS: True})
+    assert interned == model and model == interned
+    assert interned.model_dump_json() == model.model_dump_json()
+    rooms = [room for bldg in interned.buildings for story in bldg.unique_stories
+             for room in story.room_2ds]
+    params = [param for room in rooms for param in room.window_parameters or ()
+              if param is not None]
+    assert all(is_frozen(param) for param in params)
+    assert len({id(param) for param in params}) < len(params)
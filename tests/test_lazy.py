@@ -0,0 +1,50 @@
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Room2D, Model
+from dragonfly_schema.lazy import LazyModel, LazyBuilding, LazyStory
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def test_lazy_model_access():
+    file_path = os.path.join(target_folder, 'model_multiple_buildings.dfjson')
+    model = LazyModel.from_file(file_path)
+    assert model.units == 'Meters'
+    assert model.buildings.loaded_count == 0
+
+    building = model.buildings[-1]
+    assert isinstance(building, LazyBuilding)
+    assert model.buildings.loaded_count == 1
+    story = building.unique_stories[0]
+    assert isinstance(story, LazyStory)
+    assert isinstance(story.room_2ds[0], Room2D)
+    assert story.room_2ds[0] is story.room_2ds[0]
+
+
+def test_lazy_model_validate_all():
+    file_path = os.path.join(target_folder, 'model_with_doors_skylights.dfjson')
+    with open(file_path, 'r') as f:
+        model_json = f.read()
+    lazy_model = LazyModel.from_json(model_json)
+    assert lazy_model.validate_all() == Model.model_validate_json(model_json)
+
+
+def test_lazy_model_error_loc():
+    file_path = os.path.join(target_folder, 'model_complete_simple.dfjson')
+    with open(file_path, 'r') as f:
+        model_dict = json.load(f)
+    model_dict['buildings'][0]['unique_stories'][0]['room_2ds'][1]['floor_height'] = 'a'
+    model = LazyModel.from_json(json.dumps(model_dict))
+
+    story = model.buildings[0].unique_stories[0]
+    story.room_2ds[0]
+    with pytest.raises(ValidationError) as error:
+        story.room_2ds[1]
+    assert error.value.errors()[0]['loc'] == \
+        ('buildings', 0, 'unique_stories', 0, 'room_2ds', 1, 'floor_height')
@@ -0,0 +1,69 @@
+import os
+import json
+
+import pytest
+
+from dragonfly_schema.model import Model, Room2D
+from dragonfly_schema.overlaps import RoomGrid, story_overlaps, check_room_overlaps
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+model_files = [f for f in sorted(os.listdir(target_folder)) if f.endswith('.dfjson')]
+
+
+def _room(identifier, boundary, holes=None):
+    return Room2D(identifier=identifier, floor_boundary=boundary, floor_holes=holes,
+                  floor_height=0, floor_to_ceiling_height=3, properties={})
+
+
+def _square(x, y, size=10):
+    return [[x, y], [x + size, y], [x + size, y + size], [x, y + size]]
+
+
+@pytest.mark.parametrize('file_name', model_files)
+def test_samples_no_overlaps(file_name):
+    with open(os.path.join(target_folder, file_name), 'rb') as f:
+        model = Model.model_validate_json(f.read())
+    assert check_room_overlaps(model) == []
+
+
+def test_room_grid():
+    rooms = [
+        _room('A', _square(0, 0)),
+        _room('B', _square(5, 0)),  # half over A
+        _room('C', _square(15, 0)),  # shares a wall with B
+        _room('D', list(reversed(_square(0, 0)))),  # same as A but clockwise
+        _room('E', _square(30, 0, 30), [_square(40, 10)]),
+        _room('F', _square(42, 12, 5)),  # inside the hole of E
+        _room('G', [[29, 29], [35, 29], [35, 35], [29, 35]]),  # over a corner of E
+        _room('H', _square(100, 0)),
+        _room('I', _square(109.995, 0)),  # within the tolerance of H
+        _room('J', [[0, 20], [20, 20], [20, 40], [10, 40], [10, 30], [0, 30]]),  # L
+        _room('K', _square(0, 30)),  # in the notch of the L
+    ]
+    grid = RoomGrid(rooms, 0.01)
+    assert grid.query((1, 1, 2, 2)) == [0, 3]
+    overlaps = {(rooms[i].identifier, rooms[j].identifier): area
+                for i, j, area in grid.overlapping_pairs()}
+    assert set(overlaps) == {('A', 'B'), ('A', 'D'), ('B', 'D'), ('E', 'G')}
+    assert overlaps['A', 'B'] == pytest.approx(50)
+    assert overlaps['A', 'D'] == pytest.approx(100)
+    assert overlaps['E', 'G'] == pytest.approx(5)
+
+
+def test_story_overlaps():
+    with open(os.path.join(target_folder, 'model_complete_simple.dfjson')) as f:
+        data = json.load(f)
+    story = data['buildings'][0]['unique_stories'][0]
+    rooms = story['room_2ds']
+    rooms[1]['floor_boundary'] = rooms[0]['floor_boundary']
+    model = Model.model_validate(data)
+    overlaps = check_room_overlaps(model)
+    assert len(overlaps) == 1
+    overlap = overlaps[0]
+    assert overlap.path == ('buildings', 0, 'unique_stories', 0)
+    assert (overlap.room_1, overlap.room_2) == \
+        (rooms[0]['identifier'], rooms[1]['identifier'])
+    assert story_overlaps(model.buildings[0].unique_stories[0])[0].area == \
+        pytest.approx(overlap.area)
@@ -0,0 +1,56 @@
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.parallel import validate_model_parallel
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def test_validate_model_parallel():
+    file_path = os.path.join(target_folder, 'model_multiple_buildings.dfjson')
+    with open(file_path, 'r') as f:
+        model_json = f.read()
+    model = validate_model_parallel(model_json, max_workers=2)
+    assert isinstance(model, Model)
+    assert model == Model.model_validate_json(model_json)
+
+
+def test_validate_model_parallel_error_loc():
+    file_path = os.path.join(target_folder, 'model_multiple_buildings.dfjson')
+    with open(file_path, 'r') as f:
+        model_dict = json.load(f)
+    model_dict['tolerance'] = -1
+    model_dict['buildings'][0]['unique_stories'][0]['room_2ds'][0]['floor_height'] = 'a'
+    model_dict['buildings'][-1]['properties'] = None
+    model_json = json.dumps(model_dict)
+
+    with pytest.raises(ValidationError) as serial_error:
+        Model.model_validate_json(model_json)
+    with pytest.raises(ValidationError) as parallel_error:
+        validate_model_parallel(model_json, max_workers=2)
+    assert [e['loc'] for e in parallel_error.value.errors()] == \
+        [e['loc'] for e in serial_error.value.errors()]
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_validate_model_parallel_invalid_type(max_workers):
+    file_path = os.path.join(target_folder, 'model_multiple_buildings.dfjson')
+    with open(file_path, 'r') as f:
+        model_dict = json.load(f)
+    room = model_dict['buildings'][1]['unique_stories'][0]['room_2ds'][0]
+    room['window_parameters'][0] = {'type': 'NotAWindow'}
+    model_json = json.dumps(model_dict)
+
+    with pytest.raises(ValidationError) as serial_error:
+        Model.model_validate_json(model_json)
+    with pytest.raises(ValidationError) as parallel_error:
+        validate_model_parallel(model_json, max_workers=max_workers)
+    errors = parallel_error.value.errors(include_url=False)
+    assert errors[0]['type'] == 'union_type_invalid'
+    assert errors == serial_error.value.errors(include_url=False)
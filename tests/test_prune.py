@@ -0,0 +1,56 @@
+import os
+import copy
+import json
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.geometry import validate_geometry
+from dragonfly_schema.prune import prune_resources
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _model_dict(file_name='model_complete_simple.dfjson'):
+    with open(os.path.join(target_folder, file_name)) as f:
+        return json.load(f)
+
+
+def _add_unused(model_dict):
+    """Add copies of resources that are not referenced by anything."""
+    energy = model_dict['properties']['energy']
+    for key, new_id in (('constructions', 'Unused Construction'),
+                        ('materials', 'Unused Material'),
+                        ('schedules', 'Unused Schedule'),
+                        ('program_types', 'Unused Program')):
+        obj = copy.deepcopy(energy[key][0])
+        obj['identifier'] = new_id
+        energy[key].append(obj)
+    return model_dict
+
+
+def test_prune_resources():
+    model = Model.model_validate(_model_dict())
+    pruned, report = prune_resources(model)
+    assert pruned is model and report.object_count == 0
+
+    model = Model.model_validate(_add_unused(_model_dict()))
+    pruned, report = prune_resources(model)
+    assert report.removed == {
+        'constructions': ['Unused Construction'], 'materials': ['Unused Material'],
+        'program_types': ['Unused Program'], 'schedules': ['Unused Schedule']}
+    assert report.object_count == 4
+    assert report.byte_count == \
+        len(model.model_dump_json()) - len(pruned.model_dump_json())
+    assert pruned == Model.model_validate(_model_dict())
+    # the unused program referenced schedules that are still used by other programs
+    assert len(pruned.properties.energy.schedules) == \
+        len(model.properties.energy.schedules) - 1
+
+
+def test_prune_resources_geometry_only():
+    model = validate_geometry(_add_unused(_model_dict()))
+    pruned, report = prune_resources(model)
+    assert report.object_count == 4
+    assert len(pruned.properties.energy['materials']) == \
+        len(model.properties.energy['materials']) - 1
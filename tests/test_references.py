@@ -0,0 +1,78 @@
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.geometry import validate_geometry
+from dragonfly_schema.references import check_references, DanglingReference, \
+    CHECK_REFERENCES
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _model_dict(file_name='model_complete_simple.dfjson'):
+    with open(os.path.join(target_folder, file_name)) as f:
+        return json.load(f)
+
+
+def test_check_references():
+    model_dict = _model_dict()
+    assert check_references(Model.model_validate(model_dict)) == []
+    room = model_dict['buildings'][0]['unique_stories'][0]['room_2ds'][1]
+    room['properties']['energy']['program_type'] = 'Missing Program'
+    model_dict['buildings'][0]['properties']['energy']['construction_set'] = \
+        'Missing Set'
+    dangling = check_references(Model.model_validate(model_dict))
+    assert dangling == [
+        DanglingReference(
+            ('buildings', 0, 'properties', 'energy', 'construction_set'),
+            'construction_sets', 'Missing Set'),
+        DanglingReference(
+            ('buildings', 0, 'unique_stories', 0, 'room_2ds', 1,
+             'properties', 'energy', 'program_type'),
+            'program_types', 'Missing Program')
+    ]
+    assert check_references(validate_geometry(model_dict)) == dangling
+
+
+def test_check_references_context():
+    model_dict = _model_dict()
+    Model.model_validate(model_dict, context={CHECK_REFERENCES: True})
+    room = model_dict['buildings'][0]['unique_stories'][0]['room_2ds'][0]
+    room['properties']['energy']['hvac'] = 'Missing HVAC'
+    Model.model_validate(model_dict)  # references are not checked by default
+    with pytest.raises(ValidationError, match='Missing HVAC'):
+        Model.model_validate(model_dict, context={CHECK_REFERENCES: True})
+
+
+def test_check_room_schedule_references():
+    model_dict = _model_dict()
+    room = model_dict['buildings'][0]['unique_stories'][0]['room_2ds'][0]
+    energy = room['properties']['energy']
+    energy['process_loads'] = [
+        {'type': 'ProcessAbridged', 'identifier': 'Oven', 'watts': 1000,
+         'schedule': 'Generic Office Equipment'}
+    ]
+    energy['window_vent_control'] = {
+        'type': 'VentilationControlAbridged', 'schedule': 'Missing Vent Schedule'}
+    energy['fans'] = [
+        {'type': 'VentilationFan', 'identifier': 'Fan_{}'.format(i), 'flow_rate': 1,
+         'pressure_rise': 200, 'efficiency': 0.7,
+         'control': {'type': 'VentilationControlAbridged', 'schedule': schedule}}
+        for i, schedule in enumerate(('Generic Office Occupancy', 'Missing Fan Schedule'))
+    ]
+    room_path = ('buildings', 0, 'unique_stories', 0, 'room_2ds', 0, 'properties', 'energy')
+    assert check_references(Model.model_validate(model_dict)) == [
+        DanglingReference(room_path + ('window_vent_control', 'schedule'),
+                          'schedules', 'Missing Vent Schedule'),
+        DanglingReference(room_path + ('fans', 1, 'control', 'schedule'),
+                          'schedules', 'Missing Fan Schedule')
+    ]
+    energy['process_loads'][0]['schedule'] = 'Missing Process Schedule'
+    assert check_references(Model.model_validate(model_dict))[0] == DanglingReference(
+        room_path + ('process_loads', 0, 'schedule'), 'schedules',
+        'Missing Process Schedule')
@@ -0,0 +1,63 @@
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Room2D, Model
+from dragonfly_schema.window_parameter import SingleWindow
+from dragonfly_schema.registry import validate_any, validate_many, peek_type
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _read(file_name):
+    with open(os.path.join(target_folder, file_name), 'rb') as f:
+        return f.read()
+
+
+def test_validate_any():
+    model_json = _read('model_complete_simple.dfjson')
+    assert peek_type(model_json) == 'Model'
+    model = validate_any(model_json)
+    assert model == Model.model_validate_json(model_json)
+    room = validate_any(_read('room2d_simple.json').decode('utf-8'))
+    assert isinstance(room, Room2D)
+    window = validate_any(json.loads(_read('window_par_single_window.json')))
+    assert isinstance(window, SingleWindow)
+
+
+def test_validate_any_errors():
+    with pytest.raises(ValidationError) as error:
+        validate_any(b'{"identifier": "a", "type": "NotAType"}')
+    assert error.value.errors()[0]['type'] == 'union_tag_invalid'
+    with pytest.raises(ValidationError) as error:
+        validate_any(b'{"identifier": "a"}')
+    assert error.value.errors()[0]['type'] == 'union_tag_not_found'
+    assert peek_type(b'[1, 2]') is None
+
+
+def test_validate_many():
+    room_json, window_json = \
+        _read('room2d_simple.json'), _read('window_par_single_window.json')
+    objects = validate_many([room_json, window_json])
+    assert [type(obj) for obj in objects] == [Room2D, SingleWindow]
+    objects = validate_many(b'[' + room_json + b',' + window_json + b']')
+    assert [type(obj) for obj in objects] == [Room2D, SingleWindow]
+    objects = validate_many([json.loads(room_json), json.loads(window_json)])
+    assert [type(obj) for obj in objects] == [Room2D, SingleWindow]
+
+    with pytest.raises(ValidationError) as error:
+        validate_many([room_json, b'{"type": "SingleWindow", "width": "a", "height": 1}'])
+    assert error.value.errors()[0]['loc'] == (1, 'SingleWindow', 'width')
+
+    # each text of a list is a single object with errors at its index in the list
+    with pytest.raises(ValidationError) as error:
+        validate_many([room_json + b',' + window_json, window_json])
+    assert [err['loc'][:1] for err in error.value.errors()] == [(0,)]
+    with pytest.raises(ValidationError) as error:
+        validate_many([room_json, ''])
+    assert [err['loc'] for err in error.value.errors()] == [(1,)]
+    assert error.value.errors()[0]['type'] == 'json_invalid'
@@ -0,0 +1,79 @@
+import os
+import json
+
+from dragonfly_schema.model import Model, Building
+from dragonfly_schema.roofs import assign_roofs, assign_model_roofs
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _room(identifier, x, height):
+    return {
+        'type': 'Room2D', 'identifier': identifier,
+        'floor_boundary': [[x, 0], [x + 10, 0], [x + 10, 10], [x, 10]],
+        'floor_height': height, 'floor_to_ceiling_height': 3,
+        'properties': {'type': 'Room2DPropertiesAbridged'}
+    }
+
+
+def _face(x_0, x_1, z_0, z_1):
+    return {'type': 'Face3D',
+            'boundary': [[x_0, 0, z_0], [x_1, 0, z_0], [x_1, 10, z_1], [x_0, 10, z_1]]}
+
+
+def _building(roof):
+    return Building.model_validate({
+        'type': 'Building', 'identifier': 'Building',
+        'unique_stories': [
+            {'type': 'Story', 'identifier': 'Ground', 'floor_height': 0,
+             'room_2ds': [_room('Room_1', 0, 0), _room('Room_2', 10, 0)],
+             'properties': {'type': 'StoryPropertiesAbridged'}},
+            {'type': 'Story', 'identifier': 'Top', 'floor_height': 3,
+             'room_2ds': [_room('Room_3', 0, 3)],
+             'properties': {'type': 'StoryPropertiesAbridged'}}
+        ],
+        'roof': roof,
+        'properties': {'type': 'BuildingPropertiesAbridged'}
+    })
+
+
+def test_assign_roofs():
+    top, side = _face(0, 10, 6, 8), _face(10, 20, 3, 4)
+    low, away = _face(2, 8, 2, 2.5), _face(50, 60, 6, 8)
+    mesh = {'type': 'Mesh3D',
+            'vertices': [[0, 0, 6], [5, 0, 6], [5, 5, 7], [0, 5, 7], [0, 0, 7]],
+            'faces': [[0, 1, 4], [0, 1, 2, 3]]}  # the first face is vertical
+    clerestory = {'type': 'DetailedClerestory', 'base_line': [[0, 5], [10, 5]],
+                  'elevation': 6, 'polygons': [[[1, 1], [2, 1], [2, 2]]]}
+    building = _building({
+        'type': 'RoofSpecification', 'geometry': [top, side, low, away, mesh],
+        'clerestory_parameters': [clerestory]})
+    new_building = assign_roofs(building)
+    ground, top_story = new_building.unique_stories
+    assert [geo.boundary for geo in ground.roof.geometry] == \
+        [side['boundary'], low['boundary']]
+    assert [geo.type for geo in top_story.roof.geometry] == ['Face3D', 'Mesh3D']
+    assert top_story.roof.geometry[0].boundary == top['boundary']
+    assert len(top_story.roof.clerestory_parameters) == 1
+    assert [geo.boundary for geo in new_building.roof.geometry] == [away['boundary']]
+    assert building.roof is not None and building.unique_stories[0].roof is None
+    # the Building is still valid after a round trip
+    data = new_building.model_dump_json(exclude_unset=True)
+    assert Building.model_validate_json(data) == new_building
+
+
+def test_assign_roofs_all():
+    building = _building({'type': 'RoofSpecification',
+                          'geometry': [_face(0, 10, 6, 8)]})
+    new_building = assign_roofs(building)
+    assert new_building.roof is None
+    assert new_building.unique_stories[0] is building.unique_stories[0]
+    assert assign_roofs(new_building) is new_building
+
+
+def test_assign_model_roofs():
+    with open(os.path.join(target_folder, 'model_complete_simple.dfjson')) as f:
+        model = Model.model_validate(json.load(f))
+    assert assign_model_roofs(model) is model
@@ -0,0 +1,63 @@
+import io
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Building, ContextShade, Model
+from dragonfly_schema.stream import ModelStream
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def test_model_stream_multiple_buildings():
+    file_path = os.path.join(target_folder, 'model_multiple_buildings.dfjson')
+    with open(file_path, 'r') as f:
+        model = Model.model_validate_json(f.read())
+
+    stream = ModelStream(file_path, chunk_size=4096)
+    objs = list(stream)
+    buildings = [obj for obj in objs if isinstance(obj, Building)]
+    shades = [obj for obj in objs if isinstance(obj, ContextShade)]
+    assert buildings == model.buildings
+    assert shades == (model.context_shades or [])
+    assert stream.building_count == len(model.buildings)
+    assert stream.header == model.model_copy(
+        update={'buildings': None, 'context_shades': None})
+
+
+def test_model_stream_validate():
+    file_path = os.path.join(target_folder, 'model_complete_simple.dfjson')
+    header = ModelStream(file_path, chunk_size=64).validate()
+    assert header.identifier
+    assert header.buildings is None
+
+
+def test_model_stream_error_loc():
+    file_path = os.path.join(target_folder, 'model_complete_simple.dfjson')
+    with open(file_path, 'r') as f:
+        model_dict = json.load(f)
+    model_dict['buildings'][0]['unique_stories'][0]['room_2ds'][1]['floor_height'] = 'a'
+    model_json = json.dumps(model_dict)
+
+    with pytest.raises(ValidationError) as serial_error:
+        Model.model_validate_json(model_json)
+    with pytest.raises(ValidationError) as stream_error:
+        list(ModelStream(io.BytesIO(model_json.encode('utf-8')), chunk_size=128))
+    assert [e['loc'] for e in stream_error.value.errors()] == \
+        [e['loc'] for e in serial_error.value.errors()]
+
+
+def test_model_stream_custom_error():
+    file_path = os.path.join(target_folder, 'model_with_doors_skylights.dfjson')
+    with open(file_path, 'r') as f:
+        model_dict = json.load(f)
+    room_dict = model_dict['buildings'][0]['unique_stories'][0]['room_2ds'][0]
+    room_dict['window_parameters'][0] = {'type': 'NotAWindow'}
+    stream = ModelStream(io.BytesIO(json.dumps(model_dict).encode('utf-8')))
+    with pytest.raises(ValidationError) as error:
+        list(stream)
+    assert error.value.errors()[0]['type'] == 'union_type_invalid'
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from dragonfly_schema.model import Model
+from dragonfly_schema.arrays import COORDINATE_ARRAYS
+from dragonfly_schema.geometry import validate_geometry
+from dragonfly_schema.table import room_table, wall_table, write_parquet
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _read(file_name):
+    with open(os.path.join(target_folder, file_name), 'rb') as f:
+        return f.read()
+
+
+def test_room_table():
+    model = Model.model_validate_json(_read('model_complete_simple.dfjson'))
+    rooms = room_table(model)
+    room_2ds = [room for bldg in model.buildings for story in bldg.unique_stories
+                for room in story.room_2ds]
+    assert rooms['identifier'] == [room.identifier for room in room_2ds]
+    assert rooms['model'] == [model.identifier] * len(room_2ds)
+    assert rooms['program_type'][0] == room_2ds[0].properties.energy.program_type
+    geo_model = validate_geometry(_read('model_complete_simple.dfjson'))
+    assert room_table(geo_model) == rooms
+
+
+def test_wall_table():
+    model_json = _read('model_complete_simple.dfjson')
+    model = Model.model_validate_json(model_json)
+    walls = wall_table(model)
+    rooms = room_table(model)
+    assert len(walls['room']) == sum(rooms['segment_count'])
+    room = model.buildings[0].unique_stories[0].room_2ds[0]
+    assert walls['boundary_condition'][0] == room.boundary_conditions[0].type
+    assert (walls['start_x'][0], walls['start_y'][0]) == tuple(room.floor_boundary[0])
+    array_model = Model.model_validate_json(
+        model_json, context={COORDINATE_ARRAYS: True})
+    assert wall_table(array_model) == walls
+
+
+def test_write_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    model = Model.model_validate_json(_read('model_with_doors_skylights.dfjson'))
+    room_file, wall_file = write_parquet(model, str(tmp_path))
+    rooms = pq.read_table(room_file)
+    assert rooms.column('identifier').to_pylist() == room_table(model)['identifier']
+    walls = pq.read_table(wall_file)
+    assert walls.num_rows == sum(rooms.column('segment_count').to_pylist())
+    assert str(walls.schema.field('air_boundary').type) == 'bool'
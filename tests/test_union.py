@@ -0,0 +1,55 @@
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Room2D
+from dragonfly_schema.radiance.properties import ModelRadianceProperties
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def test_union_error_by_type():
+    file_path = os.path.join(target_folder, 'room2d_simple.json')
+    with open(file_path, 'r') as f:
+        room = Room2D.model_validate_json(f.read()).model_dump()
+    room['window_parameters'] = [{'type': 'SimpleWindowRatio', 'window_ratio': 2}]
+    with pytest.raises(ValidationError) as error:
+        Room2D.model_validate(room)
+    assert error.value.error_count() == 1
+    assert error.value.errors()[0]['loc'] == \
+        ('window_parameters', 0, 'SimpleWindowRatio', 'window_ratio')
+
+    room['window_parameters'] = [{'type': 'NotAWindow', 'window_ratio': 0.4}]
+    with pytest.raises(ValidationError) as error:
+        Room2D.model_validate(room)
+    assert error.value.errors()[0]['type'] == 'union_type_invalid'
+
+
+def test_union_without_type():
+    file_path = os.path.join(target_folder, 'room2d_simple.json')
+    with open(file_path, 'r') as f:
+        room = Room2D.model_validate_json(f.read()).model_dump()
+    room['window_parameters'] = [{'window_ratio': 0.4}] * len(room['floor_boundary'])
+    room = Room2D.model_validate(room)
+    assert room.window_parameters[0].type == 'SimpleWindowRatio'
+
+
+def test_union_json_schema_order():
+    schema = ModelRadianceProperties.model_json_schema()
+    assert schema['properties']['modifier_sets'] == {
+        'anyOf': [
+            {'items': {'anyOf': [{'$ref': '#/$defs/ModifierSetAbridged'},
+                                 {'$ref': '#/$defs/ModifierSet'}]},
+             'type': 'array'},
+            {'type': 'null'}
+        ],
+        'default': None,
+        'description': 'List of all ModifierSets in the Model.',
+        'title': 'Modifier Sets'
+    }
+    # inputs without a type are validated with the members in the same order
+    props = ModelRadianceProperties(modifier_sets=[{'identifier': 'Set'}])
+    assert props.modifier_sets[0].type == 'ModifierSetAbridged'
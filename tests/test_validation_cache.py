@@ -0,0 +1,106 @@
+import os
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from dragonfly_schema.model import Model, Story
+from dragonfly_schema.interning import INTERN_PARAMETERS
+from dragonfly_schema.validation_cache import VALIDATION_CACHE, ValidationCache
+
+# target folder where all of the samples live
+root = os.path.dirname(os.path.dirname(__file__))
+target_folder = os.path.join(root, 'samples')
+
+
+def _read(file_name='model_multiple_buildings.dfjson'):
+    with open(os.path.join(target_folder, file_name), 'rb') as f:
+        return f.read()
+
+
+def test_validation_cache():
+    model_json = _read()
+    model = Model.model_validate_json(model_json)
+    cache = ValidationCache()
+    context = {VALIDATION_CACHE: cache}
+    cached = Model.model_validate_json(model_json, context=context)
+    assert cached == model
+    building_count = len(model.buildings)
+    story_count = sum(len(bldg.unique_stories) for bldg in model.buildings)
+    assert cache.misses == building_count + story_count and cache.hits == 0
+
+    cached_again = Model.model_validate_json(model_json, context=context)
+    assert cached_again == model
+    assert cached_again.buildings[0] is cached.buildings[0]
+    assert cache.hits == building_count
+    assert cache.stats()['hit_rate'] == pytest.approx(
+        building_count / (2 * building_count + story_count))
+
+
+def test_validation_cache_changed_building():
+    data = json.loads(_read())
+    cache = ValidationCache()
+    context = {VALIDATION_CACHE: cache}
+    first = Model.model_validate(data, context=context)
+    data['buildings'][0]['display_name'] = 'Changed Building'
+    misses = cache.misses
+    second = Model.model_validate(data, context=context)
+    # only the changed building is validated and its stories are reused
+    assert cache.misses == misses + 1
+    assert second.buildings[0] is not first.buildings[0]
+    assert second.buildings[0].unique_stories[0] is first.buildings[0].unique_stories[0]
+    assert second.buildings[1] is first.buildings[1]
+
+
+def test_validation_cache_lru():
+    cache = ValidationCache(max_size=2)
+    Model.model_validate_json(_read(), context={VALIDATION_CACHE: cache})
+    assert cache.stats()['size'] == 2
+
+
+def test_validation_cache_folder(tmp_path):
+    model_json = _read()
+    Model.model_validate_json(model_json, context={VALIDATION_CACHE: ValidationCache(
+        folder=str(tmp_path))})
+    cache = ValidationCache(folder=str(tmp_path))
+    model = Model.model_validate_json(model_json, context={VALIDATION_CACHE: cache})
+    assert model == Model.model_validate_json(model_json)
+    assert cache.disk_hits == len(model.buildings) and cache.misses == 0
+
+
+def test_validation_cache_folder_interned(tmp_path):
+    model_json = _read()
+    context = {VALIDATION_CACHE: ValidationCache(folder=str(tmp_path)),
+               INTERN_PARAMETERS: True}
+    model = Model.model_validate_json(model_json, context=context)
+    cache = ValidationCache(folder=str(tmp_path))
+    context[VALIDATION_CACHE] = cache
+    assert Model.model_validate_json(model_json, context=context) == model
+    assert cache.disk_hits == len(model.buildings)
+
+
+def test_validation_cache_unpicklable(tmp_path):
+    cache = ValidationCache(folder=str(tmp_path))
+    key = cache.key(Model, {'identifier': 'test'})
+    cache._write(key, lambda: None)  # objects that cannot be pickled are skipped
+    assert cache._read(key) is None
+    assert [p for p in tmp_path.rglob('*') if p.is_file()] == []
+
+
+def test_validation_cache_story_keys():
+    data = json.loads(_read())
+    cache = ValidationCache()
+    Model.model_validate(data, context={VALIDATION_CACHE: cache})
+    # the keys of Stories found through their Building match their own keys
+    story = data['buildings'][0]['unique_stories'][0]
+    assert cache.key(Story, story) in cache._objects
+    assert cache._child_keys == {}
+
+
+def test_validation_cache_error():
+    data = json.loads(_read())
+    del data['buildings'][1]['properties']
+    cache = ValidationCache()
+    with pytest.raises(ValidationError) as error:
+        Model.model_validate(data, context={VALIDATION_CACHE: cache})
+    assert error.value.errors()[0]['loc'][:2] == ('buildings', 1)